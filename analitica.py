@@ -0,0 +1,215 @@
+from sqlalchemy import select, func, extract, distinct
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+from modelos import obtener_engine, Compra, Reseña, Usuario, MetodoPago
+from servicios import FiltrosVentas, FiltrosResenas, RESUMENES_VENTAS, fin_exclusivo
+
+# Analítica vectorizada de ventas y reseñas: trae Compra, Reseña y Usuario en
+# bloque (lotes de un cursor del servidor) a arreglos NumPy por columna y
+# agrupa con pandas, sin recorrer filas en Python. Cada cálculo tiene su
+# equivalente en SQL (GROUP BY) con el mismo resultado; benchmark_analitica.py
+# mide ambos caminos para elegir el más rápido en cada reporte.
+# Los montos se manejan en centavos (int64) para que las sumas sean exactas.
+TAMANO_LOTE_ANALITICA = 100_000
+METODOS = list(MetodoPago)
+AGRUPACIONES = ("juego", "mes", "metodo")
+
+def _leer(consulta, columnas):
+    # columnas: {nombre: función que convierte la lista de valores de un lote en un arreglo}
+    partes = {nombre: [] for nombre in columnas}
+    with obtener_engine().connect() as conexion:
+        resultado = conexion.execution_options(stream_results=True, yield_per=TAMANO_LOTE_ANALITICA).execute(consulta)
+        for lote in resultado.partitions():
+            for (nombre, convertir), valores in zip(columnas.items(), zip(*lote)):
+                partes[nombre].append(convertir(valores))
+    return pd.DataFrame({
+        nombre: np.concatenate(arreglos) if arreglos else convertir([])
+        for (nombre, convertir), arreglos in zip(columnas.items(), partes.values())
+    })
+
+def _enteros(valores):
+    return np.array(valores, dtype=np.int64)
+
+def _centavos(valores):
+    return np.rint(np.array(valores, dtype=np.float64) * 100).astype(np.int64)
+
+def _fechas(valores):
+    return np.array(valores, dtype="datetime64[us]")
+
+def _metodos(valores):
+    indices = {metodo: i for i, metodo in enumerate(METODOS)}
+    return np.array([indices[v] for v in valores], dtype=np.int8)
+
+def _indice_mes(fechas):
+    # Meses desde el año 0 (año * 12 + mes - 1), igual que _indice_mes_sql
+    return fechas.dt.year * 12 + fechas.dt.month - 1
+
+def _indice_mes_sql(columna):
+    return extract("year", columna) * 12 + extract("month", columna) - 1
+
+def _filtrar_compras(consulta, filtros):
+    filtros = filtros or FiltrosVentas()
+    consulta = consulta.where(Compra.fecha_compra.isnot(None), Compra.monto_pagado.isnot(None))
+    if filtros.fecha_inicio is not None:
+        consulta = consulta.where(Compra.fecha_compra >= filtros.fecha_inicio)
+    if filtros.fecha_fin is not None:
+        consulta = consulta.where(Compra.fecha_compra < fin_exclusivo(filtros.fecha_fin))
+    for _, _, _, columna, campo in RESUMENES_VENTAS:
+        if getattr(filtros, campo) is not None:
+            consulta = consulta.where(columna == getattr(filtros, campo))
+    return consulta
+
+def _filtrar_resenas(consulta, filtros):
+    filtros = filtros or FiltrosResenas()
+    consulta = consulta.where(Reseña.calificacion.between(1, 5))
+    if filtros.juego_id is not None:
+        consulta = consulta.where(Reseña.id_juego == filtros.juego_id)
+    if filtros.usuario_id is not None:
+        consulta = consulta.where(Reseña.id_usuario == filtros.usuario_id)
+    return consulta
+
+# === CARGA ===
+def cargar_compras(filtros: Optional[FiltrosVentas] = None) -> pd.DataFrame:
+    consulta = _filtrar_compras(select(
+        Compra.id_usuario, Compra.id_juego, Compra.fecha_compra, Compra.monto_pagado, Compra.metodo_pago
+    ).where(Compra.id_usuario.isnot(None), Compra.id_juego.isnot(None), Compra.metodo_pago.isnot(None)), filtros)
+    compras = _leer(consulta, {
+        "id_usuario": _enteros, "id_juego": _enteros, "fecha": _fechas, "centavos": _centavos, "metodo": _metodos
+    })
+    compras["metodo"] = pd.Categorical.from_codes(compras["metodo"], categories=[m.value for m in METODOS])
+    return compras
+
+def cargar_resenas(filtros: Optional[FiltrosResenas] = None) -> pd.DataFrame:
+    consulta = _filtrar_resenas(select(Reseña.id_juego, Reseña.id_usuario, Reseña.calificacion)
+                                .where(Reseña.id_juego.isnot(None), Reseña.id_usuario.isnot(None)), filtros)
+    return _leer(consulta, {"id_juego": _enteros, "id_usuario": _enteros, "calificacion": _enteros})
+
+def cargar_usuarios() -> pd.DataFrame:
+    consulta = select(Usuario.id_usuario, Usuario.fecha_registro).where(Usuario.fecha_registro.isnot(None))
+    return _leer(consulta, {"id_usuario": _enteros, "fecha_registro": _fechas})
+
+# === INGRESOS ===
+# DataFrame con índice clave (id_juego, índice de mes o método) y columnas
+# cantidad y total, ordenado por clave
+def ingresos_por(compras: pd.DataFrame, agrupar_por: str) -> pd.DataFrame:
+    claves = {
+        "juego": compras["id_juego"],
+        "mes": _indice_mes(compras["fecha"]),
+        "metodo": compras["metodo"].astype(str),
+    }[agrupar_por]
+    grupos = compras["centavos"].groupby(claves.to_numpy(), sort=True)
+    resultado = pd.DataFrame({"cantidad": grupos.size(), "total": grupos.sum() / 100})
+    resultado.index.name = "clave"
+    return resultado
+
+def ingresos_por_sql(agrupar_por: str, filtros: Optional[FiltrosVentas] = None) -> pd.DataFrame:
+    clave = {
+        "juego": Compra.id_juego,
+        "mes": _indice_mes_sql(Compra.fecha_compra),
+        "metodo": Compra.metodo_pago,
+    }[agrupar_por]
+    consulta = _filtrar_compras(
+        select(clave.label("clave"), func.count().label("cantidad"), func.sum(Compra.monto_pagado).label("total"))
+        .where(Compra.id_usuario.isnot(None), Compra.id_juego.isnot(None), Compra.metodo_pago.isnot(None)), filtros
+    ).group_by(clave)
+    with obtener_engine().connect() as conexion:
+        filas = conexion.execute(consulta).all()
+    resultado = pd.DataFrame(
+        [(f.clave.value if agrupar_por == "metodo" else int(f.clave), f.cantidad, round(float(f.total), 2))
+         for f in filas],
+        columns=["clave", "cantidad", "total"]
+    ).set_index("clave").sort_index()
+    return resultado.astype({"cantidad": np.int64})
+
+def media_movil_ingresos(compras: pd.DataFrame, ventana: int = 7) -> pd.DataFrame:
+    # Ingresos por día calendario (los días sin ventas cuentan como 0) y su
+    # media móvil de `ventana` días. No tiene equivalente en SQL portable:
+    # necesitaría un calendario (generate_series / CTE recursivo) por motor
+    diario = compras.set_index("fecha")["centavos"].resample("D").sum() / 100
+    return pd.DataFrame({"total": diario, "media_movil": diario.rolling(ventana, min_periods=1).mean()})
+
+# === COHORTES ===
+# Retención por cohorte de registro: fila = mes de Usuario.fecha_registro,
+# columna = meses desde el registro, valor = fracción de la cohorte que compró
+# en ese mes. Las compras anteriores al registro se ignoran
+def retencion_cohortes(usuarios: pd.DataFrame, compras: pd.DataFrame) -> pd.DataFrame:
+    cohortes = pd.Series(_indice_mes(usuarios["fecha_registro"]).to_numpy(), index=usuarios["id_usuario"].to_numpy())
+    actividad = pd.DataFrame({
+        "id_usuario": compras["id_usuario"].to_numpy(),
+        "mes": _indice_mes(compras["fecha"]).to_numpy(),
+    }).drop_duplicates()
+    actividad["cohorte"] = cohortes.reindex(actividad["id_usuario"]).to_numpy()
+    actividad = actividad.dropna(subset=["cohorte"])
+    actividad["desplazamiento"] = actividad["mes"] - actividad["cohorte"].astype(np.int64)
+    actividad = actividad[actividad["desplazamiento"] >= 0]
+    activos = actividad.groupby(["cohorte", "desplazamiento"]).size().unstack(fill_value=0)
+    activos.index = activos.index.astype(np.int64)
+    tamanos = cohortes.value_counts()
+    return _tabla_retencion(activos, tamanos)
+
+def retencion_cohortes_sql() -> pd.DataFrame:
+    cohorte = _indice_mes_sql(Usuario.fecha_registro)
+    desplazamiento = _indice_mes_sql(Compra.fecha_compra) - cohorte
+    consulta = (
+        select(cohorte.label("cohorte"), desplazamiento.label("desplazamiento"),
+               func.count(distinct(Compra.id_usuario)).label("activos"))
+        .join(Usuario, Compra.id_usuario == Usuario.id_usuario)
+        .where(Usuario.fecha_registro.isnot(None), Compra.fecha_compra.isnot(None), desplazamiento >= 0)
+        .group_by(cohorte, desplazamiento)
+    )
+    consulta_tamanos = select(cohorte.label("cohorte"), func.count().label("usuarios")).where(
+        Usuario.fecha_registro.isnot(None)).group_by(cohorte)
+    with obtener_engine().connect() as conexion:
+        filas = conexion.execute(consulta).all()
+        tamanos = pd.Series({int(f.cohorte): f.usuarios for f in conexion.execute(consulta_tamanos)})
+    activos = pd.DataFrame(
+        [(int(f.cohorte), int(f.desplazamiento), f.activos) for f in filas],
+        columns=["cohorte", "desplazamiento", "activos"]
+    ).pivot(index="cohorte", columns="desplazamiento", values="activos").fillna(0).astype(np.int64)
+    return _tabla_retencion(activos, tamanos)
+
+def _tabla_retencion(activos, tamanos):
+    # Todas las cohortes (también las que nunca compraron) y desplazamientos 0..máximo
+    columnas = range(int(activos.columns.max()) + 1) if len(activos.columns) else range(0)
+    activos = activos.reindex(index=tamanos.index.sort_values(), columns=columnas, fill_value=0)
+    retencion = activos.div(tamanos.reindex(activos.index).to_numpy(), axis=0)
+    retencion.index.name = "cohorte"
+    retencion.columns.name = "desplazamiento"
+    return retencion
+
+def mes_de_indice(indice: int) -> str:
+    return f"{indice // 12:04d}-{indice % 12 + 1:02d}"
+
+# === CALIFICACIONES ===
+# Reseñas con 1..5 estrellas: una fila (total) o una por juego
+def distribucion_calificaciones(resenas: pd.DataFrame, por_juego: bool = False) -> pd.DataFrame:
+    columnas = [f"estrellas_{n}" for n in range(1, 6)]
+    if not por_juego:
+        conteos = np.bincount(resenas["calificacion"].to_numpy(), minlength=6)[1:]
+        return pd.DataFrame([conteos], columns=columnas)
+    juegos, posiciones = np.unique(resenas["id_juego"].to_numpy(), return_inverse=True)
+    conteos = np.zeros((len(juegos), 5), dtype=np.int64)
+    np.add.at(conteos, (posiciones, resenas["calificacion"].to_numpy() - 1), 1)
+    return pd.DataFrame(conteos, index=pd.Index(juegos, name="id_juego"), columns=columnas)
+
+def distribucion_calificaciones_sql(por_juego: bool = False, filtros: Optional[FiltrosResenas] = None) -> pd.DataFrame:
+    columnas = [f"estrellas_{n}" for n in range(1, 6)]
+    claves = [Reseña.id_juego] if por_juego else []
+    consulta = _filtrar_resenas(
+        select(*claves, Reseña.calificacion, func.count()).where(Reseña.id_juego.isnot(None), Reseña.id_usuario.isnot(None)),
+        filtros
+    ).group_by(*claves, Reseña.calificacion)
+    with obtener_engine().connect() as conexion:
+        filas = conexion.execute(consulta).all()
+    if not por_juego:
+        conteos = np.zeros(5, dtype=np.int64)
+        for calificacion, cantidad in filas:
+            conteos[calificacion - 1] = cantidad
+        return pd.DataFrame([conteos], columns=columnas)
+    tabla = pd.DataFrame(filas, columns=["id_juego", "calificacion", "cantidad"]).pivot(
+        index="id_juego", columns="calificacion", values="cantidad")
+    tabla = tabla.reindex(columns=range(1, 6)).fillna(0).astype(np.int64).sort_index()
+    tabla.columns = columnas
+    return tabla
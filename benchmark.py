@@ -0,0 +1,161 @@
+import os
+import json
+import math
+import time
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+from datetime import datetime
+from sqlalchemy import event, text
+
+from modelos import obtener_engine, session, MetodoPago
+from servicios import (
+    consulta_ventas, consulta_resenas, consulta_actividad, FiltrosVentas, FiltrosResenas, FiltrosActividad,
+    resumen_ventas, actualizar_resumenes_ventas,
+    pagina_usuarios, pagina_juegos, pagina_eventos, exportar_tabla_csv, TABLAS_EXPORTACION
+)
+from generar_datos import generar
+
+# Benchmark de las operaciones del menú sin los input(): llama directamente a
+# las consultas de cada reporte, listado y exportación y guarda latencias
+# (p50/p95/p99), sentencias SQL, filas leídas y memoria pico en un JSON para
+# comparar entre commits. Por defecto mide los datos que ya tiene la base;
+# generar escalas vacía todas las tablas, así que exige --vaciar y un
+# DATABASE_URL explícito (nunca la base por defecto de modelos.py).
+# Uso: python benchmark.py
+#      DATABASE_URL=sqlite:///bench.db python benchmark.py --vaciar --escalas 1000 10000 100000
+
+class ContadorSentencias:
+    def __init__(self):
+        self.total = 0
+        event.listen(obtener_engine(), "before_cursor_execute", self._contar)
+
+    def _contar(self, *args):
+        self.total += 1
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+def _primer_id(columna, tabla):
+    return session.execute(text(f"SELECT {columna} FROM {tabla} ORDER BY {columna} LIMIT 1")).scalar()
+
+def _exportar_todo():
+    with tempfile.TemporaryDirectory() as directorio, obtener_engine().connect() as conexion:
+        filas = 0
+        for nombre, modelo in TABLAS_EXPORTACION:
+            stats = exportar_tabla_csv(conexion, modelo.__table__, os.path.join(directorio, f"{nombre}.csv"))
+            filas += stats["filas"] if stats else 0
+        return filas
+
+def operaciones():
+    usuario_id = _primer_id("id_usuario", "compra")
+    juego_id = _primer_id("id_juego", "compra")
+    return [
+        ("reporte_ventas", lambda: len(session.execute(consulta_ventas()).all())),
+        ("reporte_ventas_usuario", lambda: len(session.execute(consulta_ventas(FiltrosVentas(usuario_id=usuario_id))).all())),
+        ("reporte_ventas_juego_metodo", lambda: len(session.execute(consulta_ventas(FiltrosVentas(juego_id=juego_id, metodo=MetodoPago.TARJETA))).all())),
+        ("resumen_ventas", lambda: len(resumen_ventas())),
+        ("resumen_ventas_metodo", lambda: len(resumen_ventas(agrupar_por="metodo"))),
+        ("resumen_ventas_juego_dia", lambda: len(resumen_ventas(FiltrosVentas(juego_id=juego_id), agrupar_por="dia"))),
+        ("reporte_resenas", lambda: len(session.execute(consulta_resenas()).all())),
+        ("reporte_resenas_juego", lambda: len(session.execute(consulta_resenas(FiltrosResenas(juego_id=juego_id))).all())),
+        ("reporte_actividad_usuarios", lambda: len(session.execute(consulta_actividad()).all())),
+        ("reporte_actividad_tipo", lambda: len(session.execute(consulta_actividad(FiltrosActividad(tipo_actividad="logro"))).all())),
+        ("reporte_actividad_mes", lambda: len(session.execute(consulta_actividad(FiltrosActividad(
+            fecha_inicio=datetime(2024, 12, 1), fecha_fin=datetime(2024, 12, 31)))).all())),
+        ("listar_usuarios", lambda: len(pagina_usuarios()[0])),
+        ("listar_juegos", lambda: len(pagina_juegos()[0])),
+        ("listar_eventos", lambda: len(pagina_eventos()[0])),
+        ("exportar_datos_csv", _exportar_todo),
+    ]
+
+def medir(operacion, repeticiones, contador):
+    tiempos = []
+    for _ in range(repeticiones):
+        # Sesión limpia en cada repetición para no medir el identity map
+        session.expunge_all()
+        inicio = time.perf_counter()
+        operacion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+        session.rollback()
+    # tracemalloc hace todo más lento, así que la memoria se mide en una corrida aparte
+    session.expunge_all()
+    antes = contador.total
+    tracemalloc.start()
+    filas = operacion()
+    memoria_pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    sentencias = contador.total - antes
+    session.rollback()
+    return {
+        "p50_ms": percentil(tiempos, 50),
+        "p95_ms": percentil(tiempos, 95),
+        "p99_ms": percentil(tiempos, 99),
+        "sentencias": sentencias,
+        "filas": filas,
+        "memoria_pico_mb": memoria_pico / (1024 * 1024)
+    }
+
+def commit_actual():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def exigir_base_explicita(parser, accion):
+    # Las operaciones destructivas nunca corren contra el DATABASE_URL por defecto
+    if "DATABASE_URL" not in os.environ:
+        parser.error(f"{accion} modifica la base: defina DATABASE_URL explícitamente con una base de pruebas.")
+
+def correr(escalas, repeticiones, semilla):
+    contador = ContadorSentencias()
+    resultados = {}
+    for escala in escalas:
+        if escala is not None:
+            session.close()
+            print(f"\nGenerando datos: {escala} compras")
+            generar(escala, semilla, vaciar=True)
+            actualizar_resumenes_ventas()
+        nombre_escala = str(escala) if escala is not None else "actual"
+        resultados[nombre_escala] = {}
+        print(f"\nESCALA {nombre_escala}")
+        print(f"{'Operación':<30} | {'p50 ms':>10} | {'p95 ms':>10} | {'p99 ms':>10} | {'SQL':>5} | {'Filas':>10} | {'Mem MB':>8}")
+        print("-" * 100)
+        for nombre, operacion in operaciones():
+            r = medir(operacion, repeticiones, contador)
+            resultados[nombre_escala][nombre] = r
+            print(f"{nombre:<30} | {r['p50_ms']:>10.1f} | {r['p95_ms']:>10.1f} | {r['p99_ms']:>10.1f} | "
+                  f"{r['sentencias']:>5} | {r['filas']:>10} | {r['memoria_pico_mb']:>8.1f}")
+    return resultados
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de las operaciones del menú")
+    parser.add_argument("--escalas", type=int, nargs="+",
+                        help="Compras a generar por escala (requiere --vaciar; sin esto se miden los datos actuales)")
+    parser.add_argument("--vaciar", action="store_true",
+                        help="Permite vaciar la base en cada escala (requiere DATABASE_URL explícito)")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--salida", default="benchmark.json")
+    args = parser.parse_args()
+    if args.escalas and not args.vaciar:
+        parser.error("--escalas vacía todas las tablas de la base: agregue --vaciar para confirmarlo.")
+    if args.vaciar:
+        exigir_base_explicita(parser, "--vaciar")
+    escalas = args.escalas or [None]
+    resultados = correr(escalas, args.repeticiones, args.semilla)
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump({
+            "commit": commit_actual(),
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "base_datos": obtener_engine().dialect.name,
+            "repeticiones": args.repeticiones,
+            "resultados": resultados
+        }, f, indent=2, ensure_ascii=False)
+    print(f"\nResultados guardados en '{args.salida}'")
+
+if __name__ == "__main__":
+    main()
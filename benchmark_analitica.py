@@ -0,0 +1,89 @@
+import json
+import time
+import argparse
+import statistics
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from modelos import obtener_engine
+from benchmark import commit_actual
+from analitica import (
+    cargar_compras, cargar_resenas, cargar_usuarios, ingresos_por, ingresos_por_sql, AGRUPACIONES,
+    retencion_cohortes, retencion_cohortes_sql, distribucion_calificaciones, distribucion_calificaciones_sql
+)
+
+# Compara cada reporte de analitica.py calculado en SQL (GROUP BY en la base)
+# contra el camino vectorizado (carga en bloque + pandas/NumPy). Mide el
+# camino vectorizado completo y solo el cálculo (con los datos ya cargados,
+# p. ej. cuando se generan varios reportes sobre la misma carga), verifica que
+# los resultados coincidan e indica el más rápido.
+# Uso: DATABASE_URL=sqlite:///bench.db python benchmark_analitica.py [--repeticiones 5]
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos), resultado
+
+def iguales(a, b):
+    return a.shape == b.shape and a.index.equals(b.index) and np.allclose(a.to_numpy(float), b.to_numpy(float))
+
+def reportes():
+    # (nombre, SQL, carga, cálculo sobre lo cargado)
+    lista = [
+        (f"ingresos_{agrupacion}", lambda a=agrupacion: ingresos_por_sql(a),
+         lambda: cargar_compras(), lambda compras, a=agrupacion: ingresos_por(compras, a))
+        for agrupacion in AGRUPACIONES
+    ]
+    lista += [
+        ("retencion_cohortes", retencion_cohortes_sql,
+         lambda: (cargar_usuarios(), cargar_compras()), lambda datos: retencion_cohortes(*datos)),
+        ("calificaciones", distribucion_calificaciones_sql,
+         cargar_resenas, distribucion_calificaciones),
+        ("calificaciones_por_juego", lambda: distribucion_calificaciones_sql(por_juego=True),
+         cargar_resenas, lambda resenas: distribucion_calificaciones(resenas, por_juego=True)),
+    ]
+    return lista
+
+def correr(repeticiones):
+    resultados = {}
+    print(f"{'Reporte':<26} | {'SQL ms':>10} | {'Vector ms':>10} | {'Cálculo ms':>10} | {'Igual':>5} | Más rápido")
+    print("-" * 90)
+    for nombre, sql, cargar, calcular in reportes():
+        ms_sql, resultado_sql = medir(sql, repeticiones)
+        ms_vector, resultado_vector = medir(lambda: calcular(cargar()), repeticiones)
+        datos = cargar()
+        ms_calculo, _ = medir(lambda: calcular(datos), repeticiones)
+        coinciden = iguales(resultado_sql, resultado_vector)
+        rapido = "SQL" if ms_sql <= ms_vector else "vectorizado"
+        resultados[nombre] = {
+            "sql_ms": ms_sql, "vectorizado_ms": ms_vector, "calculo_ms": ms_calculo,
+            "resultados_iguales": coinciden, "mas_rapido": rapido
+        }
+        print(f"{nombre:<26} | {ms_sql:>10.1f} | {ms_vector:>10.1f} | {ms_calculo:>10.1f} | "
+              f"{'sí' if coinciden else 'NO':>5} | {rapido}")
+    return resultados
+
+def main():
+    parser = argparse.ArgumentParser(description="SQL GROUP BY contra pandas/NumPy para los reportes analíticos")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--salida", default="benchmark_analitica.json")
+    args = parser.parse_args()
+    resultados = correr(args.repeticiones)
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump({
+            "commit": commit_actual(),
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "base_datos": obtener_engine().dialect.name,
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "repeticiones": args.repeticiones,
+            "resultados": resultados
+        }, f, indent=2, ensure_ascii=False)
+    print(f"\nResultados guardados en '{args.salida}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import re
+import sys
+import json
+import time
+import argparse
+import statistics
+from datetime import datetime, timedelta
+from enum import Enum as PyEnum
+from sqlalchemy import text
+
+from modelos import obtener_engine, session, MetodoPago
+from servicios import consulta_ventas, FiltrosVentas
+from migrar import DIRECTORIO_MIGRACIONES, aplicar_migracion, versiones_aplicadas
+from benchmark import exigir_base_explicita
+
+# Benchmark de la migración 001_indices: genera un conjunto de compras con
+# generate_series, mide las consultas de reporte_ventas sin los índices y con
+# ellos, y muestra los planes (EXPLAIN ANALYZE) de antes y después.
+# Agrega filas y borra índices, así que exige un DATABASE_URL explícito que
+# apunte a una base de pruebas, nunca la de producción.
+# Uso: DATABASE_URL=postgresql://.../bench python benchmark_indices.py --compras 10000000
+# Las medianas, las filas y los planes de cada corrida quedan en --salida
+# (benchmark_indices.json, fuera del repositorio): dependen de la máquina
+MIGRACION = "001_indices"
+ARCHIVO_MIGRACION = f"{DIRECTORIO_MIGRACIONES}/{MIGRACION}.sql"
+FECHA_BASE = datetime(2020, 1, 1)
+
+def tipo_columna(conexion, tabla, columna):
+    # Las columnas enum pueden ser VARCHAR (schema.sql) o un ENUM de PostgreSQL (create_all)
+    return conexion.execute(text("""
+        SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+        WHERE attrelid = CAST(:tabla AS regclass) AND attname = :columna
+    """), {"tabla": tabla, "columna": columna}).scalar()
+
+def contar(conexion, tabla):
+    return conexion.execute(text(f"SELECT count(*) FROM {tabla}")).scalar()
+
+def generar_datos(conexion, compras, usuarios, juegos):
+    faltan = usuarios - contar(conexion, "usuario")
+    if faltan > 0:
+        rol = tipo_columna(conexion, "usuario", "rol_usuario")
+        conexion.execute(text(f"""
+            INSERT INTO usuario (nombre, correo, contraseña, rol_usuario, fecha_registro)
+            SELECT 'Bench' || g, 'bench' || g || '_' || md5(random()::text) || '@bench.local', 'x',
+                   CAST(CASE WHEN g % 50 = 0 THEN 'DESARROLLADOR' ELSE 'JUGADOR' END AS {rol}),
+                   DATE '2020-01-01' + (g % 1800)
+            FROM generate_series(1, :n) g
+        """), {"n": faltan})
+    faltan = juegos - contar(conexion, "juego")
+    if faltan > 0:
+        estado = tipo_columna(conexion, "juego", "estado_juego")
+        conexion.execute(text(f"""
+            INSERT INTO juego (nombre, descripcion, fecha_lanzamiento, precio, estado_juego, id_desarrollador)
+            SELECT 'Juego bench ' || g, 'Generado para benchmark', DATE '2020-01-01' + (g % 1800),
+                   round((random() * 60)::numeric, 2), CAST('LANZADO' AS {estado}),
+                   (SELECT min(id_usuario) FROM usuario)
+            FROM generate_series(1, :n) g
+        """), {"n": faltan})
+    faltan = compras - contar(conexion, "compra")
+    if faltan > 0:
+        metodo = tipo_columna(conexion, "compra", "metodo_pago")
+        # Los ids pueden tener huecos (las secuencias no vuelven atrás con un
+        # ROLLBACK): se numeran los usuarios y juegos que existen y se sortea el
+        # número. Los juegos más populares salen con más frecuencia (power(random(), 3))
+        for tabla, pk in (("usuario", "id_usuario"), ("juego", "id_juego")):
+            conexion.execute(text(f"""
+                CREATE TEMP TABLE bench_{tabla} ON COMMIT DROP AS
+                SELECT row_number() OVER (ORDER BY {pk}) AS n, {pk} FROM {tabla}
+            """))
+        conexion.execute(text("ALTER TABLE compra DISABLE TRIGGER USER"))
+        conexion.execute(text(f"""
+            INSERT INTO compra (id_usuario, id_juego, fecha_compra, monto_pagado, metodo_pago)
+            SELECT u.id_usuario, j.id_juego,
+                   TIMESTAMP '2020-01-01' + random() * INTERVAL '5 years',
+                   round((random() * 60)::numeric, 2),
+                   CAST((ARRAY['TARJETA', 'PAYPAL', 'CREDITO', 'CRIPTO'])[1 + floor(random() * 4)::int] AS {metodo})
+            FROM (
+                SELECT 1 + floor(random() * (SELECT count(*) FROM bench_usuario))::int AS n_usuario,
+                       1 + floor(power(random(), 3) * (SELECT count(*) FROM bench_juego))::int AS n_juego
+                FROM generate_series(1, :n) g
+            ) sorteo
+            JOIN bench_usuario u ON u.n = sorteo.n_usuario
+            JOIN bench_juego j ON j.n = sorteo.n_juego
+        """), {"n": faltan})
+        conexion.execute(text("ALTER TABLE compra ENABLE TRIGGER USER"))
+
+def indices_migracion():
+    with open(ARCHIVO_MIGRACION, encoding="utf-8") as f:
+        return re.findall(r"CREATE INDEX IF NOT EXISTS (\S+)", f.read())
+
+def quitar_indices(conexion):
+    for indice in indices_migracion():
+        conexion.execute(text(f'DROP INDEX IF EXISTS "{indice}"'))
+    versiones_aplicadas(conexion)
+    conexion.execute(text("DELETE FROM version_esquema WHERE version = :version"), {"version": MIGRACION})
+
+def analizar():
+    with obtener_engine().connect() as conexion:
+        conexion.execution_options(isolation_level="AUTOCOMMIT").execute(text("VACUUM ANALYZE"))
+
+def casos(conexion):
+    usuario_id = conexion.execute(text("SELECT id_usuario FROM compra LIMIT 1")).scalar()
+    juego_id = conexion.execute(text("SELECT id_juego FROM compra LIMIT 1")).scalar()
+    return [
+        ("7 días", {"fecha_inicio": FECHA_BASE + timedelta(days=400), "fecha_fin": FECHA_BASE + timedelta(days=406)}),
+        ("usuario", {"usuario_id": usuario_id}),
+        ("juego + 30 días", {"juego_id": juego_id, "fecha_inicio": FECHA_BASE + timedelta(days=400),
+                             "fecha_fin": FECHA_BASE + timedelta(days=429)}),
+        ("método + 1 día", {"metodo": MetodoPago.PAYPAL, "fecha_inicio": FECHA_BASE + timedelta(days=400),
+                            "fecha_fin": FECHA_BASE + timedelta(days=400)}),
+        ("últimas 100", {}),
+    ]
+
+def sentencia(filtros):
+    query = consulta_ventas(FiltrosVentas(**filtros))
+    if not filtros:
+        query = query.limit(100)
+    return query
+
+def plan(conexion, stmt):
+    compilado = stmt.compile(dialect=obtener_engine().dialect)
+    parametros = {k: (v.name if isinstance(v, PyEnum) else v) for k, v in compilado.params.items()}
+    filas = conexion.exec_driver_sql("EXPLAIN (ANALYZE, BUFFERS) " + str(compilado), parametros)
+    return "\n".join(fila[0] for fila in filas)
+
+def medir(repeticiones):
+    resultados = {}
+    with obtener_engine().connect() as conexion:
+        for nombre, filtros in casos(conexion):
+            stmt = sentencia(filtros)
+            tiempos = []
+            filas = 0
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                filas = len(conexion.execute(stmt).fetchall())
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+            resultados[nombre] = {
+                "filas": filas,
+                "mediana_ms": statistics.median(tiempos),
+                "max_ms": max(tiempos),
+                "plan": plan(conexion, stmt)
+            }
+    return resultados
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los índices de la migración 001")
+    parser.add_argument("--compras", type=int, default=10_000_000)
+    parser.add_argument("--usuarios", type=int, default=200_000)
+    parser.add_argument("--juegos", type=int, default=5_000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--salida", default="benchmark_indices.json")
+    args = parser.parse_args()
+    exigir_base_explicita(parser, "El benchmark de índices")
+    if obtener_engine().dialect.name != "postgresql":
+        sys.exit("El benchmark de índices requiere PostgreSQL (DATABASE_URL).")
+    session.close()
+    with obtener_engine().begin() as conexion:
+        generar_datos(conexion, args.compras, args.usuarios, args.juegos)
+        quitar_indices(conexion)
+    analizar()
+    antes = medir(args.repeticiones)
+    with obtener_engine().begin() as conexion:
+        versiones_aplicadas(conexion)
+        aplicar_migracion(conexion, MIGRACION, ARCHIVO_MIGRACION)
+    analizar()
+    despues = medir(args.repeticiones)
+    for nombre in antes:
+        print("=" * 100)
+        print(f"{nombre}: {antes[nombre]['mediana_ms']:.1f} ms -> {despues[nombre]['mediana_ms']:.1f} ms "
+              f"({antes[nombre]['filas']} filas)")
+        print("-" * 100)
+        print("ANTES:")
+        print(antes[nombre]["plan"])
+        print("-" * 100)
+        print("DESPUÉS:")
+        print(despues[nombre]["plan"])
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump({"compras": args.compras, "antes": antes, "despues": despues}, f, indent=2, ensure_ascii=False)
+    print(f"\nResultados guardados en '{args.salida}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+from collections import OrderedDict
+import threading
+import time
+
+# Caché en memoria del proceso: LRU con capacidad máxima y vencimiento (TTL)
+# por entrada. Es segura entre hilos y lleva la cuenta de aciertos, fallos,
+# vencimientos y desalojos (metricas()).
+# obtener() devuelve FALTA si la clave no está o ya venció (None es un valor válido)
+FALTA = object()
+
+class CacheLRU:
+    def __init__(self, capacidad, ttl):
+        self.capacidad = capacidad
+        self.ttl = ttl
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self._metricas = {"aciertos": 0, "fallos": 0, "vencidas": 0, "desalojadas": 0, "invalidadas": 0}
+
+    def obtener(self, clave):
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                self._metricas["fallos"] += 1
+                return FALTA
+            valor, vence = entrada
+            if vence < time.monotonic():
+                del self._datos[clave]
+                self._metricas["fallos"] += 1
+                self._metricas["vencidas"] += 1
+                return FALTA
+            self._datos.move_to_end(clave)
+            self._metricas["aciertos"] += 1
+            return valor
+
+    def guardar(self, clave, valor):
+        with self._lock:
+            self._datos[clave] = (valor, time.monotonic() + self.ttl)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.capacidad:
+                self._datos.popitem(last=False)
+                self._metricas["desalojadas"] += 1
+
+    def invalidar(self, clave):
+        with self._lock:
+            if self._datos.pop(clave, None) is not None:
+                self._metricas["invalidadas"] += 1
+
+    def limpiar(self):
+        with self._lock:
+            self._metricas["invalidadas"] += len(self._datos)
+            self._datos.clear()
+
+    def metricas(self):
+        with self._lock:
+            metricas = dict(self._metricas, entradas=len(self._datos), capacidad=self.capacidad)
+        consultas = metricas["aciertos"] + metricas["fallos"]
+        metricas["tasa_aciertos"] = metricas["aciertos"] / consultas if consultas else 0.0
+        return metricas
+
+    def __len__(self):
+        return len(self._datos)
@@ -0,0 +1,71 @@
+# Árbol de Fenwick sobre los puntajes de una clasificación: guarda cuántos
+# jugadores tienen cada puntaje. Con él la posición de un puntaje, su
+# percentil y el puntaje que ocupa la posición k salen en O(log P), donde P
+# es el puntaje máximo, sin recorrer a los jugadores. Los puntajes no pueden
+# ser negativos (CHECK de Logro.puntos, migraciones/009_logro_puntos.sql).
+
+class ArbolPuntajes:
+    def __init__(self, conteos=None):
+        # conteos: {puntos: jugadores con esos puntos}
+        self._arbol = [0, 0]
+        self.total = 0
+        for puntos, jugadores in (conteos or {}).items():
+            self.agregar(puntos, jugadores)
+
+    def _crecer(self, indice):
+        # Al duplicar el tamaño solo el nuevo último nodo cubre a los anteriores
+        while indice >= len(self._arbol):
+            tamano = len(self._arbol) - 1
+            self._arbol.extend([0] * tamano)
+            self._arbol[2 * tamano] = self.total
+
+    def agregar(self, puntos, jugadores=1):
+        # jugadores negativo para quitar (el jugador subió de puntaje o se eliminó)
+        if puntos < 0:
+            raise ValueError(f"Puntaje negativo: {puntos}")
+        indice = puntos + 1
+        self._crecer(indice)
+        self.total += jugadores
+        while indice < len(self._arbol):
+            self._arbol[indice] += jugadores
+            indice += indice & -indice
+
+    def _prefijo(self, indice):
+        indice = min(indice, len(self._arbol) - 1)
+        suma = 0
+        while indice > 0:
+            suma += self._arbol[indice]
+            indice -= indice & -indice
+        return suma
+
+    def menores(self, puntos):
+        return self._prefijo(puntos)
+
+    def mayores(self, puntos):
+        return self.total - self._prefijo(puntos + 1)
+
+    def posicion(self, puntos):
+        # Los empates comparten posición (1, 2, 2, 4...)
+        return self.mayores(puntos) + 1
+
+    def percentil(self, puntos):
+        # Porcentaje de jugadores con igual o menos puntos
+        if not self.total:
+            return None
+        return 100 * (self.total - self.mayores(puntos)) / self.total
+
+    def puntaje_en_posicion(self, posicion):
+        # Puntaje del jugador en la posición dada (1 = el de más puntos)
+        if not 1 <= posicion <= self.total:
+            return None
+        buscado = self.total - posicion + 1
+        indice = 0
+        paso = (len(self._arbol) - 1).bit_length()
+        paso = 1 << paso
+        while paso:
+            siguiente = indice + paso
+            if siguiente < len(self._arbol) and self._arbol[siguiente] < buscado:
+                indice = siguiente
+                buscado -= self._arbol[siguiente]
+            paso >>= 1
+        return indice
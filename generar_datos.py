@@ -0,0 +1,401 @@
+import sys
+import time
+import random
+import argparse
+import itertools
+from array import array
+from datetime import date, datetime, timedelta
+from sqlalchemy import text
+
+from modelos import (
+    obtener_engine, crear_esquema, Base, Usuario, PerfilUsuario, Juego, VersionJuego, Compra, Reseña, Logro,
+    ProgresoUsuarioLogro, Categoria, juego_categoria, JuegoPlataforma, JuegoFavorito, Evento,
+    ParticipacionEvento, Comentario, ReporteComentario, BitacoraActividad, MantenimientoJuego,
+    HistorialPrecio, ReporteJuego, RolUsuario, EstadoJuego, MetodoPago, TipoEvento, Plataforma
+)
+from servicios import cargar_copy, cargar_lotes, reconstruir_clasificaciones, crear_particiones_bitacora
+
+# Generador de datos sintéticos para pruebas de carga (data.sql solo trae ~10
+# usuarios). Todo se deriva de la cantidad de compras y de una semilla, así que
+# la misma combinación produce siempre los mismos datos. En PostgreSQL se carga
+# con COPY; en otras bases con executemany por lotes.
+# Uso: DATABASE_URL=postgresql://.../bench python generar_datos.py --compras 1000000 --semilla 42
+
+FECHA_INICIO = date(2020, 1, 1)
+DIAS_PERIODO = (date(2024, 12, 31) - FECHA_INICIO).days + 1
+LOTE = 10_000
+
+CATEGORIAS = ["Acción", "Aventura", "RPG", "Estrategia", "Deportes", "Carreras", "Simulación",
+              "Puzzle", "Terror", "Plataformas", "Shooter", "Indie"]
+PAISES = ["Guatemala", "México", "España", "Argentina", "Colombia", "Chile", "Perú", "Estados Unidos"]
+PRECIOS = [0.0, 4.99, 9.99, 14.99, 19.99, 29.99, 39.99, 59.99, 69.99]
+PESOS_PRECIOS = [5, 10, 20, 20, 15, 12, 8, 7, 3]
+PESOS_METODOS = [55, 25, 12, 8]
+# Distribución en J típica de las reseñas: muchas de 5 y 4, pocas de 2
+PESOS_CALIFICACION = [10, 6, 12, 30, 42]
+COMENTARIOS_RESEÑA = {
+    1: "No lo recomiendo.", 2: "Tiene muchos problemas.", 3: "Está bien, nada especial.",
+    4: "Muy buen juego.", 5: "¡Excelente, de mis favoritos!"
+}
+PUNTOS_LOGRO = [5, 10, 25, 50, 100]
+MOTIVOS_REPORTE = ["Spam", "Contenido ofensivo", "Información falsa", "Otro"]
+
+def _rng(semilla, tabla):
+    # Un generador independiente por tabla: regenerar una tabla no altera las demás
+    return random.Random(f"{semilla}-{tabla}")
+
+def _pesos_zipf(n, s):
+    return array('d', itertools.accumulate(1.0 / (i ** s) for i in range(1, n + 1)))
+
+def _permutacion(n):
+    # Reparte los índices populares entre todos los ids (i -> i * p mod n)
+    p = 1_000_003 if n % 1_000_003 else 1_000_033
+    return lambda i: (i * p) % n + 1
+
+def _dia(d):
+    return FECHA_INICIO + timedelta(days=d)
+
+def _instante(rng, d):
+    return datetime.combine(_dia(d), datetime.min.time()) + timedelta(seconds=rng.randrange(86400))
+
+def tamanos(compras):
+    return {
+        "compras": compras,
+        "usuarios": max(50, compras // 20),
+        "juegos": max(20, compras // 500),
+        "eventos": max(10, min(5000, compras // 1000)),
+        "reseñas": compras // 10,
+        "comentarios": compras // 20
+    }
+
+def preparar_contexto(compras, semilla):
+    ctx = dict(tamanos(compras), semilla=semilla)
+    # Eventos primero: sus ventanas generan las ráfagas de compras
+    rng = _rng(semilla, "evento")
+    eventos = []
+    for id_evento in range(1, ctx["eventos"] + 1):
+        inicio = rng.randrange(DIAS_PERIODO)
+        duracion = rng.randint(1, 14)
+        tipo = rng.choices(list(TipoEvento), weights=[30, 20, 50])[0]
+        eventos.append((id_evento, inicio, min(inicio + duracion, DIAS_PERIODO - 1), tipo))
+    ctx["lista_eventos"] = eventos
+    pesos_dias = [1.4 if _dia(d).weekday() >= 5 else 1.0 for d in range(DIAS_PERIODO)]
+    rebaja = bytearray(DIAS_PERIODO)
+    for _, inicio, fin, tipo in eventos:
+        for d in range(inicio, fin + 1):
+            if tipo == TipoEvento.REBAJA:
+                pesos_dias[d] *= 4
+                rebaja[d] = 1
+            elif tipo == TipoEvento.LANZAMIENTO and d < inicio + 3:
+                pesos_dias[d] *= 3
+    ctx["peso_dias"] = array('d', itertools.accumulate(pesos_dias))
+    ctx["rebaja"] = rebaja
+
+    rng = _rng(semilla, "usuario")
+    ctx["registro"] = array('H', (rng.randrange(DIAS_PERIODO) for _ in range(ctx["usuarios"])))
+    # Pocos usuarios hacen la mayoría de las compras y pocos juegos concentran las ventas
+    ctx["peso_usuarios"] = _pesos_zipf(ctx["usuarios"], 0.8)
+    ctx["peso_juegos"] = _pesos_zipf(ctx["juegos"], 1.1)
+    ctx["usuario_de"] = _permutacion(ctx["usuarios"])
+    ctx["juego_de"] = _permutacion(ctx["juegos"])
+
+    rng = _rng(semilla, "juego")
+    ctx["precios"] = array('d', rng.choices(PRECIOS, weights=PESOS_PRECIOS, k=ctx["juegos"]))
+    ctx["lanzamiento"] = array('H', (rng.randrange(DIAS_PERIODO) for _ in range(ctx["juegos"])))
+    # Cada juego tiene entre 5 y 15 logros con ids consecutivos
+    rng = _rng(semilla, "logro")
+    cantidades = [rng.randint(5, 15) for _ in range(ctx["juegos"])]
+    ctx["logros_cantidad"] = array('B', cantidades)
+    ctx["logros_inicio"] = array('L', itertools.accumulate([1] + cantidades[:-1]))
+    ctx["logros"] = sum(cantidades)
+    return ctx
+
+def _elegir(rng, pesos, k):
+    return rng.choices(range(len(pesos)), cum_weights=pesos, k=k)
+
+def _desarrollador(rng, ctx):
+    # Los usuarios con id múltiplo de 50 son desarrolladores
+    return 50 * rng.randint(1, ctx["usuarios"] // 50)
+
+def filas_usuario(ctx):
+    rng = _rng(ctx["semilla"], "usuario-datos")
+    for id_usuario in range(1, ctx["usuarios"] + 1):
+        rol = RolUsuario.DESARROLLADOR if id_usuario % 50 == 0 else RolUsuario.JUGADOR
+        yield (id_usuario, f"Usuario{id_usuario}", f"usuario{id_usuario}@ejemplo.com",
+               f"pass{rng.randrange(10 ** 6)}", rol, _dia(ctx["registro"][id_usuario - 1]))
+
+def filas_perfil(ctx):
+    rng = _rng(ctx["semilla"], "perfilusuario")
+    for id_usuario in range(1, ctx["usuarios"] + 1):
+        nacimiento = date(1970, 1, 1) + timedelta(days=rng.randrange(35 * 365))
+        yield (id_usuario, id_usuario, f"https://avatars.com/user{id_usuario}", rng.choice(PAISES),
+               f"Bio del usuario {id_usuario}", nacimiento)
+
+def filas_categoria(ctx):
+    for id_categoria, nombre in enumerate(CATEGORIAS, 1):
+        yield (id_categoria, nombre)
+
+def filas_juego(ctx):
+    rng = _rng(ctx["semilla"], "juego-datos")
+    estados = rng.choices(list(EstadoJuego), weights=[15, 80, 5], k=ctx["juegos"])
+    for id_juego in range(1, ctx["juegos"] + 1):
+        yield (id_juego, f"Juego{id_juego}", f"Descripción del juego {id_juego}",
+               _dia(ctx["lanzamiento"][id_juego - 1]), ctx["precios"][id_juego - 1],
+               estados[id_juego - 1], _desarrollador(rng, ctx))
+
+def filas_juego_categoria(ctx):
+    rng = _rng(ctx["semilla"], "juegocategoria")
+    for id_juego in range(1, ctx["juegos"] + 1):
+        for id_categoria in sorted(rng.sample(range(1, len(CATEGORIAS) + 1), rng.randint(1, 3))):
+            yield (id_juego, id_categoria)
+
+def filas_juego_plataforma(ctx):
+    rng = _rng(ctx["semilla"], "juegoplataforma")
+    for id_juego in range(1, ctx["juegos"] + 1):
+        for plataforma in rng.sample(list(Plataforma), rng.randint(1, len(Plataforma))):
+            yield (id_juego, plataforma)
+
+def filas_version(ctx):
+    rng = _rng(ctx["semilla"], "versionjuego")
+    id_version = 0
+    for id_juego in range(1, ctx["juegos"] + 1):
+        dia = ctx["lanzamiento"][id_juego - 1]
+        for n in range(rng.randint(1, 5)):
+            id_version += 1
+            notas = "Versión inicial" if n == 0 else f"Correcciones y mejoras de la versión 1.{n}"
+            yield (id_version, id_juego, f"1.{n}", _dia(min(dia, DIAS_PERIODO - 1)), notas)
+            dia += rng.randint(15, 120)
+
+def filas_logro(ctx):
+    rng = _rng(ctx["semilla"], "logro-datos")
+    for id_juego in range(1, ctx["juegos"] + 1):
+        inicio = ctx["logros_inicio"][id_juego - 1]
+        for id_logro in range(inicio, inicio + ctx["logros_cantidad"][id_juego - 1]):
+            yield (id_logro, id_juego, f"Logro {id_logro}", f"Logro del juego {id_juego}",
+                   rng.choice(PUNTOS_LOGRO))
+
+def filas_evento(ctx):
+    for id_evento, inicio, fin, tipo in ctx["lista_eventos"]:
+        yield (id_evento, f"{tipo.value.capitalize()} {id_evento}", f"Evento generado {id_evento}",
+               _dia(inicio), _dia(fin), tipo)
+
+def filas_participacion(ctx):
+    rng = _rng(ctx["semilla"], "participacionevento")
+    for id_evento, inicio, _, tipo in ctx["lista_eventos"]:
+        cantidad = rng.randint(5, 200) if tipo == TipoEvento.TORNEO else rng.randint(0, 20)
+        usuarios = {ctx["usuario_de"](i) for i in _elegir(rng, ctx["peso_usuarios"], cantidad)}
+        for id_usuario in sorted(usuarios):
+            yield (id_usuario, id_evento, _dia(max(inicio - rng.randint(0, 10), 0)))
+
+def filas_compra(ctx):
+    # Determinista: filas_bitacora la vuelve a recorrer para registrar cada compra
+    rng = _rng(ctx["semilla"], "compra")
+    metodos = list(MetodoPago)
+    id_compra = 0
+    for inicio in range(0, ctx["compras"], LOTE):
+        k = min(LOTE, ctx["compras"] - inicio)
+        usuarios = _elegir(rng, ctx["peso_usuarios"], k)
+        juegos = _elegir(rng, ctx["peso_juegos"], k)
+        dias = _elegir(rng, ctx["peso_dias"], k)
+        metodos_lote = rng.choices(metodos, weights=PESOS_METODOS, k=k)
+        for u, j, d, metodo in zip(usuarios, juegos, dias, metodos_lote):
+            id_compra += 1
+            id_usuario = ctx["usuario_de"](u)
+            id_juego = ctx["juego_de"](j)
+            d = max(d, ctx["registro"][id_usuario - 1])
+            precio = ctx["precios"][id_juego - 1]
+            monto = round(precio / 2, 2) if ctx["rebaja"][d] else precio
+            yield (id_compra, id_usuario, id_juego, _instante(rng, d), monto, metodo)
+
+def filas_reseña(ctx):
+    rng = _rng(ctx["semilla"], "reseña")
+    id_reseña = 0
+    for inicio in range(0, ctx["reseñas"], LOTE):
+        k = min(LOTE, ctx["reseñas"] - inicio)
+        usuarios = _elegir(rng, ctx["peso_usuarios"], k)
+        juegos = _elegir(rng, ctx["peso_juegos"], k)
+        calificaciones = rng.choices(range(1, 6), weights=PESOS_CALIFICACION, k=k)
+        for u, j, calificacion in zip(usuarios, juegos, calificaciones):
+            id_reseña += 1
+            id_usuario = ctx["usuario_de"](u)
+            d = rng.randint(ctx["registro"][id_usuario - 1], DIAS_PERIODO - 1)
+            yield (id_reseña, id_usuario, ctx["juego_de"](j), calificacion,
+                   COMENTARIOS_RESEÑA[calificacion], _dia(d))
+
+def filas_progreso(ctx):
+    # Determinista: filas_bitacora la vuelve a recorrer para registrar cada logro
+    rng = _rng(ctx["semilla"], "progresousuariologro")
+    for id_usuario in range(1, ctx["usuarios"] + 1):
+        cantidad = min(int(rng.expovariate(1 / 5)), 50)
+        logros = set()
+        for j in _elegir(rng, ctx["peso_juegos"], cantidad):
+            id_juego = ctx["juego_de"](j)
+            inicio = ctx["logros_inicio"][id_juego - 1]
+            logros.add(inicio + rng.randrange(ctx["logros_cantidad"][id_juego - 1]))
+        registro = ctx["registro"][id_usuario - 1]
+        for id_logro in sorted(logros):
+            yield (id_usuario, id_logro, _dia(rng.randint(registro, DIAS_PERIODO - 1)))
+
+def filas_favorito(ctx):
+    rng = _rng(ctx["semilla"], "juegofavorito")
+    for id_usuario in range(1, ctx["usuarios"] + 1):
+        juegos = {ctx["juego_de"](j) for j in _elegir(rng, ctx["peso_juegos"], rng.randint(0, 5))}
+        registro = ctx["registro"][id_usuario - 1]
+        for id_juego in sorted(juegos):
+            yield (id_usuario, id_juego, _dia(rng.randint(registro, DIAS_PERIODO - 1)))
+
+def filas_comentario(ctx):
+    rng = _rng(ctx["semilla"], "comentario")
+    id_comentario = 0
+    for inicio in range(0, ctx["comentarios"], LOTE):
+        k = min(LOTE, ctx["comentarios"] - inicio)
+        for u in _elegir(rng, ctx["peso_usuarios"], k):
+            id_comentario += 1
+            id_usuario = ctx["usuario_de"](u)
+            d = rng.randint(ctx["registro"][id_usuario - 1], DIAS_PERIODO - 1)
+            if rng.random() < 0.2:
+                id_evento = rng.randint(1, ctx["eventos"])
+                yield (id_comentario, id_usuario, id_evento, "Evento", id_evento,
+                       f"Comentario sobre el evento {id_evento}", _instante(rng, d))
+            else:
+                id_juego = ctx["juego_de"](_elegir(rng, ctx["peso_juegos"], 1)[0])
+                yield (id_comentario, id_usuario, None, "Juego", id_juego,
+                       f"Comentario sobre el juego {id_juego}", _instante(rng, d))
+
+def filas_reporte_comentario(ctx):
+    rng = _rng(ctx["semilla"], "reportecomentario")
+    cantidad = ctx["comentarios"] // 100
+    for id_reporte in range(1, cantidad + 1):
+        yield (id_reporte, rng.randint(1, ctx["comentarios"]), rng.choice(MOTIVOS_REPORTE),
+               _dia(rng.randrange(DIAS_PERIODO)))
+
+def filas_bitacora(ctx):
+    # Lo mismo que escribirían trg_registrar_compra y trg_logro (desactivados durante la carga)
+    id_actividad = 0
+    for _, id_usuario, id_juego, fecha, _, _ in filas_compra(ctx):
+        id_actividad += 1
+        yield (id_actividad, id_usuario, "Compra", f"Compra del juego ID {id_juego}", fecha)
+    rng = _rng(ctx["semilla"], "bitacoraactividad")
+    for id_usuario, id_logro, fecha in filas_progreso(ctx):
+        id_actividad += 1
+        yield (id_actividad, id_usuario, "Logro", f"Desbloqueó: Logro {id_logro}",
+               datetime.combine(fecha, datetime.min.time()) + timedelta(seconds=rng.randrange(86400)))
+
+def filas_mantenimiento(ctx):
+    rng = _rng(ctx["semilla"], "mantenimientojuego")
+    id_mantenimiento = 0
+    for id_juego in range(1, ctx["juegos"] + 1):
+        for _ in range(rng.randint(0, 2)):
+            id_mantenimiento += 1
+            inicio = _instante(rng, rng.randrange(DIAS_PERIODO))
+            yield (id_mantenimiento, id_juego, inicio, inicio + timedelta(hours=rng.randint(1, 12)),
+                   "Mantenimiento programado")
+
+def filas_historial_precio(ctx):
+    rng = _rng(ctx["semilla"], "historialprecio")
+    id_historial = 0
+    for id_juego in range(1, ctx["juegos"] + 1):
+        actual = ctx["precios"][id_juego - 1]
+        for _ in range(rng.randint(0, 3)):
+            id_historial += 1
+            anterior = rng.choice(PRECIOS)
+            yield (id_historial, id_juego, anterior, actual, _dia(rng.randrange(DIAS_PERIODO)))
+
+def filas_reporte_juego(ctx):
+    rng = _rng(ctx["semilla"], "reportejuego")
+    for id_reporte in range(1, ctx["juegos"] // 10 + 1):
+        yield (id_reporte, ctx["juego_de"](_elegir(rng, ctx["peso_juegos"], 1)[0]),
+               rng.randint(1, ctx["usuarios"]), rng.choice(MOTIVOS_REPORTE), _dia(rng.randrange(DIAS_PERIODO)))
+
+# Orden de carga (respeta las llaves foráneas) y columnas que produce cada generador
+TABLAS = [
+    (Usuario.__table__, ["id_usuario", "nombre", "correo", "contraseña", "rol_usuario", "fecha_registro"], filas_usuario),
+    (PerfilUsuario.__table__, ["id_perfil", "id_usuario", "avatar_url", "pais", "biografia", "fecha_nacimiento"], filas_perfil),
+    (Categoria.__table__, ["id_categoria", "nombre"], filas_categoria),
+    (Juego.__table__, ["id_juego", "nombre", "descripcion", "fecha_lanzamiento", "precio", "estado_juego", "id_desarrollador"], filas_juego),
+    (juego_categoria, ["id_juego", "id_categoria"], filas_juego_categoria),
+    (JuegoPlataforma.__table__, ["id_juego", "plataforma"], filas_juego_plataforma),
+    (VersionJuego.__table__, ["id_version", "id_juego", "numero_version", "fecha_publicacion", "notas_cambios"], filas_version),
+    (Logro.__table__, ["id_logro", "id_juego", "nombre", "descripcion", "puntos"], filas_logro),
+    (Evento.__table__, ["id_evento", "titulo", "descripcion", "fecha_inicio", "fecha_fin", "tipo_evento"], filas_evento),
+    (ParticipacionEvento.__table__, ["id_usuario", "id_evento", "fecha_inscripcion"], filas_participacion),
+    (Compra.__table__, ["id_compra", "id_usuario", "id_juego", "fecha_compra", "monto_pagado", "metodo_pago"], filas_compra),
+    (Reseña.__table__, ["id_reseña", "id_usuario", "id_juego", "calificacion", "comentario", "fecha_reseña"], filas_reseña),
+    (ProgresoUsuarioLogro.__table__, ["id_usuario", "id_logro", "fecha_desbloqueo"], filas_progreso),
+    (JuegoFavorito.__table__, ["id_usuario", "id_juego", "fecha_marcado"], filas_favorito),
+    (Comentario.__table__, ["id_comentario", "id_usuario", "id_evento", "tipo_objetivo", "id_objetivo", "contenido", "fecha"], filas_comentario),
+    (ReporteComentario.__table__, ["id_reporte", "id_comentario", "motivo", "fecha_reporte"], filas_reporte_comentario),
+    (BitacoraActividad.__table__, ["id_actividad", "id_usuario", "tipo_actividad", "descripcion", "fecha"], filas_bitacora),
+    (MantenimientoJuego.__table__, ["id_mantenimiento", "id_juego", "fecha_inicio", "fecha_fin", "motivo"], filas_mantenimiento),
+    (HistorialPrecio.__table__, ["id_historial", "id_juego", "precio_anterior", "precio_nuevo", "fecha_cambio"], filas_historial_precio),
+    (ReporteJuego.__table__, ["id_reporte", "id_juego", "id_usuario", "motivo", "fecha_reporte"], filas_reporte_juego),
+]
+
+# Tablas cuyos triggers escriben en BitacoraActividad; se desactivan durante la carga
+TABLAS_CON_TRIGGERS = ["compra", "progresousuariologro"]
+
+def vaciar_tablas(conexion):
+    if conexion.dialect.name == "postgresql":
+        nombres = ", ".join(conexion.dialect.identifier_preparer.format_table(t) for t in Base.metadata.sorted_tables)
+        conexion.execute(text(f"TRUNCATE {nombres} RESTART IDENTITY CASCADE"))
+    else:
+        for tabla in reversed(Base.metadata.sorted_tables):
+            conexion.execute(tabla.delete())
+
+def reiniciar_secuencias(conexion):
+    for tabla, _, _ in TABLAS:
+        pk = list(tabla.primary_key.columns)
+        if len(pk) != 1:
+            continue
+        conexion.execute(text(
+            f"SELECT setval(pg_get_serial_sequence(:tabla, :columna), COALESCE(max({pk[0].name}), 1)) "
+            f"FROM {conexion.dialect.identifier_preparer.format_table(tabla)}"
+        ), {"tabla": tabla.name, "columna": pk[0].name})
+
+def generar(compras, semilla=42, vaciar=False):
+    ctx = preparar_contexto(compras, semilla)
+    estadisticas = []
+    crear_esquema()
+    with obtener_engine().begin() as conexion:
+        if vaciar:
+            vaciar_tablas(conexion)
+        elif conexion.execute(text("SELECT 1 FROM usuario LIMIT 1")).first():
+            sys.exit("La base ya tiene datos; use --vaciar para reemplazarlos.")
+        postgres = conexion.dialect.name == "postgresql"
+        # Meses de la bitácora generada (si la tabla está particionada)
+        crear_particiones_bitacora(conexion, FECHA_INICIO, FECHA_INICIO + timedelta(days=DIAS_PERIODO))
+        # COPY FROM STDIN necesita copy_expert de psycopg2
+        copy = postgres and conexion.dialect.driver == "psycopg2"
+        if postgres:
+            for tabla in TABLAS_CON_TRIGGERS:
+                conexion.execute(text(f"ALTER TABLE {tabla} DISABLE TRIGGER USER"))
+        for tabla, columnas, generador in TABLAS:
+            inicio = time.perf_counter()
+            cargar = cargar_copy if copy else cargar_lotes
+            filas = cargar(conexion, tabla, columnas, generador(ctx), LOTE)
+            duracion = time.perf_counter() - inicio
+            estadisticas.append((tabla.name, filas, duracion))
+            print(f"{tabla.name:<22} {filas:>12} filas  {duracion:8.2f} s  "
+                  f"{filas / duracion if duracion > 0 else 0:>10.0f} filas/s")
+        if postgres:
+            for tabla in TABLAS_CON_TRIGGERS:
+                conexion.execute(text(f"ALTER TABLE {tabla} ENABLE TRIGGER USER"))
+            reiniciar_secuencias(conexion)
+    if obtener_engine().dialect.name == "postgresql":
+        # Con trg_logro desactivado durante la carga, los puntos se calculan de una vez
+        reconstruir_clasificaciones()
+        with obtener_engine().connect() as conexion:
+            conexion.execution_options(isolation_level="AUTOCOMMIT").execute(text("ANALYZE"))
+    return estadisticas
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos a escala para pruebas de carga")
+    parser.add_argument("--compras", type=int, default=1000,
+                        help="Factor de escala: número de compras (1K a 100M)")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--vaciar", action="store_true", help="Vacía todas las tablas antes de cargar")
+    args = parser.parse_args()
+    generar(args.compras, args.semilla, args.vaciar)
+
+if __name__ == "__main__":
+    main()
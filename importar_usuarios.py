@@ -0,0 +1,30 @@
+import argparse
+import time
+
+from servicios import importar_usuarios_archivo, TAMANO_LOTE_CARGA
+
+# Alta masiva de usuarios con su perfil desde CSV o JSONL (también .gz).
+# Columnas: nombre, correo, contraseña, rol_usuario (JUGADOR o DESARROLLADOR)
+# y opcionales fecha_registro, avatar_url, pais, biografia, fecha_nacimiento.
+# Las filas inválidas o con un correo ya registrado van al archivo de rechazos
+# (por defecto <archivo>_rechazos.<formato>) con una columna "motivo".
+# Uso: python importar_usuarios.py usuarios.csv [--rechazos rechazos.csv] [--lote 10000]
+
+def main():
+    parser = argparse.ArgumentParser(description="Importación masiva de usuarios y perfiles")
+    parser.add_argument("archivo", help="CSV con encabezado o JSONL (una fila JSON por línea)")
+    parser.add_argument("--rechazos", help="Archivo donde escribir las filas rechazadas")
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE_CARGA, help="Filas por transacción")
+    args = parser.parse_args()
+    inicio = time.perf_counter()
+    resultado = importar_usuarios_archivo(args.archivo, args.rechazos, args.lote)
+    duracion = time.perf_counter() - inicio
+    print(f"Filas leídas: {resultado['leidas']}")
+    print(f"Usuarios importados: {resultado['importadas']}")
+    print(f"Filas rechazadas: {resultado['rechazadas']}")
+    if resultado["rechazos"]:
+        print(f"Rechazos en '{resultado['rechazos']}'")
+    print(f"Tiempo: {duracion:.2f} s ({resultado['leidas'] / duracion if duracion else 0:.0f} filas/s)")
+
+if __name__ == "__main__":
+    main()
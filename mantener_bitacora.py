@@ -0,0 +1,31 @@
+import argparse
+import time
+
+from servicios import mantener_particiones_bitacora, aplicar_retencion_bitacora, MESES_PARTICIONES_ADELANTE
+
+# Mantenimiento de BitacoraActividad, pensado para correr periódicamente (cron):
+# crea las particiones mensuales de los próximos meses y, con --retencion-meses,
+# elimina (y opcionalmente archiva en CSV) la actividad más antigua.
+# Uso: python mantener_bitacora.py [--meses-adelante 3] [--retencion-meses 24] [--archivar-en DIR]
+#      [--purgar-sin-fecha]
+
+def main():
+    parser = argparse.ArgumentParser(description="Particiones y retención de la bitácora de actividad")
+    parser.add_argument("--meses-adelante", type=int, default=MESES_PARTICIONES_ADELANTE,
+                        help="Meses futuros que deben tener partición")
+    parser.add_argument("--retencion-meses", type=int,
+                        help="Meses completos de actividad a conservar además del actual (por defecto no se borra nada)")
+    parser.add_argument("--archivar-en", help="Directorio donde exportar a CSV la actividad antes de borrarla")
+    parser.add_argument("--purgar-sin-fecha", action="store_true",
+                        help="Con --retencion-meses, borrar también la actividad sin fecha (por defecto se conserva)")
+    args = parser.parse_args()
+    inicio = time.perf_counter()
+    creadas = mantener_particiones_bitacora(args.meses_adelante)
+    print(f"Particiones creadas: {creadas}")
+    if args.retencion_meses is not None:
+        for particion in aplicar_retencion_bitacora(args.retencion_meses, args.archivar_en, args.purgar_sin_fecha):
+            print(f"Eliminada: {particion.nombre} (hasta {particion.hasta})")
+    print(f"Tiempo: {time.perf_counter() - inicio:.2f} s")
+
+if __name__ == "__main__":
+    main()
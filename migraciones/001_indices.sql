@@ -0,0 +1,44 @@
+---Migración 001: índices para llaves foráneas y filtros de reportes
+---schema.sql no crea índices para las llaves foráneas, así que cada JOIN,
+---filtro por usuario/juego y ON DELETE CASCADE recorre la tabla completa.
+---Los mismos índices están declarados en los modelos de modelos.py
+
+---Usuarios y juegos (claves de paginación de listar_usuarios / listar_juegos)
+CREATE INDEX IF NOT EXISTS ix_perfilusuario_usuario ON PerfilUsuario (id_usuario);
+CREATE INDEX IF NOT EXISTS ix_usuario_nombre ON Usuario (nombre, id_usuario);
+CREATE INDEX IF NOT EXISTS ix_juego_nombre ON Juego (nombre, id_juego);
+CREATE INDEX IF NOT EXISTS ix_juego_desarrollador ON Juego (id_desarrollador);
+CREATE INDEX IF NOT EXISTS ix_versionjuego_juego_fecha ON VersionJuego (id_juego, fecha_publicacion);
+
+---Compra (reporte_ventas filtra por fecha, método, usuario y juego y ordena por fecha desc)
+CREATE INDEX IF NOT EXISTS ix_compra_fecha ON Compra (fecha_compra)
+  INCLUDE (id_usuario, id_juego, monto_pagado, metodo_pago);
+CREATE INDEX IF NOT EXISTS ix_compra_usuario_fecha ON Compra (id_usuario, fecha_compra);
+CREATE INDEX IF NOT EXISTS ix_compra_juego_fecha ON Compra (id_juego, fecha_compra);
+CREATE INDEX IF NOT EXISTS ix_compra_metodo_fecha ON Compra (metodo_pago, fecha_compra);
+
+---Reseña (reporte_resenas filtra por juego o usuario y ordena por fecha desc)
+CREATE INDEX IF NOT EXISTS ix_reseña_juego_fecha ON Reseña (id_juego, fecha_reseña);
+CREATE INDEX IF NOT EXISTS ix_reseña_usuario_fecha ON Reseña (id_usuario, fecha_reseña);
+
+---Logros, categorías, favoritos y eventos
+CREATE INDEX IF NOT EXISTS ix_logro_juego ON Logro (id_juego);
+CREATE INDEX IF NOT EXISTS ix_progresousuariologro_logro ON ProgresoUsuarioLogro (id_logro);
+CREATE INDEX IF NOT EXISTS ix_juegocategoria_categoria ON JuegoCategoria (id_categoria);
+CREATE INDEX IF NOT EXISTS ix_juegofavorito_juego ON JuegoFavorito (id_juego);
+CREATE INDEX IF NOT EXISTS ix_evento_fecha_inicio ON Evento (fecha_inicio, id_evento);
+CREATE INDEX IF NOT EXISTS ix_participacionevento_evento ON ParticipacionEvento (id_evento);
+
+---Comentarios y reportes
+CREATE INDEX IF NOT EXISTS ix_comentario_usuario ON Comentario (id_usuario);
+CREATE INDEX IF NOT EXISTS ix_reportecomentario_comentario ON ReporteComentario (id_comentario);
+CREATE INDEX IF NOT EXISTS ix_reportejuego_juego ON ReporteJuego (id_juego);
+CREATE INDEX IF NOT EXISTS ix_reportejuego_usuario ON ReporteJuego (id_usuario);
+
+---BitacoraActividad (reporte_actividad_usuarios filtra por usuario y ordena por fecha desc)
+CREATE INDEX IF NOT EXISTS ix_bitacoraactividad_usuario_fecha ON BitacoraActividad (id_usuario, fecha);
+CREATE INDEX IF NOT EXISTS ix_bitacoraactividad_fecha ON BitacoraActividad (fecha);
+
+---Mantenimiento e historial de precios
+CREATE INDEX IF NOT EXISTS ix_mantenimientojuego_juego ON MantenimientoJuego (id_juego);
+CREATE INDEX IF NOT EXISTS ix_historialprecio_juego ON HistorialPrecio (id_juego);
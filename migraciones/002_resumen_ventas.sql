@@ -0,0 +1,32 @@
+---Migración 002: resúmenes diarios de ventas
+---Tablas derivadas de Compra que mantiene servicios.actualizar_resumenes_ventas
+---de forma incremental (marca en MarcaResumen sobre id_compra).
+---Los mismos modelos están declarados en modelos.py
+CREATE TABLE IF NOT EXISTS VentaDiariaJuego (
+    id_juego INTEGER NOT NULL,
+    fecha DATE NOT NULL,
+    cantidad INTEGER NOT NULL DEFAULT 0,
+    total NUMERIC(14,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (id_juego, fecha)
+);
+CREATE TABLE IF NOT EXISTS VentaDiariaUsuario (
+    id_usuario INTEGER NOT NULL,
+    fecha DATE NOT NULL,
+    cantidad INTEGER NOT NULL DEFAULT 0,
+    total NUMERIC(14,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (id_usuario, fecha)
+);
+CREATE TABLE IF NOT EXISTS VentaDiariaMetodo (
+    metodo_pago VARCHAR(20) NOT NULL, -- tipo personalizado
+    fecha DATE NOT NULL,
+    cantidad INTEGER NOT NULL DEFAULT 0,
+    total NUMERIC(14,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (metodo_pago, fecha)
+);
+CREATE TABLE IF NOT EXISTS MarcaResumen (
+    nombre VARCHAR(50) PRIMARY KEY,
+    ultimo_id INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS ix_ventadiariajuego_fecha ON VentaDiariaJuego (fecha);
+CREATE INDEX IF NOT EXISTS ix_ventadiariausuario_fecha ON VentaDiariaUsuario (fecha);
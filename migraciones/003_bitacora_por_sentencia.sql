@@ -0,0 +1,25 @@
+---Migración 003: bitácora de compras por sentencia
+---trg_registrar_compra hacía un INSERT en BitacoraActividad por cada fila de
+---Compra. El trigger por sentencia usa la tabla de transición de las filas
+---nuevas, así un lote de N compras (COPY o INSERT multi-fila) escribe la
+---bitácora con un solo INSERT ... SELECT.
+CREATE OR REPLACE FUNCTION registrar_compras()
+RETURNS TRIGGER AS $$
+BEGIN
+  INSERT INTO BitacoraActividad(id_usuario, tipo_actividad, descripcion)
+  SELECT id_usuario, 'Compra', 'Compra del juego ID ' || id_juego
+  FROM compras_nuevas
+  ORDER BY id_compra;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_registrar_compra ON Compra;
+DROP TRIGGER IF EXISTS trg_registrar_compras ON Compra;
+CREATE TRIGGER trg_registrar_compras
+AFTER INSERT ON Compra
+REFERENCING NEW TABLE AS compras_nuevas
+FOR EACH STATEMENT
+EXECUTE FUNCTION registrar_compras();
+
+DROP FUNCTION IF EXISTS registrar_compra();
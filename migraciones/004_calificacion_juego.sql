@@ -0,0 +1,77 @@
+---Migración 004: calificaciones agregadas por juego
+---obtener_promedio_juego hacía AVG(calificacion) sobre todas las reseñas del
+---juego en cada llamada. CalificacionJuego guarda cantidad, suma e histograma
+---de estrellas y el trigger de Reseña la actualiza en cada INSERT, UPDATE y
+---DELETE. El mismo modelo está declarado en modelos.py
+CREATE TABLE IF NOT EXISTS CalificacionJuego (
+    id_juego INTEGER PRIMARY KEY,
+    cantidad INTEGER NOT NULL DEFAULT 0,
+    suma INTEGER NOT NULL DEFAULT 0,
+    estrellas_1 INTEGER NOT NULL DEFAULT 0,
+    estrellas_2 INTEGER NOT NULL DEFAULT 0,
+    estrellas_3 INTEGER NOT NULL DEFAULT 0,
+    estrellas_4 INTEGER NOT NULL DEFAULT 0,
+    estrellas_5 INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION actualizar_calificacion_juego()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.calificacion BETWEEN 1 AND 5 THEN
+    UPDATE CalificacionJuego SET
+      cantidad = cantidad - 1,
+      suma = suma - OLD.calificacion,
+      estrellas_1 = estrellas_1 - (OLD.calificacion = 1)::int,
+      estrellas_2 = estrellas_2 - (OLD.calificacion = 2)::int,
+      estrellas_3 = estrellas_3 - (OLD.calificacion = 3)::int,
+      estrellas_4 = estrellas_4 - (OLD.calificacion = 4)::int,
+      estrellas_5 = estrellas_5 - (OLD.calificacion = 5)::int
+    WHERE id_juego = OLD.id_juego;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.id_juego IS NOT NULL AND NEW.calificacion BETWEEN 1 AND 5 THEN
+    INSERT INTO CalificacionJuego AS c
+      (id_juego, cantidad, suma, estrellas_1, estrellas_2, estrellas_3, estrellas_4, estrellas_5)
+    VALUES (NEW.id_juego, 1, NEW.calificacion, (NEW.calificacion = 1)::int, (NEW.calificacion = 2)::int,
+            (NEW.calificacion = 3)::int, (NEW.calificacion = 4)::int, (NEW.calificacion = 5)::int)
+    ON CONFLICT (id_juego) DO UPDATE SET
+      cantidad = c.cantidad + 1,
+      suma = c.suma + EXCLUDED.suma,
+      estrellas_1 = c.estrellas_1 + EXCLUDED.estrellas_1,
+      estrellas_2 = c.estrellas_2 + EXCLUDED.estrellas_2,
+      estrellas_3 = c.estrellas_3 + EXCLUDED.estrellas_3,
+      estrellas_4 = c.estrellas_4 + EXCLUDED.estrellas_4,
+      estrellas_5 = c.estrellas_5 + EXCLUDED.estrellas_5;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+---Carga inicial; el LOCK evita que se pierdan reseñas escritas mientras corre
+LOCK TABLE Reseña IN SHARE ROW EXCLUSIVE MODE;
+TRUNCATE CalificacionJuego;
+INSERT INTO CalificacionJuego (id_juego, cantidad, suma, estrellas_1, estrellas_2, estrellas_3, estrellas_4, estrellas_5)
+SELECT id_juego, count(*), sum(calificacion),
+       count(*) FILTER (WHERE calificacion = 1), count(*) FILTER (WHERE calificacion = 2),
+       count(*) FILTER (WHERE calificacion = 3), count(*) FILTER (WHERE calificacion = 4),
+       count(*) FILTER (WHERE calificacion = 5)
+FROM Reseña
+WHERE id_juego IS NOT NULL AND calificacion BETWEEN 1 AND 5
+GROUP BY id_juego;
+
+DROP TRIGGER IF EXISTS trg_calificacion_juego ON Reseña;
+CREATE TRIGGER trg_calificacion_juego
+AFTER INSERT OR UPDATE OF id_juego, calificacion OR DELETE ON Reseña
+FOR EACH ROW
+EXECUTE FUNCTION actualizar_calificacion_juego();
+
+---El promedio ahora se lee del agregado en lugar de recorrer las reseñas
+CREATE OR REPLACE FUNCTION obtener_promedio_juego(juego_id INT)
+RETURNS NUMERIC AS $$
+BEGIN
+  RETURN (
+    SELECT (suma::NUMERIC / NULLIF(cantidad, 0))::NUMERIC(3,2)
+    FROM CalificacionJuego
+    WHERE id_juego = juego_id
+  );
+END;
+$$ LANGUAGE plpgsql;
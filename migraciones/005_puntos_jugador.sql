@@ -0,0 +1,53 @@
+---Migración 005: puntos de logros por jugador para las clasificaciones
+---contar_logros_usuario cuenta filas en cada llamada y nada ordenaba a los
+---jugadores por Logro.puntos. PuntosJugador guarda el total por jugador, global
+---(id_juego = 0) y por juego, y lo actualiza trg_logro al desbloquear un logro.
+---El mismo modelo está declarado en modelos.py
+CREATE TABLE IF NOT EXISTS PuntosJugador (
+    id_juego INTEGER NOT NULL,
+    id_usuario INTEGER NOT NULL,
+    puntos INTEGER NOT NULL DEFAULT 0,
+    logros INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (id_juego, id_usuario)
+);
+CREATE INDEX IF NOT EXISTS ix_puntosjugador_ranking ON PuntosJugador (id_juego, puntos, id_usuario);
+
+---trg_logro sigue escribiendo la bitácora y además suma los puntos
+CREATE OR REPLACE FUNCTION registrar_logro()
+RETURNS TRIGGER AS $$
+DECLARE
+  nombre_logro TEXT;
+  juego_logro INT;
+  puntos_logro INT;
+BEGIN
+  SELECT nombre, id_juego, COALESCE(puntos, 0) INTO nombre_logro, juego_logro, puntos_logro
+  FROM Logro WHERE id_logro = NEW.id_logro;
+  INSERT INTO BitacoraActividad(id_usuario, tipo_actividad, descripcion)
+  VALUES (
+    NEW.id_usuario,
+    'Logro',
+    'Desbloqueó: ' || nombre_logro
+  );
+  INSERT INTO PuntosJugador AS p (id_juego, id_usuario, puntos, logros)
+  SELECT v.id_juego, NEW.id_usuario, puntos_logro, 1
+  FROM (VALUES (0), (juego_logro)) AS v(id_juego)
+  WHERE v.id_juego IS NOT NULL
+  ON CONFLICT (id_juego, id_usuario) DO UPDATE SET
+    puntos = p.puntos + EXCLUDED.puntos,
+    logros = p.logros + 1;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+---Carga inicial; el LOCK evita que se pierdan logros desbloqueados mientras corre
+LOCK TABLE ProgresoUsuarioLogro IN SHARE ROW EXCLUSIVE MODE;
+TRUNCATE PuntosJugador;
+INSERT INTO PuntosJugador (id_juego, id_usuario, puntos, logros)
+SELECT 0, pul.id_usuario, sum(COALESCE(l.puntos, 0)), count(*)
+FROM ProgresoUsuarioLogro pul JOIN Logro l ON l.id_logro = pul.id_logro
+GROUP BY pul.id_usuario
+UNION ALL
+SELECT l.id_juego, pul.id_usuario, sum(COALESCE(l.puntos, 0)), count(*)
+FROM ProgresoUsuarioLogro pul JOIN Logro l ON l.id_logro = pul.id_logro
+WHERE l.id_juego IS NOT NULL
+GROUP BY l.id_juego, pul.id_usuario;
@@ -0,0 +1,12 @@
+---Migración 006: búsqueda de texto completo
+---Índices GIN sobre to_tsvector para servicios.buscar(). Las expresiones deben
+---ser idénticas a las de CONSULTAS_BUSQUEDA_PG en servicios.py para que el
+---planificador use el índice.
+CREATE INDEX IF NOT EXISTS ix_juego_busqueda ON Juego
+  USING GIN (to_tsvector('spanish', coalesce(nombre, '') || ' ' || coalesce(descripcion, '')));
+CREATE INDEX IF NOT EXISTS ix_evento_busqueda ON Evento
+  USING GIN (to_tsvector('spanish', coalesce(titulo, '') || ' ' || coalesce(descripcion, '')));
+CREATE INDEX IF NOT EXISTS ix_comentario_busqueda ON Comentario
+  USING GIN (to_tsvector('spanish', coalesce(contenido, '')));
+CREATE INDEX IF NOT EXISTS ix_versionjuego_busqueda ON VersionJuego
+  USING GIN (to_tsvector('spanish', coalesce(notas_cambios, '')));
@@ -0,0 +1,64 @@
+---Migración 007: BitacoraActividad particionada por mes
+---La bitácora solo crece (la escriben los triggers de Compra y de logros).
+---Particionada por rango de fecha, las consultas con rango solo leen las
+---particiones del rango, los índices quedan del tamaño de un mes y la
+---retención borra particiones enteras (DROP) en vez de hacer DELETE.
+---crear_particiones_bitacora() crea las particiones mensuales que falten;
+---mantener_bitacora.py la llama periódicamente para los meses siguientes.
+---Las filas sin partición (o sin fecha) caen en la partición por defecto.
+
+CREATE OR REPLACE FUNCTION crear_particiones_bitacora(desde DATE, hasta DATE)
+RETURNS INTEGER AS $$
+DECLARE
+  mes DATE := date_trunc('month', desde);
+  nombre TEXT;
+  creadas INTEGER := 0;
+BEGIN
+  WHILE mes <= hasta LOOP
+    nombre := 'bitacoraactividad_p' || to_char(mes, 'YYYYMM');
+    IF to_regclass(nombre) IS NULL THEN
+      EXECUTE format('CREATE TABLE %I PARTITION OF BitacoraActividad FOR VALUES FROM (%L) TO (%L)',
+                     nombre, mes, (mes + INTERVAL '1 month')::date);
+      creadas := creadas + 1;
+    END IF;
+    mes := mes + INTERVAL '1 month';
+  END LOOP;
+  RETURN creadas;
+END;
+$$ LANGUAGE plpgsql;
+
+---Se copia a una tabla nueva; el LOCK evita que se pierda actividad escrita mientras corre
+LOCK TABLE BitacoraActividad IN ACCESS EXCLUSIVE MODE;
+ALTER TABLE BitacoraActividad RENAME TO BitacoraActividad_antigua;
+DROP INDEX IF EXISTS ix_bitacoraactividad_usuario_fecha;
+DROP INDEX IF EXISTS ix_bitacoraactividad_fecha;
+
+---La llave primaria de una tabla particionada debe incluir la columna de partición
+CREATE TABLE BitacoraActividad (
+    id_actividad INTEGER NOT NULL DEFAULT nextval('bitacoraactividad_id_actividad_seq'),
+    id_usuario INTEGER REFERENCES Usuario(id_usuario),
+    tipo_actividad VARCHAR(50),
+    descripcion TEXT,
+    fecha TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id_actividad, fecha)
+) PARTITION BY RANGE (fecha);
+ALTER SEQUENCE bitacoraactividad_id_actividad_seq OWNED BY BitacoraActividad.id_actividad;
+
+CREATE TABLE bitacoraactividad_default PARTITION OF BitacoraActividad DEFAULT;
+
+---Los índices del padre se crean en cada partición, presente y futura
+CREATE INDEX ix_bitacoraactividad_usuario_fecha ON BitacoraActividad (id_usuario, fecha);
+CREATE INDEX ix_bitacoraactividad_fecha ON BitacoraActividad (fecha);
+
+SELECT crear_particiones_bitacora(
+  COALESCE((SELECT min(fecha) FROM BitacoraActividad_antigua)::date, CURRENT_DATE),
+  (CURRENT_DATE + INTERVAL '3 months')::date
+);
+
+---Las fechas nulas se guardan como -infinity (van a la partición por defecto)
+INSERT INTO BitacoraActividad (id_actividad, id_usuario, tipo_actividad, descripcion, fecha)
+SELECT id_actividad, id_usuario, tipo_actividad, descripcion, COALESCE(fecha, '-infinity')
+FROM BitacoraActividad_antigua;
+
+DROP TABLE BitacoraActividad_antigua;
+ANALYZE BitacoraActividad;
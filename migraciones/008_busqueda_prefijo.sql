@@ -0,0 +1,8 @@
+---Migración 008: índices para la búsqueda por prefijo
+---servicios.sugerir_usuarios() y sugerir_juegos() filtran con un rango sobre
+---lower(columna) COLLATE "C" y ordenan por la misma expresión. Con COLLATE "C"
+---el orden del índice es el de los bytes, así que el B-tree resuelve el rango
+---del prefijo y el ORDER BY ... LIMIT sin ordenar las coincidencias.
+CREATE INDEX IF NOT EXISTS ix_usuario_nombre_prefijo ON Usuario ((lower(nombre) COLLATE "C"), id_usuario);
+CREATE INDEX IF NOT EXISTS ix_usuario_correo_prefijo ON Usuario ((lower(correo) COLLATE "C"), id_usuario);
+CREATE INDEX IF NOT EXISTS ix_juego_nombre_prefijo ON Juego ((lower(nombre) COLLATE "C"), id_juego);
@@ -0,0 +1,19 @@
+---Migración 009: puntos de logro no negativos
+---ArbolPuntajes (clasificacion.py) indexa a los jugadores por puntaje y no
+---admite negativos. Los logros con puntos negativos pasan a 0 y PuntosJugador
+---se vuelve a calcular con los totales corregidos (misma carga que la 005).
+---La misma restricción está declarada en modelos.py
+LOCK TABLE ProgresoUsuarioLogro IN SHARE ROW EXCLUSIVE MODE;
+UPDATE Logro SET puntos = 0 WHERE puntos < 0;
+ALTER TABLE Logro ADD CONSTRAINT ck_logro_puntos CHECK (puntos >= 0);
+
+TRUNCATE PuntosJugador;
+INSERT INTO PuntosJugador (id_juego, id_usuario, puntos, logros)
+SELECT 0, pul.id_usuario, sum(COALESCE(l.puntos, 0)), count(*)
+FROM ProgresoUsuarioLogro pul JOIN Logro l ON l.id_logro = pul.id_logro
+GROUP BY pul.id_usuario
+UNION ALL
+SELECT l.id_juego, pul.id_usuario, sum(COALESCE(l.puntos, 0)), count(*)
+FROM ProgresoUsuarioLogro pul JOIN Logro l ON l.id_logro = pul.id_logro
+WHERE l.id_juego IS NOT NULL
+GROUP BY l.id_juego, pul.id_usuario;
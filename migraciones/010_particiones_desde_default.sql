@@ -0,0 +1,28 @@
+---Migración 010: particiones nuevas con filas en la partición por defecto
+---CREATE TABLE ... PARTITION OF falla si bitacoraactividad_default ya tiene
+---filas del mes (actividad escrita antes de que existiera su partición). Ahora
+---la partición se crea aparte, recibe esas filas y se adjunta con ATTACH.
+CREATE OR REPLACE FUNCTION crear_particiones_bitacora(desde DATE, hasta DATE)
+RETURNS INTEGER AS $$
+DECLARE
+  mes DATE := date_trunc('month', desde);
+  siguiente DATE;
+  nombre TEXT;
+  creadas INTEGER := 0;
+BEGIN
+  WHILE mes <= hasta LOOP
+    nombre := 'bitacoraactividad_p' || to_char(mes, 'YYYYMM');
+    siguiente := (mes + INTERVAL '1 month')::date;
+    IF to_regclass(nombre) IS NULL THEN
+      EXECUTE format('CREATE TABLE %I (LIKE BitacoraActividad INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', nombre);
+      EXECUTE format('WITH movidas AS (DELETE FROM bitacoraactividad_default WHERE fecha >= %L AND fecha < %L RETURNING *) '
+                     'INSERT INTO %I SELECT * FROM movidas', mes, siguiente, nombre);
+      EXECUTE format('ALTER TABLE BitacoraActividad ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                     nombre, mes, siguiente);
+      creadas := creadas + 1;
+    END IF;
+    mes := siguiente;
+  END LOOP;
+  RETURN creadas;
+END;
+$$ LANGUAGE plpgsql;
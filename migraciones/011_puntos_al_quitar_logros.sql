@@ -0,0 +1,52 @@
+---Migración 011: PuntosJugador al quitar o mover un logro desbloqueado
+---trg_logro (005) solo suma al desbloquear: borrar una fila de
+---ProgresoUsuarioLogro o cambiarle el usuario o el logro dejaba los totales
+---viejos. trg_logro_quitado resta el logro de antes y, en un UPDATE, suma el
+---nuevo; el jugador que se queda sin logros sale de la clasificación.
+---El mismo trigger está en TRIGGERS_PUNTOS (modelos.py) para SQLite
+CREATE OR REPLACE FUNCTION quitar_logro()
+RETURNS TRIGGER AS $$
+DECLARE
+  juego_logro INT;
+  puntos_logro INT;
+BEGIN
+  SELECT id_juego, COALESCE(puntos, 0) INTO juego_logro, puntos_logro
+  FROM Logro WHERE id_logro = OLD.id_logro;
+  UPDATE PuntosJugador SET
+    puntos = puntos - puntos_logro,
+    logros = logros - 1
+  WHERE id_usuario = OLD.id_usuario AND id_juego IN (0, juego_logro);
+  DELETE FROM PuntosJugador WHERE id_usuario = OLD.id_usuario AND logros = 0;
+  IF TG_OP = 'UPDATE' THEN
+    SELECT id_juego, COALESCE(puntos, 0) INTO juego_logro, puntos_logro
+    FROM Logro WHERE id_logro = NEW.id_logro;
+    INSERT INTO PuntosJugador AS p (id_juego, id_usuario, puntos, logros)
+    SELECT v.id_juego, NEW.id_usuario, puntos_logro, 1
+    FROM (VALUES (0), (juego_logro)) AS v(id_juego)
+    WHERE v.id_juego IS NOT NULL
+    ON CONFLICT (id_juego, id_usuario) DO UPDATE SET
+      puntos = p.puntos + EXCLUDED.puntos,
+      logros = p.logros + 1;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_logro_quitado ON ProgresoUsuarioLogro;
+CREATE TRIGGER trg_logro_quitado
+AFTER UPDATE OF id_usuario, id_logro OR DELETE ON ProgresoUsuarioLogro
+FOR EACH ROW
+EXECUTE FUNCTION quitar_logro();
+
+---Los totales que ya quedaron desfasados se vuelven a calcular (misma carga que la 005)
+LOCK TABLE ProgresoUsuarioLogro IN SHARE ROW EXCLUSIVE MODE;
+TRUNCATE PuntosJugador;
+INSERT INTO PuntosJugador (id_juego, id_usuario, puntos, logros)
+SELECT 0, pul.id_usuario, sum(COALESCE(l.puntos, 0)), count(*)
+FROM ProgresoUsuarioLogro pul JOIN Logro l ON l.id_logro = pul.id_logro
+GROUP BY pul.id_usuario
+UNION ALL
+SELECT l.id_juego, pul.id_usuario, sum(COALESCE(l.puntos, 0)), count(*)
+FROM ProgresoUsuarioLogro pul JOIN Logro l ON l.id_logro = pul.id_logro
+WHERE l.id_juego IS NOT NULL
+GROUP BY l.id_juego, pul.id_usuario;
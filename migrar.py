@@ -0,0 +1,56 @@
+import os
+import sys
+from sqlalchemy import text
+
+from modelos import obtener_engine
+
+# Migraciones versionadas: cada archivo migraciones/NNN_nombre.sql se aplica una
+# sola vez, en orden, y queda registrado en la tabla version_esquema.
+DIRECTORIO_MIGRACIONES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migraciones")
+
+def migraciones_disponibles():
+    archivos = sorted(f for f in os.listdir(DIRECTORIO_MIGRACIONES) if f.endswith(".sql"))
+    return [(archivo[:-len(".sql")], os.path.join(DIRECTORIO_MIGRACIONES, archivo)) for archivo in archivos]
+
+def versiones_aplicadas(conexion):
+    conexion.execute(text("""
+        CREATE TABLE IF NOT EXISTS version_esquema (
+            version VARCHAR(100) PRIMARY KEY,
+            fecha_aplicada TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+    return {fila.version for fila in conexion.execute(text("SELECT version FROM version_esquema"))}
+
+def aplicar_migracion(conexion, version, archivo):
+    with open(archivo, encoding="utf-8") as f:
+        sql = f.read()
+    # psycopg2 acepta varias sentencias (incluidas funciones $$ ... $$) en un solo
+    # execute; sin parámetros, así los % de format() no se toman como marcadores
+    cursor = conexion.connection.cursor()
+    try:
+        cursor.execute(sql)
+    finally:
+        cursor.close()
+    conexion.execute(text("INSERT INTO version_esquema (version) VALUES (:version)"), {"version": version})
+
+def migrar(hasta=None):
+    if obtener_engine().dialect.name != "postgresql":
+        print("Las migraciones son para PostgreSQL; en otras bases los índices se crean desde los modelos.")
+        return []
+    aplicadas = []
+    with obtener_engine().connect() as conexion:
+        with conexion.begin():
+            ya_aplicadas = versiones_aplicadas(conexion)
+        for version, archivo in migraciones_disponibles():
+            if version in ya_aplicadas:
+                continue
+            with conexion.begin():
+                aplicar_migracion(conexion, version, archivo)
+            print(f"Migración aplicada: {version}")
+            aplicadas.append(version)
+            if version == hasta:
+                break
+    return aplicadas
+
+if __name__ == "__main__":
+    migrar(sys.argv[1] if len(sys.argv) > 1 else None)
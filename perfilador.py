@@ -0,0 +1,211 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from contextlib import contextmanager
+from contextvars import ContextVar
+import logging
+import os
+import re
+import threading
+import time
+
+# Instrumentación de SQL con eventos del engine: por operación (una acción del
+# menú, un reporte, una prueba) cuenta sentencias, tiempo, filas devueltas y
+# huellas de SQL normalizado (mismo texto sin los valores), y registra en el
+# logger "sql.lento" las sentencias que pasan el umbral junto con su plan
+# (EXPLAIN). Escucha en la clase Engine, así que cubre todos los engines
+# (también el de servicios_async) y puede activarse antes de crearlos.
+# Uso: perfilador.activar(); with perfilador.operacion("listar_juegos"): ...
+#      perfilador.estadisticas() / perfilador.informe()
+UMBRAL_LENTO_MS = float(os.environ.get("SQL_UMBRAL_LENTO_MS", "200"))
+ARCHIVO_LENTO = os.environ.get("SQL_LOG_LENTO", "sql_lento.log")
+SIN_OPERACION = "(sin operación)"
+
+registro_lento = logging.getLogger("sql.lento")
+
+_operacion_actual = ContextVar("operacion_sql", default=SIN_OPERACION)
+_estadisticas = {}
+_lock = threading.Lock()
+_activo = False
+_umbral_ms = UMBRAL_LENTO_MS
+
+_NORMALIZACIONES = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),                        # textos
+    (re.compile(r"%\(\w+\)s|(?<![:\w]):\w+|\$\d+|%s"), "?"),     # parámetros de cada driver
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),                     # números
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(?)"),          # IN (?, ?, ...) y filas de VALUES
+    (re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+"), "(?)"),            # VALUES (?), (?), ...
+    (re.compile(r"\s+"), " "),
+]
+
+def huella(sql):
+    # Sentencias que solo difieren en valores, largo de IN (...) o filas de un
+    # INSERT multi-fila tienen la misma huella
+    for patron, reemplazo in _NORMALIZACIONES:
+        sql = patron.sub(reemplazo, sql)
+    return sql.strip()
+
+def _nueva_operacion():
+    return {"llamadas": 0, "tiempo_ms": 0.0, "sentencias": 0, "sql_ms": 0.0, "filas": 0, "lentas": 0, "huellas": {}}
+
+def _operacion(nombre):
+    datos = _estadisticas.get(nombre)
+    if datos is None:
+        datos = _estadisticas[nombre] = _nueva_operacion()
+    return datos
+
+@contextmanager
+def operacion(nombre):
+    # Agrupa las sentencias ejecutadas dentro del bloque bajo `nombre`
+    token = _operacion_actual.set(nombre)
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        duracion = (time.perf_counter() - inicio) * 1000
+        _operacion_actual.reset(token)
+        if _activo:
+            with _lock:
+                datos = _operacion(nombre)
+                datos["llamadas"] += 1
+                datos["tiempo_ms"] += duracion
+
+class CursorContado:
+    # Envuelve el cursor DBAPI para contar las filas a medida que se leen
+    # (rowcount no sirve para SELECT en SQLite ni en cursores del servidor)
+    def __init__(self, cursor, contador):
+        object.__setattr__(self, "_cursor", cursor)
+        object.__setattr__(self, "_contador", contador)
+
+    def __getattr__(self, nombre):
+        return getattr(self._cursor, nombre)
+
+    def __setattr__(self, nombre, valor):
+        setattr(self._cursor, nombre, valor)
+
+    def __iter__(self):
+        for fila in self._cursor:
+            self._contar(1)
+            yield fila
+
+    def _contar(self, filas):
+        if filas:
+            with _lock:
+                for datos in self._contador:
+                    datos["filas"] += filas
+
+    def fetchone(self):
+        fila = self._cursor.fetchone()
+        self._contar(fila is not None)
+        return fila
+
+    def fetchmany(self, *args, **kwargs):
+        filas = self._cursor.fetchmany(*args, **kwargs)
+        self._contar(len(filas))
+        return filas
+
+    def fetchall(self):
+        filas = self._cursor.fetchall()
+        self._contar(len(filas))
+        return filas
+
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("perfilador_inicio", []).append(time.perf_counter())
+
+def _despues(conn, cursor, statement, parameters, context, executemany):
+    inicios = conn.info.get("perfilador_inicio")
+    if not inicios:  # se activó a mitad de la sentencia
+        return
+    duracion = (time.perf_counter() - inicios.pop()) * 1000
+    clave = huella(statement)
+    with _lock:
+        datos = _operacion(_operacion_actual.get())
+        datos["sentencias"] += 1
+        datos["sql_ms"] += duracion
+        sentencia = datos["huellas"].get(clave)
+        if sentencia is None:
+            sentencia = datos["huellas"][clave] = {"veces": 0, "tiempo_ms": 0.0, "max_ms": 0.0, "filas": 0}
+        sentencia["veces"] += 1
+        sentencia["tiempo_ms"] += duracion
+        sentencia["max_ms"] = max(sentencia["max_ms"], duracion)
+        lenta = duracion >= _umbral_ms
+        if lenta:
+            datos["lentas"] += 1
+    if context is not None and not executemany and cursor.description is not None:
+        context.cursor = CursorContado(cursor, (datos, sentencia))
+    if lenta:
+        # Los parámetros de INSERT/UPDATE llevan datos del usuario (contraseñas),
+        # así que solo se registran los de las consultas
+        consulta = not executemany and _es_consulta(statement)
+        registro_lento.warning("%.1f ms [%s]\n%s\nParámetros: %s\nPlan:\n%s", duracion, _operacion_actual.get(),
+                               statement, repr(parameters) if consulta else "(omitidos)",
+                               _plan(conn, statement, parameters) if consulta else "(solo para consultas)")
+
+def _es_consulta(statement):
+    return re.match(r"\s*(SELECT|WITH)\b", statement, re.IGNORECASE) is not None
+
+def _plan(conn, statement, parameters):
+    # El plan se pide en la misma conexión (mismos datos visibles y parámetros);
+    # en PostgreSQL dentro de un SAVEPOINT para que un error no aborte la transacción
+    postgres = conn.dialect.name == "postgresql"
+    prefijo = "EXPLAIN " if postgres else "EXPLAIN QUERY PLAN "
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        if postgres:
+            cursor.execute("SAVEPOINT perfilador")
+        cursor.execute(prefijo + statement, parameters)
+        plan = "\n".join(" ".join(str(valor) for valor in fila) for fila in cursor.fetchall())
+        if postgres:
+            cursor.execute("RELEASE SAVEPOINT perfilador")
+        return plan
+    except Exception as e:
+        if postgres:
+            try:
+                cursor.execute("ROLLBACK TO SAVEPOINT perfilador")
+            except Exception:
+                pass
+        return f"(no se pudo obtener el plan: {e})"
+    finally:
+        cursor.close()
+
+def activar(umbral_ms=None):
+    global _activo, _umbral_ms
+    if umbral_ms is not None:
+        _umbral_ms = umbral_ms
+    if not _activo:
+        event.listen(Engine, "before_cursor_execute", _antes)
+        event.listen(Engine, "after_cursor_execute", _despues)
+        _activo = True
+
+def desactivar():
+    global _activo
+    if _activo:
+        event.remove(Engine, "before_cursor_execute", _antes)
+        event.remove(Engine, "after_cursor_execute", _despues)
+        _activo = False
+
+def activo():
+    return _activo
+
+def reiniciar():
+    with _lock:
+        _estadisticas.clear()
+
+def estadisticas():
+    # {operación: {llamadas, tiempo_ms, sentencias, sql_ms, filas, lentas, huellas: {sql: {...}}}}
+    with _lock:
+        return {
+            nombre: dict(datos, huellas={clave: dict(sentencia) for clave, sentencia in datos["huellas"].items()})
+            for nombre, datos in _estadisticas.items()
+        }
+
+def informe(max_huellas=5):
+    lineas = [f"{'Operación':<30} | {'Veces':>5} | {'Total ms':>10} | {'SQL':>6} | {'SQL ms':>10} | {'Filas':>9} | {'Lentas':>6}",
+              "-" * 95]
+    datos_ordenados = sorted(estadisticas().items(), key=lambda par: par[1]["sql_ms"], reverse=True)
+    for nombre, datos in datos_ordenados:
+        lineas.append(f"{nombre:<30} | {datos['llamadas']:>5} | {datos['tiempo_ms']:>10.1f} | {datos['sentencias']:>6} | "
+                      f"{datos['sql_ms']:>10.1f} | {datos['filas']:>9} | {datos['lentas']:>6}")
+        huellas = sorted(datos["huellas"].items(), key=lambda par: par[1]["tiempo_ms"], reverse=True)
+        for clave, sentencia in huellas[:max_huellas]:
+            lineas.append(f"    {sentencia['veces']:>5}x {sentencia['tiempo_ms']:>9.1f} ms {sentencia['filas']:>8} filas  {clave[:120]}")
+    return "\n".join(lineas)
@@ -0,0 +1,13 @@
+import sys
+import time
+
+from servicios import actualizar_resumenes_ventas
+
+# Actualiza los resúmenes diarios de ventas con las compras nuevas. Pensado
+# para correr periódicamente (cron); --reconstruir los vuelve a calcular desde cero.
+# Uso: python resumenes_ventas.py [--reconstruir]
+
+if __name__ == "__main__":
+    inicio = time.perf_counter()
+    compras = actualizar_resumenes_ventas(reconstruir="--reconstruir" in sys.argv[1:])
+    print(f"Compras agregadas a los resúmenes: {compras} ({time.perf_counter() - inicio:.2f} s)")
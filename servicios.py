@@ -0,0 +1,1699 @@
+from sqlalchemy import select, delete, func, text, tuple_, and_, or_, case, inspect, union_all
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Enum as SAEnum, Float, Integer, Numeric
+from sqlalchemy.orm import joinedload, raiseload, ONETOMANY, MANYTOMANY
+from sqlalchemy.exc import IntegrityError
+from enum import Enum as PyEnum
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, List
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import os
+import csv
+import gzip
+import json
+import time
+import re
+import shutil
+import itertools
+import tracemalloc
+
+from modelos import (
+    obtener_engine, usar_engine_propio, crear_esquema, session, unidad_de_trabajo, liberar_sesion, metricas_pool, Usuario, PerfilUsuario, Juego, VersionJuego, Compra, Reseña,
+    Evento, ParticipacionEvento, BitacoraActividad, RolUsuario, MetodoPago,
+    VentaDiariaJuego, VentaDiariaUsuario, VentaDiariaMetodo, MarcaResumen, CalificacionJuego,
+    Logro, ProgresoUsuarioLogro, PuntosJugador, Base, CLASIFICACION_GLOBAL, FUENTES_BUSQUEDA, fila_busqueda
+)
+from cache import CacheLRU, FALTA
+from clasificacion import ArbolPuntajes
+
+# Capa de servicios: consultas y operaciones sin input()/print(), para usarlas
+# desde el menú, scripts, workers y pruebas de carga. Los errores de negocio se
+# reportan con ErrorServicio y el mensaje que se le muestra al usuario.
+
+class ErrorServicio(Exception):
+    pass
+
+# Modo estricto: cualquier lazy load no declarado en OPCIONES_CARGA lanza un error
+MODO_ESTRICTO = os.environ.get("MODO_ESTRICTO") == "1"
+
+# === LISTADOS ===
+# Estrategias de carga declaradas por listado. Cada relación que un listado
+# imprime por fila se trae en la misma consulta (joinedload) en lugar de
+# hacer un SELECT extra por fila (N+1).
+OPCIONES_CARGA = {
+    "listar_usuarios": [],
+    "listar_juegos": [joinedload(Juego.desarrollador)],
+    "listar_eventos": [],
+    "gestionar_participantes": [joinedload(ParticipacionEvento.usuario)]
+}
+
+def opciones_carga(listado):
+    opciones = list(OPCIONES_CARGA[listado])
+    if MODO_ESTRICTO:
+        opciones.append(raiseload("*"))
+    return opciones
+
+# Paginación keyset (seek): cada página continúa desde la clave de orden y el
+# id de la última fila de la página anterior, sin OFFSET, así que la página N
+# cuesta lo mismo que la primera.
+TAMANO_PAGINA = 20
+
+# (columna de orden, llave primaria como desempate, descendente)
+ORDEN_USUARIOS = (Usuario.nombre, Usuario.id_usuario, False)
+ORDEN_JUEGOS = (Juego.nombre, Juego.id_juego, False)
+ORDEN_EVENTOS = (Evento.fecha_inicio, Evento.id_evento, True)
+
+def _condicion_keyset(columna, pk, descendente, valor, valor_pk):
+    if descendente:
+        return tuple_(columna, pk) < tuple_(valor, valor_pk)
+    return tuple_(columna, pk) > tuple_(valor, valor_pk)
+
+def _tramos_keyset(columna, pk, descendente, despues_de):
+    # (condición, orden) de cada tramo que queda por recorrer, en el orden del
+    # listado. Los NULL se ordenan como el valor más grande, igual que en
+    # PostgreSQL: al final en orden ascendente y al principio en descendente
+    orden_pk = pk.desc() if descendente else pk.asc()
+    nulos = columna.is_(None)
+    no_nulos = columna.isnot(None)
+    if despues_de is not None:
+        valor, valor_pk = despues_de
+        if valor is None:
+            nulos = and_(nulos, pk < valor_pk if descendente else pk > valor_pk)
+            if not descendente:
+                return [(nulos, [orden_pk])]
+        else:
+            no_nulos = and_(no_nulos, _condicion_keyset(columna, pk, descendente, valor, valor_pk))
+            if descendente:
+                return [(no_nulos, [columna.desc(), orden_pk])]
+    tramo_nulos = (nulos, [orden_pk])
+    tramo_no_nulos = (no_nulos, [columna.desc() if descendente else columna.asc(), orden_pk])
+    return [tramo_nulos, tramo_no_nulos] if descendente else [tramo_no_nulos, tramo_nulos]
+
+def ordenar_pagina(query, orden, despues_de=None, tamano=TAMANO_PAGINA):
+    # Sirve para Query y para select(); pide una fila de más para saber si hay otra página
+    columna, pk, descendente = orden
+    if columna.nullable:
+        # Un OR entre "después del cursor" y "es NULL" no se puede leer como un
+        # rango del índice (columna, pk). Cada tramo (NULL / no NULL) se lee por
+        # separado con su propio LIMIT por el índice y la página se arma con
+        # los ids de ambos: a lo sumo 2 * (tamano + 1) entradas por página
+        ids = []
+        for condicion, orden_tramo in _tramos_keyset(columna, pk, descendente, despues_de):
+            tramo = select(pk).where(condicion)
+            if query.whereclause is not None:
+                tramo = tramo.where(query.whereclause)
+            tramo = tramo.order_by(*orden_tramo).limit(tamano + 1).subquery()
+            ids.append(select(tramo.c[pk.key]))
+        query = query.filter(pk.in_(union_all(*ids) if len(ids) > 1 else ids[0]))
+    elif despues_de is not None:
+        query = query.filter(_condicion_keyset(columna, pk, descendente, *despues_de))
+    if descendente:
+        query = query.order_by(columna.desc().nulls_first(), pk.desc())
+    else:
+        query = query.order_by(columna.asc().nulls_last(), pk.asc())
+    return query.limit(tamano + 1)
+
+def cortar_pagina(registros, orden, tamano=TAMANO_PAGINA):
+    # Devuelve (registros, cursor); el cursor es None si no hay más páginas
+    columna, pk, _ = orden
+    if len(registros) <= tamano:
+        return registros, None
+    registros = registros[:tamano]
+    ultimo = registros[-1]
+    return registros, (getattr(ultimo, columna.key), getattr(ultimo, pk.key))
+
+def paginar(query, orden, despues_de=None, tamano=TAMANO_PAGINA):
+    return cortar_pagina(ordenar_pagina(query, orden, despues_de, tamano).all(), orden, tamano)
+
+def pagina_usuarios(despues_de=None, tamano=TAMANO_PAGINA):
+    query = session.query(Usuario).options(*opciones_carga("listar_usuarios"))
+    return paginar(query, ORDEN_USUARIOS, despues_de, tamano)
+
+def pagina_juegos(despues_de=None, tamano=TAMANO_PAGINA):
+    query = session.query(Juego).options(*opciones_carga("listar_juegos"))
+    return paginar(query, ORDEN_JUEGOS, despues_de, tamano)
+
+def pagina_eventos(despues_de=None, tamano=TAMANO_PAGINA):
+    query = session.query(Evento).options(*opciones_carga("listar_eventos"))
+    return paginar(query, ORDEN_EVENTOS, despues_de, tamano)
+
+
+# === DEPENDENCIAS ===
+# Antes de borrar se comprueba si otras tablas apuntan al registro con un
+# EXISTS por cada relación uno-a-muchos o muchos-a-muchos del modelo
+# (Usuario.compras.any(), ...), sin cargar las colecciones. Todo un conjunto
+# de ids se revisa en una sola consulta (una columna EXISTS por relación).
+# Relaciones que se borran junto con el registro en vez de impedir el borrado
+RELACIONES_PROPIAS = {
+    Usuario: {"perfiles"},
+    Juego: {"versiones", "categorias", "plataformas"},
+}
+TAMANO_LOTE_DEPENDENCIAS = 10_000
+
+def relaciones_dependientes(modelo) -> List[str]:
+    return [
+        relacion.key for relacion in inspect(modelo).relationships
+        if relacion.direction in (ONETOMANY, MANYTOMANY) and relacion.key not in RELACIONES_PROPIAS.get(modelo, ())
+    ]
+
+def _lotes(ids):
+    ids = iter(ids)
+    while True:
+        lote = list(itertools.islice(ids, TAMANO_LOTE_DEPENDENCIAS))
+        if not lote:
+            return
+        yield lote
+
+def _revisar_dependientes(sesion, modelo, ids):
+    # {id: [relaciones con filas]} para cada id que existe (lista vacía si no tiene dependientes)
+    relaciones = relaciones_dependientes(modelo)
+    pk = inspect(modelo).primary_key[0]
+    resultado = {}
+    for lote in _lotes(ids):
+        consulta = select(pk, *(getattr(modelo, relacion).any() for relacion in relaciones)).where(pk.in_(lote))
+        for id_registro, *existe in sesion.execute(consulta):
+            resultado[id_registro] = [relacion for relacion, hay in zip(relaciones, existe) if hay]
+    return resultado
+
+def dependientes(modelo, ids: Iterable[int]) -> dict:
+    # {id: [relaciones con filas]} solo de los ids que tienen dependientes
+    return {id_registro: relaciones for id_registro, relaciones in _revisar_dependientes(session, modelo, ids).items()
+            if relaciones}
+
+def registros_asociados(modelo, id_registro: int) -> List[str]:
+    # Nombres legibles de las relaciones que impiden borrar el registro
+    return [relacion.replace("_", " ") for relacion in dependientes(modelo, [id_registro]).get(id_registro, [])]
+
+def _borrar_propias(sesion, modelo, ids):
+    for clave in RELACIONES_PROPIAS.get(modelo, ()):
+        # En uno-a-muchos la columna es la FK de la tabla hija; en muchos-a-muchos, la de la tabla intermedia
+        columna = inspect(modelo).relationships[clave].synchronize_pairs[0][1]
+        sesion.execute(delete(columna.table).where(columna.in_(ids)))
+
+def eliminar_sin_dependientes(modelo, ids: Iterable[int]):
+    # Borrado masivo en una transacción: elimina los ids que no tienen
+    # dependientes (con sus relaciones propias) y devuelve
+    # (ids eliminados, {id: relaciones} de los que no se pudieron eliminar).
+    # Los ids que no existen no aparecen en ninguno de los dos
+    pk = inspect(modelo).primary_key[0]
+    try:
+        with unidad_de_trabajo() as sesion:
+            revisados = _revisar_dependientes(sesion, modelo, dict.fromkeys(ids))
+            libres = [id_registro for id_registro, relaciones in revisados.items() if not relaciones]
+            for lote in _lotes(libres):
+                _borrar_propias(sesion, modelo, lote)
+                sesion.execute(delete(modelo.__table__).where(pk.in_(lote)))
+    except IntegrityError:
+        # Alguien agregó un dependiente entre la revisión y el borrado
+        raise ErrorServicio("Se agregaron registros asociados mientras se eliminaba; intente nuevamente.")
+    if libres:
+        invalidar_referencias(modelo)
+    return libres, {id_registro: relaciones for id_registro, relaciones in revisados.items() if relaciones}
+
+def eliminar_uno(modelo, id_registro, mensaje_no_encontrado, mensaje_dependientes):
+    eliminados, bloqueados = eliminar_sin_dependientes(modelo, [id_registro])
+    if id_registro in bloqueados:
+        nombres = ", ".join(relacion.replace("_", " ") for relacion in bloqueados[id_registro])
+        raise ErrorServicio(f"{mensaje_dependientes} ({nombres}).")
+    if not eliminados:
+        raise ErrorServicio(mensaje_no_encontrado)
+
+# === DATOS DE REFERENCIA ===
+# Listas chicas que los menús piden a cada rato (los desarrolladores para
+# elegir en el alta y la edición de juegos). Se guardan como filas
+# (Row) y no como objetos de la sesión, así sirven en cualquier hilo o sesión.
+# Las escrituras de esta capa invalidan las listas afectadas al confirmar; el
+# TTL acota lo que tardan en verse los cambios hechos por fuera (SQL directo,
+# otro proceso). Los Enum de tipos.py ya están en memoria y no pasan por aquí
+CACHE_REFERENCIA = CacheLRU(capacidad=64, ttl=300)
+
+# Listas que cambian cuando se escribe en cada modelo
+REFERENCIAS_POR_MODELO = {
+    Usuario: ("desarrolladores",),
+}
+
+def _referencia(clave, cargar):
+    valor = CACHE_REFERENCIA.obtener(clave)
+    if valor is FALTA:
+        valor = cargar()
+        CACHE_REFERENCIA.guardar(clave, valor)
+    return valor
+
+def invalidar_referencias(*modelos) -> None:
+    for modelo in modelos:
+        for clave in REFERENCIAS_POR_MODELO.get(modelo, ()):
+            CACHE_REFERENCIA.invalidar(clave)
+
+def desarrolladores() -> tuple:
+    # (id_usuario, nombre, correo) ordenados por nombre
+    return _referencia("desarrolladores", lambda: tuple(session.execute(
+        select(Usuario.id_usuario, Usuario.nombre, Usuario.correo)
+        .where(Usuario.rol_usuario == RolUsuario.DESARROLLADOR)
+        .order_by(Usuario.nombre, Usuario.id_usuario)
+    ).all()))
+
+def metricas_cache() -> dict:
+    # Aciertos, fallos y tasa de aciertos de cada caché de esta capa
+    return {
+        "referencia": CACHE_REFERENCIA.metricas(),
+        "calificaciones": CACHE_CALIFICACIONES.metricas(),
+        "clasificaciones": CACHE_CLASIFICACIONES.metricas(),
+    }
+
+# === USUARIOS ===
+def obtener_usuario(usuario_id: int) -> Optional[Usuario]:
+    return session.get(Usuario, usuario_id)
+
+def agregar_usuario(datos: dict) -> Usuario:
+    try:
+        with unidad_de_trabajo() as sesion:
+            usuario = Usuario(
+                nombre=datos["nombre"],
+                correo=datos["correo"],
+                contraseña=datos["contraseña"],
+                rol_usuario=datos["rol_usuario"]
+            )
+            sesion.add(usuario)
+            sesion.flush()
+
+            # Crear perfil básico
+            sesion.add(PerfilUsuario(
+                id_usuario=usuario.id_usuario,
+                pais="",
+                biografia=""
+            ))
+    except IntegrityError:
+        raise ErrorServicio("El correo electrónico ya está en uso.")
+    invalidar_referencias(Usuario)
+    return usuario
+
+def editar_usuario(usuario_id: int, datos: dict) -> Usuario:
+    try:
+        with unidad_de_trabajo() as sesion:
+            usuario = sesion.get(Usuario, usuario_id)
+            if not usuario:
+                raise ErrorServicio("Usuario no encontrado.")
+            for campo in ("nombre", "correo", "rol_usuario"):
+                if campo in datos:
+                    setattr(usuario, campo, datos[campo])
+    except IntegrityError:
+        raise ErrorServicio("El correo electrónico ya está en uso.")
+    invalidar_referencias(Usuario)
+    return usuario
+
+def eliminar_usuario(usuario_id: int) -> None:
+    # El perfil se borra junto con el usuario (RELACIONES_PROPIAS)
+    eliminar_uno(Usuario, usuario_id, "Usuario no encontrado.", "Este usuario tiene registros asociados")
+
+def eliminar_usuarios(usuario_ids: Iterable[int]):
+    return eliminar_sin_dependientes(Usuario, usuario_ids)
+
+def obtener_perfil(usuario_id: int) -> Optional[PerfilUsuario]:
+    return session.query(PerfilUsuario).filter_by(id_usuario=usuario_id).first()
+
+# === JUEGOS ===
+def obtener_juego(juego_id: int) -> Optional[Juego]:
+    return session.get(Juego, juego_id)
+
+def agregar_juego(datos: dict) -> Juego:
+    with unidad_de_trabajo() as sesion:
+        juego = Juego(
+            nombre=datos["nombre"],
+            descripcion=datos.get("descripcion"),
+            fecha_lanzamiento=datos.get("fecha_lanzamiento"),
+            precio=datos["precio"],
+            estado_juego=datos["estado_juego"],
+            id_desarrollador=datos["id_desarrollador"]
+        )
+        sesion.add(juego)
+        sesion.flush()
+        sesion.add(VersionJuego(
+            id_juego=juego.id_juego,
+            numero_version="1.0",
+            fecha_publicacion=datetime.now().date(),
+            notas_cambios="Versión inicial"
+        ))
+    return juego
+
+def editar_juego(juego_id: int, datos: dict) -> Juego:
+    with unidad_de_trabajo() as sesion:
+        juego = sesion.get(Juego, juego_id)
+        if not juego:
+            raise ErrorServicio("Juego no encontrado.")
+        for campo in ("nombre", "descripcion", "fecha_lanzamiento", "precio", "estado_juego", "id_desarrollador"):
+            if campo in datos:
+                setattr(juego, campo, datos[campo])
+    return juego
+
+def eliminar_juego(juego_id: int) -> None:
+    # Versiones, categorías y plataformas se borran con el juego; compras, reseñas, logros, etc. lo impiden
+    eliminar_uno(Juego, juego_id, "Juego no encontrado.", "Este juego tiene registros asociados")
+    CACHE_CALIFICACIONES.invalidar(juego_id)
+
+def versiones_juego(juego_id: int) -> List[VersionJuego]:
+    return session.query(VersionJuego).filter_by(id_juego=juego_id).order_by(VersionJuego.fecha_publicacion.desc()).all()
+
+def agregar_version(juego_id: int, datos: dict) -> VersionJuego:
+    with unidad_de_trabajo() as sesion:
+        version = VersionJuego(
+            id_juego=juego_id,
+            numero_version=datos["numero_version"],
+            fecha_publicacion=datos["fecha_publicacion"],
+            notas_cambios=datos.get("notas_cambios")
+        )
+        sesion.add(version)
+    return version
+
+# === EVENTOS ===
+def obtener_evento(evento_id: int) -> Optional[Evento]:
+    return session.get(Evento, evento_id)
+
+def agregar_evento(datos: dict) -> Evento:
+    with unidad_de_trabajo() as sesion:
+        evento = Evento(
+            titulo=datos["titulo"],
+            descripcion=datos.get("descripcion"),
+            fecha_inicio=datos["fecha_inicio"],
+            fecha_fin=datos["fecha_fin"],
+            tipo_evento=datos["tipo_evento"]
+        )
+        sesion.add(evento)
+    return evento
+
+def eliminar_evento(evento_id: int) -> None:
+    eliminar_uno(Evento, evento_id, "Evento no encontrado.", "Este evento tiene registros asociados")
+
+def participantes_evento(evento_id: int) -> List[ParticipacionEvento]:
+    return session.query(ParticipacionEvento).options(*opciones_carga("gestionar_participantes")).filter_by(id_evento=evento_id).all()
+
+def agregar_participante(evento_id: int, usuario_id: int) -> ParticipacionEvento:
+    with unidad_de_trabajo() as sesion:
+        if sesion.get(ParticipacionEvento, (usuario_id, evento_id)):
+            raise ErrorServicio("El usuario ya está inscrito en este evento.")
+        participacion = ParticipacionEvento(
+            id_usuario=usuario_id,
+            id_evento=evento_id,
+            fecha_inscripcion=datetime.now().date()
+        )
+        sesion.add(participacion)
+    return participacion
+
+# === BÚSQUEDA ===
+# Texto completo sobre juegos, eventos, comentarios y notas de versión, por
+# relevancia y con prefijos ("estra" encuentra "estrategia"). En PostgreSQL usa
+# los índices GIN de migraciones/006_busqueda.sql; en SQLite la tabla FTS5
+# busqueda que mantienen los triggers de crear_esquema()
+TIPOS_BUSQUEDA = [tipo for tipo, *_ in FUENTES_BUSQUEDA]
+LARGO_FRAGMENTO = 120
+
+# Las expresiones to_tsvector deben coincidir con las de los índices
+CONSULTAS_BUSQUEDA_PG = {
+    "juego": """SELECT 'juego' AS tipo, id_juego AS id, nombre AS titulo, descripcion AS texto,
+        ts_rank(to_tsvector('spanish', coalesce(nombre, '') || ' ' || coalesce(descripcion, '')), q.consulta) AS rango
+        FROM Juego, q WHERE to_tsvector('spanish', coalesce(nombre, '') || ' ' || coalesce(descripcion, '')) @@ q.consulta""",
+    "evento": """SELECT 'evento', id_evento, titulo, descripcion,
+        ts_rank(to_tsvector('spanish', coalesce(titulo, '') || ' ' || coalesce(descripcion, '')), q.consulta)
+        FROM Evento, q WHERE to_tsvector('spanish', coalesce(titulo, '') || ' ' || coalesce(descripcion, '')) @@ q.consulta""",
+    "comentario": """SELECT 'comentario', id_comentario, NULL, contenido,
+        ts_rank(to_tsvector('spanish', coalesce(contenido, '')), q.consulta)
+        FROM Comentario, q WHERE to_tsvector('spanish', coalesce(contenido, '')) @@ q.consulta""",
+    "version": """SELECT 'version', id_version, numero_version, notas_cambios,
+        ts_rank(to_tsvector('spanish', coalesce(notas_cambios, '')), q.consulta)
+        FROM VersionJuego, q WHERE to_tsvector('spanish', coalesce(notas_cambios, '')) @@ q.consulta""",
+}
+
+@dataclass
+class ResultadoBusqueda:
+    tipo: str  # juego, evento, comentario o version
+    id: int
+    titulo: Optional[str]
+    fragmento: str
+    rango: float  # mayor = más relevante
+
+def _terminos(texto):
+    return re.findall(r"\w+", texto.lower())
+
+def _buscar_postgresql(terminos, tipos, limite):
+    consulta = " & ".join(f"{termino}:*" for termino in terminos)
+    union = "\nUNION ALL\n".join(CONSULTAS_BUSQUEDA_PG[tipo] for tipo in tipos)
+    filas = session.execute(text(
+        f"WITH q AS (SELECT to_tsquery('spanish', :consulta) AS consulta)\n"
+        f"SELECT * FROM ({union}) AS r ORDER BY rango DESC LIMIT :limite"
+    ), {"consulta": consulta, "limite": limite})
+    return [ResultadoBusqueda(f.tipo, f.id, f.titulo, (f.texto or "")[:LARGO_FRAGMENTO], f.rango) for f in filas]
+
+def _buscar_sqlite(terminos, tipos, limite):
+    consulta = " ".join('"{}"*'.format(termino.replace('"', '""')) for termino in terminos)
+    codigos = [TIPOS_BUSQUEDA.index(tipo) for tipo in tipos]
+    filtro = ""
+    if len(codigos) < len(TIPOS_BUSQUEDA):
+        filtro = f" AND rowid % {len(TIPOS_BUSQUEDA)} IN ({', '.join(map(str, codigos))})"
+    filas = session.execute(text(
+        "SELECT rowid, titulo, snippet(busqueda, 1, '', '', '…', 16) AS fragmento, bm25(busqueda, 2.0, 1.0) AS rango "
+        f"FROM busqueda WHERE busqueda MATCH :consulta{filtro} ORDER BY rango LIMIT :limite"
+    ), {"consulta": consulta, "limite": limite})
+    # bm25 (el título pesa el doble) es menor cuanto más relevante; se invierte para
+    # que ambos motores ordenen igual
+    return [
+        ResultadoBusqueda(TIPOS_BUSQUEDA[f.rowid % len(TIPOS_BUSQUEDA)], f.rowid // len(TIPOS_BUSQUEDA),
+                          f.titulo, f.fragmento or "", -f.rango)
+        for f in filas
+    ]
+
+def buscar(texto: str, tipos: Optional[List[str]] = None, limite: int = 20) -> List[ResultadoBusqueda]:
+    terminos = _terminos(texto)
+    if not terminos:
+        return []
+    tipos = tipos or TIPOS_BUSQUEDA
+    desconocidos = set(tipos) - set(TIPOS_BUSQUEDA)
+    if desconocidos:
+        raise ErrorServicio(f"Tipo de búsqueda no válido: {', '.join(sorted(desconocidos))}.")
+    dialecto = obtener_engine().dialect.name
+    if dialecto == "postgresql":
+        return _buscar_postgresql(terminos, tipos, limite)
+    if dialecto == "sqlite":
+        return _buscar_sqlite(terminos, tipos, limite)
+    raise ErrorServicio(f"La búsqueda no está disponible en {dialecto}.")
+
+def reconstruir_busqueda() -> int:
+    # Solo SQLite: vuelve a llenar la tabla FTS5 (bases creadas antes de los
+    # triggers). Los índices GIN de PostgreSQL se mantienen solos
+    with obtener_engine().begin() as conexion:
+        if conexion.dialect.name != "sqlite":
+            return 0
+        conexion.exec_driver_sql("DELETE FROM busqueda")
+        for codigo, (tipo, tabla, pk, titulo, texto) in enumerate(FUENTES_BUSQUEDA):
+            conexion.exec_driver_sql(
+                f"INSERT INTO busqueda (rowid, titulo, texto) SELECT {fila_busqueda(codigo, pk, titulo, texto)} FROM {tabla}"
+            )
+        return conexion.exec_driver_sql("SELECT count(*) FROM busqueda").scalar()
+
+# === SELECCIÓN POR PREFIJO ===
+# Para elegir un usuario o un juego escribiendo el comienzo del nombre (o del
+# correo) en lugar de listar la tabla entera. El prefijo se busca como rango
+# [prefijo, prefijo siguiente) sobre lower(columna), que recorre solo las
+# entradas que coinciden de los índices *_prefijo en el orden del índice: las
+# primeras `limite` salen sin leer ni ordenar el resto. En PostgreSQL la
+# expresión lleva COLLATE "C" como en migraciones/008_busqueda_prefijo.sql
+LIMITE_SUGERENCIAS = 10
+_MAYUSCULAS_ASCII = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+def _clave_prefijo(columna, dialecto):
+    clave = func.lower(columna)
+    return clave.collate("C") if dialecto == "postgresql" else clave
+
+def _minusculas(prefijo, dialecto):
+    # lower() de SQLite solo cambia letras ASCII; el de PostgreSQL, todas
+    return prefijo.lower() if dialecto == "postgresql" else prefijo.translate(_MAYUSCULAS_ASCII)
+
+def _por_prefijo(consulta, columna, pk, prefijo, limite):
+    dialecto = obtener_engine().dialect.name
+    clave = _clave_prefijo(columna, dialecto)
+    prefijo = _minusculas(prefijo.strip(), dialecto)
+    if prefijo:
+        siguiente = prefijo[:-1] + chr(ord(prefijo[-1]) + 1)
+        consulta = consulta.where(clave >= prefijo, clave < siguiente)
+    return session.execute(consulta.order_by(clave, pk).limit(limite)).all()
+
+def sugerir_usuarios(prefijo: str, limite: int = LIMITE_SUGERENCIAS, rol: Optional[RolUsuario] = None) -> list:
+    # (id_usuario, nombre, correo) cuyo nombre o correo empieza con el prefijo,
+    # primero las coincidencias por nombre
+    consulta = select(Usuario.id_usuario, Usuario.nombre, Usuario.correo)
+    if rol is not None:
+        consulta = consulta.where(Usuario.rol_usuario == rol)
+    encontrados = {}
+    for columna in (Usuario.nombre, Usuario.correo):
+        for fila in _por_prefijo(consulta, columna, Usuario.id_usuario, prefijo, limite):
+            encontrados.setdefault(fila.id_usuario, fila)
+    return list(encontrados.values())[:limite]
+
+def sugerir_desarrolladores(prefijo: str, limite: int = LIMITE_SUGERENCIAS) -> list:
+    # Como sugerir_usuarios(rol=DESARROLLADOR), pero sobre la lista en caché:
+    # son pocos y el alta y la edición de juegos los piden en cada búsqueda.
+    # Pasa a minúsculas igual que lower() del motor, así coincide con la consulta
+    dialecto = obtener_engine().dialect.name
+    prefijo = _minusculas(prefijo.strip(), dialecto)
+    encontrados = {}
+    for campo in ("nombre", "correo"):
+        claves = {fila.id_usuario: _minusculas(getattr(fila, campo), dialecto) for fila in desarrolladores()}
+        coincidencias = [fila for fila in desarrolladores() if claves[fila.id_usuario].startswith(prefijo)]
+        for fila in sorted(coincidencias, key=lambda fila: (claves[fila.id_usuario], fila.id_usuario))[:limite]:
+            encontrados.setdefault(fila.id_usuario, fila)
+    return list(encontrados.values())[:limite]
+
+def sugerir_juegos(prefijo: str, limite: int = LIMITE_SUGERENCIAS) -> list:
+    # (id_juego, nombre) cuyo nombre empieza con el prefijo
+    return _por_prefijo(select(Juego.id_juego, Juego.nombre), Juego.nombre, Juego.id_juego, prefijo, limite)
+
+# === REPORTES ===
+# En todos los filtros fecha_fin es el último día incluido, completo (la hora
+# se ignora): el límite real es la medianoche del día siguiente
+def fin_exclusivo(fecha_fin):
+    dia = fecha_fin.date() if isinstance(fecha_fin, datetime) else fecha_fin
+    return datetime.combine(dia + timedelta(days=1), datetime.min.time())
+
+@dataclass
+class FiltrosVentas:
+    fecha_inicio: Optional[datetime] = None
+    fecha_fin: Optional[datetime] = None
+    metodo: Optional[MetodoPago] = None
+    usuario_id: Optional[int] = None
+    juego_id: Optional[int] = None
+
+@dataclass
+class FiltrosResenas:
+    juego_id: Optional[int] = None
+    usuario_id: Optional[int] = None
+
+@dataclass
+class FiltrosActividad:
+    usuario_id: Optional[int] = None
+    tipo_actividad: Optional[str] = None
+    # Con rango de fechas PostgreSQL solo lee las particiones de esos meses
+    fecha_inicio: Optional[datetime] = None
+    fecha_fin: Optional[datetime] = None
+
+# Filas que se leen por lote al recorrer un reporte
+TAMANO_LOTE_REPORTE = 1000
+
+def consulta_ventas(filtros: Optional[FiltrosVentas] = None):
+    # LEFT JOIN: las compras sin usuario o sin juego también cuentan en los
+    # resúmenes, así que el detalle las muestra (con usuario/juego en None)
+    filtros = filtros or FiltrosVentas()
+    query = select(
+        Compra.id_compra,
+        Usuario.nombre.label('usuario'),
+        Juego.nombre.label('juego'),
+        Compra.monto_pagado,
+        Compra.fecha_compra,
+        Compra.metodo_pago
+    ).select_from(Compra).outerjoin(Usuario, Compra.id_usuario == Usuario.id_usuario).outerjoin(Juego, Compra.id_juego == Juego.id_juego)
+    if filtros.fecha_inicio is not None:
+        query = query.filter(Compra.fecha_compra >= filtros.fecha_inicio)
+    if filtros.fecha_fin is not None:
+        query = query.filter(Compra.fecha_compra < fin_exclusivo(filtros.fecha_fin))
+    if filtros.metodo is not None:
+        query = query.filter(Compra.metodo_pago == filtros.metodo)
+    if filtros.usuario_id is not None:
+        query = query.filter(Compra.id_usuario == filtros.usuario_id)
+    if filtros.juego_id is not None:
+        query = query.filter(Compra.id_juego == filtros.juego_id)
+    return query.order_by(Compra.fecha_compra.desc())
+
+def ventas(filtros: Optional[FiltrosVentas] = None, limite: Optional[int] = None) -> Iterator:
+    query = consulta_ventas(filtros)
+    if limite is not None:
+        query = query.limit(limite)
+    resultado = session.execute(query.execution_options(yield_per=TAMANO_LOTE_REPORTE))
+    try:
+        yield from resultado
+    finally:
+        # Si se deja de recorrer antes del final (paginación), el cursor se cierra igual
+        resultado.close()
+
+def consulta_resenas(filtros: Optional[FiltrosResenas] = None):
+    filtros = filtros or FiltrosResenas()
+    query = select(
+        Reseña.id_reseña,
+        Usuario.nombre.label('usuario'),
+        Juego.nombre.label('juego'),
+        Reseña.calificacion,
+        Reseña.comentario,
+        Reseña.fecha_reseña
+    ).select_from(Reseña).join(Usuario, Reseña.id_usuario == Usuario.id_usuario).join(Juego, Reseña.id_juego == Juego.id_juego)
+    if filtros.juego_id is not None:
+        query = query.filter(Reseña.id_juego == filtros.juego_id)
+    if filtros.usuario_id is not None:
+        query = query.filter(Reseña.id_usuario == filtros.usuario_id)
+    return query.order_by(Reseña.fecha_reseña.desc())
+
+def resenas(filtros: Optional[FiltrosResenas] = None) -> Iterator:
+    resultado = session.execute(consulta_resenas(filtros).execution_options(yield_per=TAMANO_LOTE_REPORTE))
+    try:
+        yield from resultado
+    finally:
+        resultado.close()
+
+def consulta_calificaciones(filtros: Optional[FiltrosResenas] = None):
+    # Cantidad de reseñas y calificación promedio con los mismos filtros del reporte
+    filtros = filtros or FiltrosResenas()
+    query = select(func.count(Reseña.id_reseña).label('cantidad'), func.avg(Reseña.calificacion).label('promedio'))
+    if filtros.juego_id is not None:
+        query = query.where(Reseña.id_juego == filtros.juego_id)
+    if filtros.usuario_id is not None:
+        query = query.where(Reseña.id_usuario == filtros.usuario_id)
+    return query
+
+def consulta_actividad(filtros: Optional[FiltrosActividad] = None):
+    filtros = filtros or FiltrosActividad()
+    query = select(
+        BitacoraActividad.id_actividad,
+        Usuario.nombre.label('usuario'),
+        BitacoraActividad.tipo_actividad,
+        BitacoraActividad.descripcion,
+        BitacoraActividad.fecha
+    ).select_from(BitacoraActividad).join(Usuario, BitacoraActividad.id_usuario == Usuario.id_usuario)
+    if filtros.usuario_id is not None:
+        query = query.filter(BitacoraActividad.id_usuario == filtros.usuario_id)
+    if filtros.tipo_actividad:
+        query = query.filter(BitacoraActividad.tipo_actividad.ilike(f"%{filtros.tipo_actividad}%"))
+    if filtros.fecha_inicio is not None:
+        query = query.filter(BitacoraActividad.fecha >= filtros.fecha_inicio)
+    if filtros.fecha_fin is not None:
+        query = query.filter(BitacoraActividad.fecha < fin_exclusivo(filtros.fecha_fin))
+    return query.order_by(BitacoraActividad.fecha.desc())
+
+def actividad(filtros: Optional[FiltrosActividad] = None) -> Iterator:
+    resultado = session.execute(consulta_actividad(filtros).execution_options(yield_per=TAMANO_LOTE_REPORTE))
+    try:
+        yield from resultado
+    finally:
+        resultado.close()
+
+# === BITÁCORA ===
+# En PostgreSQL BitacoraActividad está particionada por mes
+# (migraciones/007_bitacora_particionada.sql). mantener_bitacora.py crea las
+# particiones de los meses siguientes y aplica la retención: las particiones
+# vencidas se archivan en CSV (opcional) y se eliminan con DROP; en la
+# partición por defecto (meses sin partición y fechas nulas, guardadas como
+# -infinity) se archivan y borran las filas vencidas. En otras bases la
+# retención es un DELETE por fecha. La actividad sin fecha no vence: solo se
+# borra si se pide con purgar_sin_fecha.
+MESES_PARTICIONES_ADELANTE = 3
+PATRON_PARTICION = re.compile(r"bitacoraactividad_p(\d{4})(\d{2})$")
+PARTICION_DEFECTO = "bitacoraactividad_default"
+
+@dataclass
+class ParticionBitacora:
+    nombre: str
+    desde: Optional[date]
+    hasta: date  # exclusivo
+
+def _mes(fecha, meses=0):
+    # Primer día del mes de fecha, desplazado meses
+    indice = fecha.year * 12 + fecha.month - 1 + meses
+    return date(indice // 12, indice % 12 + 1, 1)
+
+def _bitacora_particionada(conexion):
+    return conexion.dialect.name == "postgresql" and bool(conexion.execute(text(
+        "SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass('bitacoraactividad')"
+    )).scalar())
+
+def crear_particiones_bitacora(conexion, desde: date, hasta: date) -> int:
+    # Particiones mensuales que falten entre desde y hasta; 0 si la tabla no está particionada.
+    # Las filas de esos meses que estaban en la partición por defecto pasan a la nueva
+    # (migraciones/010_particiones_desde_default.sql)
+    if not _bitacora_particionada(conexion):
+        return 0
+    return conexion.execute(text("SELECT crear_particiones_bitacora(:desde, :hasta)"),
+                            {"desde": desde, "hasta": hasta}).scalar()
+
+def mantener_particiones_bitacora(meses_adelante: int = MESES_PARTICIONES_ADELANTE) -> int:
+    hoy = date.today()
+    with obtener_engine().begin() as conexion:
+        return crear_particiones_bitacora(conexion, _mes(hoy), _mes(hoy, meses_adelante))
+
+def particiones_bitacora(conexion) -> List[ParticionBitacora]:
+    # Particiones mensuales en orden de fecha (sin la partición por defecto)
+    nombres = conexion.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'bitacoraactividad'::regclass"
+    )).scalars()
+    particiones = []
+    for nombre in nombres:
+        coincidencia = PATRON_PARTICION.match(nombre)
+        if coincidencia:
+            desde = date(int(coincidencia.group(1)), int(coincidencia.group(2)), 1)
+            particiones.append(ParticionBitacora(nombre, desde, _mes(desde, 1)))
+    return sorted(particiones, key=lambda p: p.desde)
+
+def _archivar_bitacora(conexion, directorio, nombre, desde, hasta):
+    condicion = BitacoraActividad.fecha < hasta
+    if desde is not None:
+        condicion = and_(BitacoraActividad.fecha >= desde, condicion)
+    os.makedirs(directorio, exist_ok=True)
+    return exportar_tabla_csv(conexion, BitacoraActividad.__table__, os.path.join(directorio, f"{nombre}.csv"),
+                              condicion=condicion)
+
+def aplicar_retencion_bitacora(meses: int, archivar_en: Optional[str] = None,
+                               purgar_sin_fecha: bool = False) -> List[ParticionBitacora]:
+    # Elimina la actividad anterior al mes de hace `meses` meses. Con archivar_en
+    # cada partición (o el rango borrado) se exporta antes a un CSV en ese directorio
+    limite = _mes(date.today(), -meses)
+    eliminadas = []
+    with obtener_engine().connect() as conexion:
+        with conexion.begin():
+            particionada = _bitacora_particionada(conexion)
+        if not particionada:
+            vencida = BitacoraActividad.fecha < limite
+            if purgar_sin_fecha:
+                vencida = or_(vencida, BitacoraActividad.fecha.is_(None))
+            with conexion.begin():
+                if archivar_en:
+                    os.makedirs(archivar_en, exist_ok=True)
+                    exportar_tabla_csv(conexion, BitacoraActividad.__table__,
+                                       os.path.join(archivar_en, f"bitacoraactividad_hasta_{limite:%Y%m}.csv"),
+                                       condicion=vencida)
+                borradas = conexion.execute(BitacoraActividad.__table__.delete().where(vencida)).rowcount
+            return [ParticionBitacora("bitacoraactividad", None, limite)] if borradas else []
+        with conexion.begin():
+            vencidas = [p for p in particiones_bitacora(conexion) if p.hasta <= limite]
+        for particion in vencidas:
+            # Una transacción por partición: si falla el archivo, la partición sigue ahí
+            with conexion.begin():
+                if archivar_en:
+                    _archivar_bitacora(conexion, archivar_en, particion.nombre, particion.desde, particion.hasta)
+                conexion.execute(text(f"ALTER TABLE bitacoraactividad DETACH PARTITION {particion.nombre}"))
+                conexion.execute(text(f"DROP TABLE {particion.nombre}"))
+            eliminadas.append(particion)
+        # Lo vencido que queda está en la partición por defecto; date.min deja
+        # afuera las filas sin fecha (-infinity)
+        desde = None if purgar_sin_fecha else date.min
+        with conexion.begin():
+            if archivar_en:
+                _archivar_bitacora(conexion, archivar_en, f"{PARTICION_DEFECTO}_hasta_{limite:%Y%m}", desde, limite)
+            borradas = conexion.execute(
+                text(f"DELETE FROM {PARTICION_DEFECTO} WHERE fecha < :limite"
+                     + ("" if desde is None else " AND fecha >= :desde")),
+                {"limite": limite, "desde": desde}
+            ).rowcount
+        if borradas:
+            eliminadas.append(ParticionBitacora(PARTICION_DEFECTO, desde, limite))
+    return eliminadas
+
+# === CALIFICACIONES ===
+# El agregado por juego lo mantienen los triggers de Reseña; aquí solo se lee,
+# con una caché LRU en memoria para no ir a la base en cada listado
+CACHE_CALIFICACIONES = CacheLRU(capacidad=10_000, ttl=60)
+
+@dataclass
+class Calificacion:
+    cantidad: int
+    suma: int
+    histograma: List[int]  # reseñas con 1, 2, 3, 4 y 5 estrellas
+
+    @property
+    def promedio(self) -> Optional[float]:
+        return self.suma / self.cantidad if self.cantidad else None
+
+def _calificacion(fila):
+    return Calificacion(fila.cantidad, fila.suma, [
+        fila.estrellas_1, fila.estrellas_2, fila.estrellas_3, fila.estrellas_4, fila.estrellas_5
+    ])
+
+def calificaciones_juegos(juego_ids) -> dict:
+    # {id_juego: Calificacion}; los juegos sin reseñas no aparecen
+    resultado = {}
+    faltan = []
+    for juego_id in set(juego_ids):
+        calificacion = CACHE_CALIFICACIONES.obtener(juego_id)
+        if calificacion is FALTA:
+            faltan.append(juego_id)
+        elif calificacion is not None:
+            resultado[juego_id] = calificacion
+    if faltan:
+        filas = {fila.id_juego: fila for fila in session.execute(
+            select(CalificacionJuego).where(CalificacionJuego.id_juego.in_(faltan))
+        ).scalars()}
+        for juego_id in faltan:
+            calificacion = _calificacion(filas[juego_id]) if juego_id in filas and filas[juego_id].cantidad else None
+            CACHE_CALIFICACIONES.guardar(juego_id, calificacion)
+            if calificacion is not None:
+                resultado[juego_id] = calificacion
+    return resultado
+
+def calificacion_juego(juego_id: int) -> Optional[Calificacion]:
+    return calificaciones_juegos([juego_id]).get(juego_id)
+
+def reconstruir_calificaciones() -> int:
+    # Recalcula el agregado desde Reseña (bases creadas antes de los triggers)
+    estrellas = [func.sum(case((Reseña.calificacion == n, 1), else_=0)) for n in range(1, 6)]
+    with obtener_engine().begin() as conexion:
+        conexion.execute(CalificacionJuego.__table__.delete())
+        conexion.execute(CalificacionJuego.__table__.insert().from_select(
+            ["id_juego", "cantidad", "suma", "estrellas_1", "estrellas_2", "estrellas_3", "estrellas_4", "estrellas_5"],
+            select(Reseña.id_juego, func.count(), func.sum(Reseña.calificacion), *estrellas)
+            .where(Reseña.id_juego.isnot(None), Reseña.calificacion.between(1, 5))
+            .group_by(Reseña.id_juego)
+        ))
+        juegos = conexion.execute(select(func.count()).select_from(CalificacionJuego)).scalar()
+    CACHE_CALIFICACIONES.limpiar()
+    return juegos
+
+# === CLASIFICACIONES ===
+# Ranking por puntos de logros, global (juego_id=None) o por juego. El top-N y
+# los vecinos se leen en orden del índice ix_puntosjugador_ranking (O(log n + k));
+# la posición y el percentil salen de un ArbolPuntajes en memoria (O(log P)).
+# Cada árbol se arma desde PuntosJugador la primera vez y se vuelve a leer
+# cuando vence el TTL; los logros desbloqueados desde este proceso lo
+# actualizan al momento.
+CACHE_CLASIFICACIONES = CacheLRU(capacidad=1000, ttl=300)
+
+@dataclass
+class FilaClasificacion:
+    posicion: int
+    id_usuario: int
+    usuario: str
+    puntos: int
+    logros: int
+
+def _clasificacion(juego_id):
+    return CLASIFICACION_GLOBAL if juego_id is None else juego_id
+
+def _arbol_puntajes(juego_id) -> ArbolPuntajes:
+    clasificacion = _clasificacion(juego_id)
+    arbol = CACHE_CLASIFICACIONES.obtener(clasificacion)
+    if arbol is FALTA:
+        conteos = session.execute(
+            select(PuntosJugador.puntos, func.count())
+            .where(PuntosJugador.id_juego == clasificacion)
+            .group_by(PuntosJugador.puntos)
+        ).all()
+        arbol = ArbolPuntajes(dict(conteos))
+        CACHE_CLASIFICACIONES.guardar(clasificacion, arbol)
+    return arbol
+
+def _filas_clasificacion(query, arbol):
+    return [
+        FilaClasificacion(arbol.posicion(fila.puntos), fila.id_usuario, fila.nombre, fila.puntos, fila.logros)
+        for fila in session.execute(query)
+    ]
+
+def _consulta_clasificacion(juego_id):
+    return select(
+        PuntosJugador.id_usuario, Usuario.nombre, PuntosJugador.puntos, PuntosJugador.logros
+    ).join(Usuario, Usuario.id_usuario == PuntosJugador.id_usuario).where(
+        PuntosJugador.id_juego == _clasificacion(juego_id)
+    )
+
+def top_clasificacion(n: int = 10, juego_id: Optional[int] = None) -> List[FilaClasificacion]:
+    query = _consulta_clasificacion(juego_id).order_by(
+        PuntosJugador.puntos.desc(), PuntosJugador.id_usuario.desc()
+    ).limit(n)
+    return _filas_clasificacion(query, _arbol_puntajes(juego_id))
+
+def _puntos_usuario(usuario_id, juego_id):
+    return session.get(PuntosJugador, (_clasificacion(juego_id), usuario_id))
+
+def posicion_usuario(usuario_id: int, juego_id: Optional[int] = None) -> Optional[int]:
+    puntos = _puntos_usuario(usuario_id, juego_id)
+    return _arbol_puntajes(juego_id).posicion(puntos.puntos) if puntos else None
+
+def percentil_usuario(usuario_id: int, juego_id: Optional[int] = None) -> Optional[float]:
+    puntos = _puntos_usuario(usuario_id, juego_id)
+    return _arbol_puntajes(juego_id).percentil(puntos.puntos) if puntos else None
+
+def vecinos_clasificacion(usuario_id: int, juego_id: Optional[int] = None, k: int = 2) -> List[FilaClasificacion]:
+    # Los k jugadores inmediatamente arriba, el usuario y los k de abajo
+    puntos = _puntos_usuario(usuario_id, juego_id)
+    if not puntos:
+        return []
+    clave = tuple_(PuntosJugador.puntos, PuntosJugador.id_usuario)
+    propia = tuple_(puntos.puntos, usuario_id)
+    consulta = _consulta_clasificacion(juego_id)
+    arbol = _arbol_puntajes(juego_id)
+    arriba = _filas_clasificacion(
+        consulta.where(clave > propia).order_by(PuntosJugador.puntos.asc(), PuntosJugador.id_usuario.asc()).limit(k), arbol
+    )
+    abajo = _filas_clasificacion(
+        consulta.where(clave <= propia).order_by(PuntosJugador.puntos.desc(), PuntosJugador.id_usuario.desc()).limit(k + 1), arbol
+    )
+    return list(reversed(arriba)) + abajo
+
+def desbloquear_logro(usuario_id: int, logro_id: int) -> ProgresoUsuarioLogro:
+    # El trigger suma los puntos en PuntosJugador; aquí se actualizan los árboles en memoria
+    with unidad_de_trabajo() as sesion:
+        logro = sesion.get(Logro, logro_id)
+        if not logro:
+            raise ErrorServicio("Logro no encontrado.")
+        if sesion.get(ProgresoUsuarioLogro, (usuario_id, logro_id)):
+            raise ErrorServicio("El usuario ya desbloqueó este logro.")
+        progreso = ProgresoUsuarioLogro(id_usuario=usuario_id, id_logro=logro_id, fecha_desbloqueo=datetime.now().date())
+        sesion.add(progreso)
+        sesion.flush()
+        clasificaciones = [CLASIFICACION_GLOBAL] + ([logro.id_juego] if logro.id_juego is not None else [])
+        totales = sesion.execute(
+            select(PuntosJugador.id_juego, PuntosJugador.puntos, PuntosJugador.logros)
+            .where(PuntosJugador.id_usuario == usuario_id, PuntosJugador.id_juego.in_(clasificaciones))
+        ).all()
+    for clasificacion, puntos, logros in totales:
+        arbol = CACHE_CLASIFICACIONES.obtener(clasificacion)
+        if arbol is FALTA:
+            continue
+        # Con un solo logro en esa clasificación el jugador recién entra al árbol
+        if logros > 1:
+            arbol.agregar(puntos - (logro.puntos or 0), -1)
+        arbol.agregar(puntos)
+    return progreso
+
+def reconstruir_clasificaciones() -> int:
+    # Recalcula PuntosJugador desde ProgresoUsuarioLogro (bases creadas antes del trigger)
+    puntos = func.sum(func.coalesce(Logro.puntos, 0))
+    por_usuario = select(
+        text(str(CLASIFICACION_GLOBAL)), ProgresoUsuarioLogro.id_usuario, puntos, func.count()
+    ).join(Logro, Logro.id_logro == ProgresoUsuarioLogro.id_logro).group_by(ProgresoUsuarioLogro.id_usuario)
+    por_juego = select(
+        Logro.id_juego, ProgresoUsuarioLogro.id_usuario, puntos, func.count()
+    ).join(Logro, Logro.id_logro == ProgresoUsuarioLogro.id_logro).where(
+        Logro.id_juego.isnot(None)
+    ).group_by(Logro.id_juego, ProgresoUsuarioLogro.id_usuario)
+    columnas = ["id_juego", "id_usuario", "puntos", "logros"]
+    with obtener_engine().begin() as conexion:
+        conexion.execute(PuntosJugador.__table__.delete())
+        conexion.execute(PuntosJugador.__table__.insert().from_select(columnas, por_usuario))
+        conexion.execute(PuntosJugador.__table__.insert().from_select(columnas, por_juego))
+        filas = conexion.execute(select(func.count()).select_from(PuntosJugador)).scalar()
+    CACHE_CLASIFICACIONES.limpiar()
+    return filas
+
+# === RESÚMENES DE VENTAS ===
+# Resúmenes diarios de Compra por juego, usuario y método de pago. Se mantienen
+# de forma incremental: cada actualización solo agrega las compras con
+# id_compra mayor a la marca guardada en MarcaResumen. Suponen que Compra solo
+# recibe inserciones; si se corrigen o borran compras hay que reconstruirlos.
+# Las compras sin valor en la dimensión (metodo_pago, id_juego o id_usuario
+# NULL) no entran al resumen: al leer se suman desde Compra con el índice
+# (dimensión, fecha), igual que los días parciales.
+# La marca solo avanza hasta un id cuyas compras anteriores ya están todas
+# confirmadas (ver _ultima_compra_confirmada): si no, una transacción aún
+# abierta con ids más bajos quedaría para siempre detrás de la marca.
+MARCA_VENTAS = "ventas"
+
+# (dimensión, modelo del resumen, columna del resumen, columna de Compra, campo de FiltrosVentas)
+RESUMENES_VENTAS = [
+    ("juego", VentaDiariaJuego, VentaDiariaJuego.id_juego, Compra.id_juego, "juego_id"),
+    ("usuario", VentaDiariaUsuario, VentaDiariaUsuario.id_usuario, Compra.id_usuario, "usuario_id"),
+    ("metodo", VentaDiariaMetodo, VentaDiariaMetodo.metodo_pago, Compra.metodo_pago, "metodo"),
+]
+
+@dataclass
+class FilaResumenVentas:
+    clave: object
+    cantidad: int
+    total: Decimal
+
+def _dia_compra():
+    return func.date(Compra.fecha_compra)
+
+def _insert_con_conflictos(conexion, operacion):
+    # insert() del dialecto, con ON CONFLICT
+    if conexion.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif conexion.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise ErrorServicio(f"{operacion} requiere PostgreSQL o SQLite.")
+    return insert
+
+def _insertar_acumulando(conexion, modelo, consulta):
+    insert = _insert_con_conflictos(conexion, "El resumen de ventas")
+    tabla = modelo.__table__
+    stmt = insert(tabla).from_select([c.name for c in tabla.columns], consulta)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[c.name for c in tabla.primary_key.columns],
+        set_={
+            "cantidad": tabla.c.cantidad + stmt.excluded.cantidad,
+            "total": tabla.c.total + stmt.excluded.total
+        }
+    )
+    conexion.execute(stmt)
+
+def _ultima_compra_confirmada():
+    # En PostgreSQL los ids salen de una secuencia al insertar y una transacción
+    # abierta puede tener ids más bajos que otros ya confirmados. El modo SHARE
+    # espera a que terminen las inserciones en curso (y frena las nuevas solo
+    # mientras tanto), así que todo id menor al máximo leído ya está confirmado.
+    # En SQLite hay un solo escritor a la vez y no pasa
+    with obtener_engine().begin() as conexion:
+        if conexion.dialect.name == "postgresql":
+            conexion.execute(text(f"LOCK TABLE {Compra.__tablename__} IN SHARE MODE"))
+        return conexion.execute(select(func.max(Compra.id_compra))).scalar()
+
+def actualizar_resumenes_ventas(reconstruir: bool = False) -> int:
+    confirmada = _ultima_compra_confirmada()
+    with obtener_engine().begin() as conexion:
+        if reconstruir:
+            for _, modelo, _, _, _ in RESUMENES_VENTAS:
+                conexion.execute(modelo.__table__.delete())
+            conexion.execute(MarcaResumen.__table__.delete().where(MarcaResumen.nombre == MARCA_VENTAS))
+        # FOR UPDATE sobre la marca: dos actualizaciones simultáneas no suman las mismas compras
+        desde = conexion.execute(
+            select(MarcaResumen.ultimo_id).where(MarcaResumen.nombre == MARCA_VENTAS).with_for_update()
+        ).scalar()
+        if desde is None:
+            desde = 0
+            conexion.execute(MarcaResumen.__table__.insert().values(nombre=MARCA_VENTAS, ultimo_id=0))
+        if confirmada is None or confirmada <= desde:
+            return 0
+        hasta = confirmada
+        rango = and_(Compra.id_compra > desde, Compra.id_compra <= hasta, Compra.fecha_compra.isnot(None))
+        nuevas = conexion.execute(select(func.count()).select_from(Compra).where(rango)).scalar()
+        dia = _dia_compra()
+        for _, modelo, _, columna, _ in RESUMENES_VENTAS:
+            consulta = select(
+                columna, dia, func.count(), func.coalesce(func.sum(Compra.monto_pagado), 0)
+            ).where(rango, columna.isnot(None)).group_by(columna, dia)
+            _insertar_acumulando(conexion, modelo, consulta)
+        conexion.execute(
+            MarcaResumen.__table__.update().where(MarcaResumen.nombre == MARCA_VENTAS).values(ultimo_id=hasta)
+        )
+        return nuevas
+
+def _resumen_para(filtros, agrupar_por):
+    # Un resumen sirve si todos los filtros y la agrupación usan su misma dimensión
+    dimensiones = {dimension for dimension, _, _, _, campo in RESUMENES_VENTAS if getattr(filtros, campo) is not None}
+    if agrupar_por not in (None, "dia"):
+        dimensiones.add(agrupar_por)
+    if len(dimensiones) > 1:
+        return None
+    dimension = dimensiones.pop() if dimensiones else "metodo"  # el de menos filas por día
+    return next(r for r in RESUMENES_VENTAS if r[0] == dimension)
+
+def _clave(valor):
+    # SQLite devuelve date() como texto
+    return datetime.strptime(valor, "%Y-%m-%d").date() if isinstance(valor, str) else valor
+
+def _acumular(acumulado, filas):
+    for clave, cantidad, total in filas:
+        fila = acumulado.setdefault(_clave(clave), FilaResumenVentas(_clave(clave), 0, Decimal(0)))
+        fila.cantidad += cantidad
+        fila.total += Decimal(str(total or 0)).quantize(Decimal("0.01"))
+
+def _agregar_compras(conexion, filtros, agrupar_por, *condiciones):
+    columna = {d: c for d, _, _, c, _ in RESUMENES_VENTAS}.get(agrupar_por)
+    clave = _dia_compra() if agrupar_por == "dia" else columna
+    consulta = select(
+        clave if clave is not None else text("NULL"), func.count(), func.sum(Compra.monto_pagado)
+    ).where(Compra.fecha_compra.isnot(None), *condiciones)
+    if filtros.fecha_inicio is not None:
+        consulta = consulta.where(Compra.fecha_compra >= filtros.fecha_inicio)
+    if filtros.fecha_fin is not None:
+        consulta = consulta.where(Compra.fecha_compra < fin_exclusivo(filtros.fecha_fin))
+    for _, _, _, columna_filtro, campo in RESUMENES_VENTAS:
+        if getattr(filtros, campo) is not None:
+            consulta = consulta.where(columna_filtro == getattr(filtros, campo))
+    if clave is not None:
+        consulta = consulta.group_by(clave)
+    return conexion.execute(consulta).all()
+
+def leer_resumen_ventas(conexion, filtros: Optional[FiltrosVentas] = None, agrupar_por: Optional[str] = None) -> List[FilaResumenVentas]:
+    # agrupar_por: None (un solo total), "dia", "juego", "usuario" o "metodo".
+    # Los días completos dentro del rango salen del resumen; los extremos
+    # parciales del rango y las compras aún no resumidas salen de Compra.
+    # La marca y el resumen deben leerse dentro de la misma transacción.
+    filtros = filtros or FiltrosVentas()
+    resumen = _resumen_para(filtros, agrupar_por)
+    acumulado = {}
+    if resumen is None:
+        _acumular(acumulado, _agregar_compras(conexion, filtros, agrupar_por))
+    else:
+        dimension, modelo, columna, columna_compra, campo = resumen
+        marca = conexion.execute(
+            select(MarcaResumen.ultimo_id).where(MarcaResumen.nombre == MARCA_VENTAS)
+        ).scalar() or 0
+        primer_dia = ultimo_dia = None
+        if filtros.fecha_inicio is not None:
+            primer_dia = filtros.fecha_inicio.date()
+            if filtros.fecha_inicio != datetime.combine(primer_dia, datetime.min.time()):
+                primer_dia += timedelta(days=1)
+        if filtros.fecha_fin is not None:
+            ultimo_dia = fin_exclusivo(filtros.fecha_fin).date() - timedelta(days=1)
+        clave = {"dia": modelo.fecha, dimension: columna}.get(agrupar_por)
+        consulta = select(
+            clave if clave is not None else text("NULL"), func.sum(modelo.cantidad), func.sum(modelo.total)
+        )
+        fuera_del_resumen = [Compra.id_compra > marca]
+        if primer_dia is not None:
+            consulta = consulta.where(modelo.fecha >= primer_dia)
+            fuera_del_resumen.append(Compra.fecha_compra < datetime.combine(primer_dia, datetime.min.time()))
+        if ultimo_dia is not None:
+            consulta = consulta.where(modelo.fecha <= ultimo_dia)
+        if getattr(filtros, campo) is not None:
+            consulta = consulta.where(columna == getattr(filtros, campo))
+        else:
+            fuera_del_resumen.append(columna_compra.is_(None))
+        if clave is not None:
+            consulta = consulta.group_by(clave)
+        if primer_dia is None or ultimo_dia is None or primer_dia <= ultimo_dia:
+            _acumular(acumulado, (f for f in conexion.execute(consulta) if f[1] is not None))
+        _acumular(acumulado, _agregar_compras(conexion, filtros, agrupar_por, or_(*fuera_del_resumen)))
+    filas = [f for f in acumulado.values() if f.cantidad]
+    if agrupar_por == "dia":
+        return sorted(filas, key=lambda f: f.clave)
+    return sorted(filas, key=lambda f: f.total, reverse=True)
+
+def resumen_ventas(filtros: Optional[FiltrosVentas] = None, agrupar_por: Optional[str] = None) -> List[FilaResumenVentas]:
+    with obtener_engine().connect() as conexion:
+        if conexion.dialect.name == "postgresql":
+            # La marca y el resumen deben leerse de la misma foto
+            conexion = conexion.execution_options(isolation_level="REPEATABLE READ")
+        with conexion.begin():
+            return leer_resumen_ventas(conexion, filtros, agrupar_por)
+
+# === CARGA MASIVA ===
+# Filas por lote (y por transacción) en las cargas masivas
+TAMANO_LOTE_CARGA = 10_000
+
+def _valor_copy(valor):
+    if valor is None:
+        return "\\N"
+    if isinstance(valor, PyEnum):
+        return valor.value
+    if isinstance(valor, str):
+        return valor.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+    return str(valor)
+
+class FlujoCopy:
+    # Objeto tipo archivo que arma el texto de COPY a medida que psycopg2 lo lee
+    def __init__(self, filas):
+        self._lineas = ("\t".join(map(_valor_copy, fila)) + "\n" for fila in filas)
+        self._pendiente = ""
+        self.filas = 0
+
+    def read(self, size=-1):
+        partes = [self._pendiente]
+        largo = len(self._pendiente)
+        while size < 0 or largo < size:
+            linea = next(self._lineas, None)
+            if linea is None:
+                break
+            partes.append(linea)
+            largo += len(linea)
+            self.filas += 1
+        datos = "".join(partes)
+        if size < 0:
+            self._pendiente = ""
+            return datos
+        self._pendiente = datos[size:]
+        return datos[:size]
+
+def cargar_copy(conexion, tabla, columnas, filas, tamano_lote=TAMANO_LOTE_CARGA):
+    # Un COPY por cada tamano_lote filas, como los INSERT de cargar_lotes
+    preparador = conexion.dialect.identifier_preparer
+    sql = (f"COPY {preparador.format_table(tabla)} ({', '.join(preparador.quote(c) for c in columnas)}) "
+           f"FROM STDIN")
+    filas = iter(filas)
+    total = 0
+    cursor = conexion.connection.cursor()
+    try:
+        for primera in filas:
+            flujo = FlujoCopy(itertools.chain([primera], itertools.islice(filas, tamano_lote - 1)))
+            cursor.copy_expert(sql, flujo)
+            total += flujo.filas
+    finally:
+        cursor.close()
+    return total
+
+def cargar_lotes(conexion, tabla, columnas, filas, tamano_lote=TAMANO_LOTE_CARGA):
+    filas = iter(filas)
+    total = 0
+    insert = tabla.insert()
+    while True:
+        lote = [dict(zip(columnas, fila)) for fila in itertools.islice(filas, tamano_lote)]
+        if not lote:
+            return total
+        conexion.execute(insert, lote)
+        total += len(lote)
+
+def _usa_copy(conexion):
+    # COPY FROM STDIN necesita copy_expert de psycopg2
+    return conexion.dialect.name == "postgresql" and conexion.dialect.driver == "psycopg2"
+
+COLUMNAS_COMPRA = ["id_usuario", "id_juego", "fecha_compra", "monto_pagado", "metodo_pago"]
+
+def ingerir_compras(compras: Iterable[dict], tamano_lote: int = TAMANO_LOTE_CARGA) -> int:
+    # Cada lote es un solo COPY (o un INSERT multi-fila) en su propia transacción.
+    # En PostgreSQL la bitácora la escribe trg_registrar_compras una vez por
+    # sentencia (migraciones/003_bitacora_por_sentencia.sql), no una vez por fila
+    compras = iter(compras)
+    ahora = datetime.now()
+    total = 0
+    while True:
+        lote = [
+            (c["id_usuario"], c["id_juego"], c.get("fecha_compra") or ahora, c["monto_pagado"],
+             MetodoPago(c["metodo_pago"]))
+            for c in itertools.islice(compras, tamano_lote)
+        ]
+        if not lote:
+            return total
+        with obtener_engine().begin() as conexion:
+            cargar = cargar_copy if _usa_copy(conexion) else cargar_lotes
+            total += cargar(conexion, Compra.__table__, COLUMNAS_COMPRA, lote, tamano_lote)
+
+# Importación de usuarios con su perfil desde CSV (con encabezado) o JSONL,
+# opcionalmente .gz. El archivo se lee fila a fila; cada lote es una
+# transacción con un INSERT multi-fila de Usuario que devuelve los ids
+# (RETURNING) y la carga de los PerfilUsuario con esos ids. Un correo que ya
+# existe no aborta el lote (ON CONFLICT DO NOTHING): la fila no vuelve en el
+# RETURNING y se manda al archivo de rechazos junto con las inválidas
+COLUMNAS_PERFIL = ["id_usuario", "avatar_url", "pais", "biografia", "fecha_nacimiento"]
+OBLIGATORIAS_IMPORTACION = ["nombre", "correo", "contraseña", "rol_usuario"]
+
+def _formato_archivo(filename):
+    base = filename[:-3] if filename.endswith(".gz") else filename
+    return "jsonl" if base.endswith((".jsonl", ".ndjson")) else "csv"
+
+def _abrir_texto(filename, modo):
+    abrir = gzip.open if filename.endswith(".gz") else open
+    return abrir(filename, modo + "t", newline='', encoding="utf-8")
+
+def leer_filas(filename) -> Iterator[dict]:
+    with _abrir_texto(filename, "r") as f:
+        if _formato_archivo(filename) == "csv":
+            yield from csv.DictReader(f)
+            return
+        for numero, linea in enumerate(f, 1):
+            if linea.strip():
+                try:
+                    yield json.loads(linea)
+                except json.JSONDecodeError as e:
+                    raise ErrorServicio(f"Línea {numero} de '{filename}' no es JSON válido: {e}")
+
+class ArchivoRechazos:
+    # Las filas rechazadas en el formato de entrada más una columna "motivo".
+    # El archivo se crea con el primer rechazo
+    def __init__(self, filename):
+        self.filename = filename
+        self.filas = 0
+        self._archivo = None
+        self._escribir = None
+
+    def __call__(self, fila, motivo):
+        if self._archivo is None:
+            self._archivo = _abrir_texto(self.filename, "w")
+            if _formato_archivo(self.filename) == "csv":
+                writer = csv.DictWriter(self._archivo, [c for c in fila if c is not None] + ["motivo"],
+                                        extrasaction="ignore")
+                writer.writeheader()
+                self._escribir = writer.writerow
+            else:
+                self._escribir = lambda datos: self._archivo.write(
+                    json.dumps(datos, ensure_ascii=False, default=str) + "\n")
+        self._escribir(dict(fila, motivo=motivo))
+        self.filas += 1
+
+    def cerrar(self):
+        if self._archivo is not None:
+            self._archivo.close()
+
+def _texto(fila, columna, largo=None):
+    valor = fila.get(columna)
+    valor = "" if valor is None else str(valor).strip()
+    if largo and len(valor) > largo:
+        raise ValueError(f"{columna} supera {largo} caracteres")
+    return valor
+
+def _fecha_importada(fila, columna):
+    valor = fila.get(columna)
+    if valor in (None, ""):
+        return None
+    try:
+        return date.fromisoformat(str(valor)[:10])
+    except ValueError:
+        raise ValueError(f"{columna} no es una fecha AAAA-MM-DD: {valor}")
+
+def _usuario_importado(fila, hoy):
+    # (usuario, perfil) listos para insertar; ValueError con el motivo si la fila no sirve
+    faltan = [c for c in OBLIGATORIAS_IMPORTACION if not _texto(fila, c)]
+    if faltan:
+        raise ValueError(f"faltan columnas obligatorias: {', '.join(faltan)}")
+    try:
+        rol = RolUsuario(_texto(fila, "rol_usuario").upper())
+    except ValueError:
+        raise ValueError(f"rol_usuario inválido: {fila['rol_usuario']}")
+    usuario = {
+        "nombre": _texto(fila, "nombre", 100),
+        "correo": _texto(fila, "correo", 100),
+        "contraseña": str(fila["contraseña"]),
+        "rol_usuario": rol,
+        "fecha_registro": _fecha_importada(fila, "fecha_registro") or hoy
+    }
+    perfil = (_texto(fila, "avatar_url") or None, _texto(fila, "pais", 50), _texto(fila, "biografia"),
+              _fecha_importada(fila, "fecha_nacimiento"))
+    return usuario, perfil
+
+def _importar_lote(lote, rechazar):
+    # lote: [(fila original, usuario, perfil)] sin correos repetidos
+    tabla = Usuario.__table__
+    with obtener_engine().begin() as conexion:
+        insert = _insert_con_conflictos(conexion, "La importación de usuarios")
+        stmt = (insert(tabla).on_conflict_do_nothing(index_elements=["correo"])
+                .returning(tabla.c.correo, tabla.c.id_usuario))
+        ids = dict(conexion.execute(stmt, [usuario for _, usuario, _ in lote]).all())
+        perfiles = []
+        for fila, usuario, perfil in lote:
+            id_usuario = ids.get(usuario["correo"])
+            if id_usuario is None:
+                rechazar(fila, "correo ya registrado")
+            else:
+                perfiles.append((id_usuario,) + perfil)
+        if perfiles:
+            cargar = cargar_copy if _usa_copy(conexion) else cargar_lotes
+            cargar(conexion, PerfilUsuario.__table__, COLUMNAS_PERFIL, perfiles, len(perfiles))
+    if perfiles:
+        invalidar_referencias(Usuario)
+    return len(perfiles)
+
+def importar_usuarios(filas: Iterable[dict], rechazar, tamano_lote: int = TAMANO_LOTE_CARGA) -> dict:
+    # rechazar(fila, motivo) recibe las filas inválidas, repetidas o con un correo ya registrado
+    hoy = date.today()
+    resultado = {"leidas": 0, "importadas": 0, "rechazadas": 0}
+
+    def rechazo(fila, motivo):
+        resultado["rechazadas"] += 1
+        rechazar(fila, motivo)
+
+    filas = iter(filas)
+    while True:
+        lote = {}
+        leidas = 0
+        for fila in itertools.islice(filas, tamano_lote):
+            leidas += 1
+            try:
+                usuario, perfil = _usuario_importado(fila, hoy)
+            except ValueError as e:
+                rechazo(fila, str(e))
+                continue
+            if usuario["correo"] in lote:
+                rechazo(fila, "correo repetido en el archivo")
+            else:
+                lote[usuario["correo"]] = (fila, usuario, perfil)
+        resultado["leidas"] += leidas
+        if lote:
+            resultado["importadas"] += _importar_lote(list(lote.values()), rechazo)
+        if leidas < tamano_lote:
+            return resultado
+
+def importar_usuarios_archivo(filename, filename_rechazos=None, tamano_lote: int = TAMANO_LOTE_CARGA) -> dict:
+    if filename_rechazos is None:
+        base, extension = (filename[:-3], ".gz") if filename.endswith(".gz") else (filename, "")
+        raiz, formato = os.path.splitext(base)
+        filename_rechazos = f"{raiz}_rechazos{formato}{extension}"
+    rechazos = ArchivoRechazos(filename_rechazos)
+    try:
+        resultado = importar_usuarios(leer_filas(filename), rechazos, tamano_lote)
+    finally:
+        rechazos.cerrar()
+    resultado["rechazos"] = filename_rechazos if rechazos.filas else None
+    return resultado
+
+# === EXPORTACIÓN ===
+# Filas que se traen del cursor del servidor en cada lote de exportación
+TAMANO_LOTE_EXPORTACION = 5000
+
+@contextmanager
+def medir_memoria():
+    # Pico de memoria de Python durante una exportación (tracemalloc), no el
+    # del proceso entero: muestra si el cursor del servidor la mantuvo plana.
+    # Si ya se mide desde afuera (benchmark.py) no se toca esa medición
+    memoria = {"pico_mb": None}
+    if tracemalloc.is_tracing():
+        yield memoria
+        return
+    tracemalloc.start()
+    try:
+        yield memoria
+    finally:
+        memoria["pico_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+
+def valor_csv(valor):
+    return valor.value if isinstance(valor, PyEnum) else valor
+
+def exportar_tabla_csv(conexion, tabla, filename, tamano_lote=TAMANO_LOTE_EXPORTACION, condicion=None, encabezado=True):
+    # Filas Core (sin objetos ORM ni identity map) leídas con un cursor del servidor
+    columnas = list(tabla.columns)
+    consulta = select(*columnas)
+    if condicion is not None:
+        consulta = consulta.where(condicion)
+    consulta = consulta.order_by(*tabla.primary_key.columns)
+    inicio = time.perf_counter()
+    with medir_memoria() as memoria:
+        resultado = conexion.execute(consulta.execution_options(stream_results=True, yield_per=tamano_lote))
+        lotes = resultado.partitions()
+        primer_lote = next(lotes, None)
+        if not primer_lote:
+            resultado.close()
+            return None
+        filas = 0
+        with open(filename, "w", newline='', encoding="utf-8") as f:
+            writer = csv.writer(f)
+            if encabezado:
+                writer.writerow([col.name for col in columnas])
+            lote = primer_lote
+            while lote:
+                writer.writerows([valor_csv(valor) for valor in fila] for fila in lote)
+                filas += len(lote)
+                lote = next(lotes, None)
+    return estadisticas_exportacion(filename, filas, inicio, memoria["pico_mb"])
+
+def estadisticas_exportacion(filename, filas, inicio, memoria_pico_mb):
+    duracion = time.perf_counter() - inicio
+    return {
+        "archivo": filename,
+        "filas": filas,
+        "segundos": duracion,
+        "filas_por_segundo": filas / duracion if duracion > 0 else float(filas),
+        "memoria_pico_mb": memoria_pico_mb
+    }
+
+COLUMNAS_REPORTE_VENTAS = ['ID', 'Usuario', 'Juego', 'Monto', 'Fecha', 'Método Pago']
+
+def exportar_ventas_csv(filename, filtros: Optional[FiltrosVentas] = None, comprimir=False, limite=None) -> dict:
+    # Cada venta se escribe al leerla del cursor: la memoria no crece con el rango de fechas
+    if comprimir and not filename.endswith(".gz"):
+        filename += ".gz"
+    abrir = gzip.open if comprimir else open
+    inicio = time.perf_counter()
+    filas = 0
+    with medir_memoria() as memoria, abrir(filename, "wt", newline='', encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNAS_REPORTE_VENTAS)
+        for venta in ventas(filtros, limite):
+            writer.writerow([
+                venta.id_compra,
+                venta.usuario,
+                venta.juego,
+                venta.monto_pagado,
+                venta.fecha_compra.strftime('%Y-%m-%d %H:%M') if venta.fecha_compra else None,
+                valor_csv(venta.metodo_pago)
+            ])
+            filas += 1
+    return estadisticas_exportacion(filename, filas, inicio, memoria["pico_mb"])
+
+# Formatos columnares: cada lote del cursor es un row group (Parquet) o un
+# record batch (Arrow IPC) con los tipos de las columnas del modelo. Los Enum
+# se guardan con codificación de diccionario. pyarrow es opcional y tarda en
+# importarse, así que solo se carga al exportar en estos formatos
+FORMATOS_COLUMNARES = {"parquet": ".parquet", "arrow": ".arrow"}
+TAMANO_GRUPO_COLUMNAR = 100_000
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ErrorServicio("Para exportar en Parquet o Arrow instale pyarrow (pip install pyarrow).")
+    return pyarrow
+
+def tipo_arrow(pa, tipo):
+    if isinstance(tipo, SAEnum) and tipo.enum_class is not None:
+        return pa.dictionary(pa.int8(), pa.string())
+    if isinstance(tipo, Float):
+        return pa.float64()
+    if isinstance(tipo, Numeric):
+        return pa.decimal128(tipo.precision or 38, tipo.scale or 0)
+    if isinstance(tipo, BigInteger):
+        return pa.int64()
+    if isinstance(tipo, Integer):
+        return pa.int32()
+    if isinstance(tipo, Boolean):
+        return pa.bool_()
+    if isinstance(tipo, DateTime):
+        return pa.timestamp("us", tz="UTC" if tipo.timezone else None)
+    if isinstance(tipo, Date):
+        return pa.date32()
+    return pa.string()
+
+def _columna_arrow(pa, tipo_sa, tipo):
+    # Devuelve la función que convierte los valores de un lote en un array de Arrow
+    if pa.types.is_dictionary(tipo):
+        # Diccionario fijo (todos los valores del Enum) para que sea el mismo en
+        # cada lote; el formato de archivo Arrow no admite reemplazarlo
+        miembros = list(tipo_sa.enum_class)
+        indices = {miembro: i for i, miembro in enumerate(miembros)}
+        diccionario = pa.array([miembro.value for miembro in miembros], type=pa.string())
+        return lambda valores: pa.DictionaryArray.from_arrays(
+            pa.array([None if v is None else indices[v] for v in valores], type=pa.int8()), diccionario)
+    if pa.types.is_string(tipo):
+        return lambda valores: pa.array([None if v is None else str(v) for v in valores], type=tipo)
+    return lambda valores: pa.array(valores, type=tipo)
+
+def exportar_consulta_columnar(conexion, consulta, filename, formato="parquet", tamano_lote=TAMANO_GRUPO_COLUMNAR):
+    if formato not in FORMATOS_COLUMNARES:
+        raise ErrorServicio(f"Formato de exportación no válido: {formato}.")
+    pa = _pyarrow()
+    columnas = list(consulta.selected_columns)
+    esquema = pa.schema([pa.field(columna.name, tipo_arrow(pa, columna.type)) for columna in columnas])
+    convertir = [_columna_arrow(pa, columna.type, campo.type) for columna, campo in zip(columnas, esquema)]
+    inicio = time.perf_counter()
+    with medir_memoria() as memoria:
+        resultado = conexion.execute(consulta.execution_options(stream_results=True, yield_per=tamano_lote))
+        filas = 0
+        if formato == "parquet":
+            escritor = pa.parquet.ParquetWriter(filename, esquema, compression="zstd")
+        else:
+            escritor = pa.ipc.new_file(filename, esquema)
+        with escritor:
+            for lote in resultado.partitions():
+                arrays = [convertir[i](valores) for i, valores in enumerate(zip(*lote))]
+                tabla = pa.Table.from_arrays(arrays, schema=esquema)
+                if formato == "parquet":
+                    escritor.write_table(tabla, row_group_size=len(lote))
+                else:
+                    escritor.write_table(tabla)
+                filas += len(lote)
+    return estadisticas_exportacion(filename, filas, inicio, memoria["pico_mb"])
+
+def exportar_tabla_columnar(conexion, tabla, filename, formato="parquet", tamano_lote=TAMANO_GRUPO_COLUMNAR, condicion=None):
+    consulta = select(*tabla.columns)
+    if condicion is not None:
+        consulta = consulta.where(condicion)
+    consulta = consulta.order_by(*tabla.primary_key.columns)
+    return exportar_consulta_columnar(conexion, consulta, filename, formato, tamano_lote)
+
+def exportar_ventas_columnar(filename, filtros: Optional[FiltrosVentas] = None, formato="parquet", limite=None) -> dict:
+    consulta = consulta_ventas(filtros)
+    if limite is not None:
+        consulta = consulta.limit(limite)
+    with obtener_engine().connect() as conexion:
+        return exportar_consulta_columnar(conexion, consulta, filename, formato)
+
+TABLAS_EXPORTACION = [
+    ("usuarios", Usuario),
+    ("juegos", Juego),
+    ("compras", Compra),
+    ("reseñas", Reseña),
+    ("eventos", Evento),
+    ("bitacora_actividad", BitacoraActividad)
+]
+
+# Exportación en paralelo: cada tabla (o rango de claves de una tabla grande)
+# se exporta en su propio proceso con su propia conexión. Son procesos y no
+# hilos porque el trabajo es armar las filas CSV en Python y los hilos se
+# turnarían el GIL. A los procesos se les pasan nombres de tabla y rangos de
+# claves (no expresiones de SQLAlchemy) y cada uno crea su propio engine.
+MAX_TRABAJADORES_EXPORTACION = 8
+FRAGMENTOS_EXPORTACION = {
+    "compras": 4,
+    "bitacora_actividad": 4
+}
+
+@contextmanager
+def snapshot_exportacion():
+    # En PostgreSQL se abre una transacción REPEATABLE READ y se exporta su
+    # snapshot para que todos los procesos lean exactamente los mismos datos.
+    # La transacción debe seguir abierta hasta que terminen los procesos.
+    with obtener_engine().connect() as conexion:
+        if obtener_engine().dialect.name != "postgresql":
+            yield conexion, None
+            return
+        conexion = conexion.execution_options(isolation_level="REPEATABLE READ")
+        snapshot_id = conexion.execute(text("SELECT pg_export_snapshot()")).scalar()
+        yield conexion, snapshot_id
+
+def rangos_clave(conexion, tabla, fragmentos):
+    pk = list(tabla.primary_key.columns)
+    if len(pk) != 1 or fragmentos < 2:
+        return [None]
+    pk = pk[0]
+    minimo, maximo = conexion.execute(select(func.min(pk), func.max(pk))).one()
+    if minimo is None:
+        return [None]
+    paso = (maximo - minimo + 1) / fragmentos
+    limites = [minimo + int(i * paso) for i in range(fragmentos)] + [maximo + 1]
+    return [(limites[i], limites[i + 1]) for i in range(fragmentos) if limites[i] < limites[i + 1]]
+
+def _exportar_fragmento(nombre_tabla, filename, rango, encabezado, snapshot_id):
+    tabla = Base.metadata.tables[nombre_tabla]
+    condicion = None
+    if rango is not None:
+        pk = list(tabla.primary_key.columns)[0]
+        condicion = (pk >= rango[0]) & (pk < rango[1])
+    with obtener_engine().connect() as conexion:
+        if snapshot_id:
+            conexion = conexion.execution_options(isolation_level="REPEATABLE READ")
+            conexion.execute(text(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'"))
+        return exportar_tabla_csv(conexion, tabla, filename, condicion=condicion, encabezado=encabezado)
+
+def unir_fragmentos_csv(tabla, filename, partes, stats_partes):
+    stats_partes = [stats for stats in stats_partes if stats]
+    if not stats_partes:
+        return None
+    with open(filename, "w", newline='', encoding="utf-8") as f:
+        csv.writer(f).writerow([col.name for col in tabla.columns])
+        for parte in partes:
+            if os.path.exists(parte):
+                with open(parte, newline='', encoding="utf-8") as p:
+                    shutil.copyfileobj(p, f)
+                os.remove(parte)
+    filas = sum(stats["filas"] for stats in stats_partes)
+    duracion = max(stats["segundos"] for stats in stats_partes)
+    # Cada fragmento se exporta en su proceso: el pico es el del fragmento que más usó
+    picos = [stats["memoria_pico_mb"] for stats in stats_partes if stats["memoria_pico_mb"] is not None]
+    return {
+        "archivo": filename,
+        "filas": filas,
+        "segundos": duracion,
+        "filas_por_segundo": filas / duracion if duracion > 0 else float(filas),
+        "memoria_pico_mb": max(picos) if picos else None
+    }
+
+def exportar_datos_csv_paralelo(tablas=TABLAS_EXPORTACION, fragmentos=None, max_trabajadores=MAX_TRABAJADORES_EXPORTACION):
+    # Más procesos que CPUs no acelera nada; con una sola CPU se exporta tabla
+    # por tabla en un hilo, sin fragmentos que unir después
+    max_trabajadores = min(max_trabajadores, os.cpu_count() or 1)
+    fragmentos = (fragmentos or {}) if max_trabajadores > 1 else {}
+    resultados = []
+    with snapshot_exportacion() as (conexion, snapshot_id):
+        tareas = []
+        for nombre, modelo in tablas:
+            tabla = modelo.__table__
+            filename = f"{nombre}.csv"
+            rangos = rangos_clave(conexion, tabla, fragmentos.get(nombre, 1))
+            if len(rangos) == 1:
+                tareas.append((tabla, filename, [(filename, rangos[0], True)]))
+            else:
+                partes = [(f"{filename}.parte{i}", rango, False) for i, rango in enumerate(rangos)]
+                tareas.append((tabla, filename, partes))
+        trabajadores = min(max_trabajadores, sum(len(partes) for _, _, partes in tareas)) or 1
+        url = obtener_engine().url.render_as_string(hide_password=False)
+        if trabajadores > 1:
+            ejecutor = ProcessPoolExecutor(max_workers=trabajadores, initializer=usar_engine_propio, initargs=(url,))
+        else:
+            ejecutor = ThreadPoolExecutor(max_workers=1)
+        try:
+            with ejecutor as pool:
+                futuros = [
+                    (tabla, filename, partes, [pool.submit(_exportar_fragmento, tabla.name, parte, rango, encabezado, snapshot_id)
+                                               for parte, rango, encabezado in partes])
+                    for tabla, filename, partes in tareas
+                ]
+                for tabla, filename, partes, futuros_partes in futuros:
+                    stats_partes = [futuro.result() for futuro in futuros_partes]
+                    if len(partes) == 1:
+                        stats = stats_partes[0]
+                    else:
+                        stats = unir_fragmentos_csv(tabla, filename, [parte for parte, _, _ in partes], stats_partes)
+                    if stats:
+                        resultados.append(stats)
+        finally:
+            # Si un proceso falló quedan fragmentos sin unir; el pool ya esperó a los demás
+            for _, _, partes in tareas:
+                for parte, _, encabezado in partes:
+                    if not encabezado and os.path.exists(parte):
+                        os.remove(parte)
+    return resultados
@@ -0,0 +1,98 @@
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from typing import AsyncIterator, Optional, List
+import asyncio
+import os
+
+from modelos import DATABASE_URL, Usuario, Juego, Evento
+from servicios import (
+    ErrorServicio, FiltrosVentas, FiltrosResenas, FiltrosActividad, FilaResumenVentas, TAMANO_LOTE_REPORTE,
+    TAMANO_PAGINA, ORDEN_USUARIOS, ORDEN_JUEGOS, ORDEN_EVENTOS, opciones_carga, ordenar_pagina, cortar_pagina,
+    consulta_ventas, consulta_resenas, consulta_actividad, consulta_calificaciones, leer_resumen_ventas
+)
+
+# Variantes asíncronas (asyncio) de los reportes y listados, para servir
+# varios tableros a la vez desde un solo proceso. Usan las mismas consultas
+# que servicios.py sobre un engine async (asyncpg / aiosqlite). Cada función
+# abre su propia sesión, así que se pueden lanzar juntas con asyncio.gather.
+
+# Driver asíncrono para cada base; DATABASE_URL_ASYNC permite elegir otro
+DRIVERS_ASYNC = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+def url_async(url=DATABASE_URL):
+    url = make_url(url)
+    driver = DRIVERS_ASYNC.get(url.get_backend_name())
+    if driver is None:
+        raise ErrorServicio(f"No hay driver asíncrono configurado para {url.get_backend_name()}.")
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}")
+
+_engine_async = None
+
+def obtener_engine_async():
+    global _engine_async
+    if _engine_async is None:
+        _engine_async = create_async_engine(os.environ.get("DATABASE_URL_ASYNC") or url_async())
+    return _engine_async
+
+SesionAsync = async_sessionmaker(expire_on_commit=False)
+
+def sesion_async():
+    return SesionAsync(bind=obtener_engine_async())
+
+# === LISTADOS ===
+async def _pagina(modelo, listado, orden, despues_de, tamano):
+    query = ordenar_pagina(select(modelo).options(*opciones_carga(listado)), orden, despues_de, tamano)
+    async with sesion_async() as sesion:
+        registros = (await sesion.execute(query)).scalars().all()
+    return cortar_pagina(registros, orden, tamano)
+
+async def pagina_usuarios_async(despues_de=None, tamano=TAMANO_PAGINA):
+    return await _pagina(Usuario, "listar_usuarios", ORDEN_USUARIOS, despues_de, tamano)
+
+async def pagina_juegos_async(despues_de=None, tamano=TAMANO_PAGINA):
+    return await _pagina(Juego, "listar_juegos", ORDEN_JUEGOS, despues_de, tamano)
+
+async def pagina_eventos_async(despues_de=None, tamano=TAMANO_PAGINA):
+    return await _pagina(Evento, "listar_eventos", ORDEN_EVENTOS, despues_de, tamano)
+
+# === REPORTES ===
+async def _recorrer(query) -> AsyncIterator:
+    async with sesion_async() as sesion:
+        resultado = await sesion.stream(query.execution_options(yield_per=TAMANO_LOTE_REPORTE))
+        async for fila in resultado:
+            yield fila
+
+def ventas_async(filtros: Optional[FiltrosVentas] = None) -> AsyncIterator:
+    return _recorrer(consulta_ventas(filtros))
+
+def resenas_async(filtros: Optional[FiltrosResenas] = None) -> AsyncIterator:
+    return _recorrer(consulta_resenas(filtros))
+
+def actividad_async(filtros: Optional[FiltrosActividad] = None) -> AsyncIterator:
+    return _recorrer(consulta_actividad(filtros))
+
+async def resumen_ventas_async(filtros: Optional[FiltrosVentas] = None, agrupar_por: Optional[str] = None) -> List[FilaResumenVentas]:
+    async with obtener_engine_async().connect() as conexion:
+        if conexion.dialect.name == "postgresql":
+            await conexion.execution_options(isolation_level="REPEATABLE READ")
+        async with conexion.begin():
+            return await conexion.run_sync(leer_resumen_ventas, filtros, agrupar_por)
+
+async def calificaciones_async(filtros: Optional[FiltrosResenas] = None):
+    async with sesion_async() as sesion:
+        return (await sesion.execute(consulta_calificaciones(filtros))).one()
+
+async def tablero_async(filtros_ventas: Optional[FiltrosVentas] = None, filtros_resenas: Optional[FiltrosResenas] = None) -> dict:
+    # Las consultas independientes del tablero corren en paralelo, cada una con su conexión
+    total, por_metodo, calificaciones = await asyncio.gather(
+        resumen_ventas_async(filtros_ventas),
+        resumen_ventas_async(filtros_ventas, agrupar_por="metodo"),
+        calificaciones_async(filtros_resenas)
+    )
+    return {
+        "ventas": total[0] if total else None,
+        "ventas_por_metodo": por_metodo,
+        "resenas": calificaciones.cantidad,
+        "calificacion_promedio": calificaciones.promedio
+    }
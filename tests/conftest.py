@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import modelos
+import servicios
+
+# Cada prueba usa su propia base SQLite con el esquema de crear_esquema()
+@pytest.fixture
+def base_datos(tmp_path, monkeypatch):
+    monkeypatch.setattr(modelos, "DATABASE_URL", f"sqlite:///{tmp_path / 'prueba.db'}")
+    monkeypatch.setattr(modelos, "_engine", None)
+    for cache in (servicios.CACHE_REFERENCIA, servicios.CACHE_CALIFICACIONES, servicios.CACHE_CLASIFICACIONES):
+        cache.limpiar()
+    modelos.crear_esquema()
+    yield modelos.obtener_engine()
+    modelos.liberar_sesion()
+    modelos.obtener_engine().dispose()
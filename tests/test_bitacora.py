@@ -0,0 +1,52 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from modelos import Usuario, BitacoraActividad, RolUsuario
+from servicios import FiltrosActividad, actividad, aplicar_retencion_bitacora
+
+HOY = datetime.combine(date.today(), datetime.min.time())
+
+@pytest.fixture
+def bitacora(base_datos):
+    with base_datos.begin() as conexion:
+        conexion.execute(Usuario.__table__.insert(), [
+            {"id_usuario": 1, "nombre": "Ana", "correo": "ana@x", "contraseña": "x", "rol_usuario": RolUsuario.JUGADOR}
+        ])
+        conexion.execute(BitacoraActividad.__table__.insert(), [
+            {"id_usuario": 1, "tipo_actividad": "Login", "descripcion": descripcion, "fecha": fecha}
+            for descripcion, fecha in [("vieja", HOY - timedelta(days=800)), ("sin fecha", None),
+                                       ("hoy", HOY + timedelta(hours=23, minutes=59)), ("ayer", HOY - timedelta(hours=1))]
+        ])
+    return base_datos
+
+def _descripciones(engine):
+    with engine.connect() as conexion:
+        return sorted(conexion.execute(select(BitacoraActividad.descripcion)).scalars())
+
+def test_fecha_fin_incluye_el_dia_completo(bitacora):
+    filas = list(actividad(FiltrosActividad(fecha_inicio=HOY, fecha_fin=HOY)))
+    assert [fila.descripcion for fila in filas] == ["hoy"]
+
+def test_retencion_conserva_la_actividad_sin_fecha(bitacora, tmp_path):
+    assert aplicar_retencion_bitacora(12, str(tmp_path))
+    assert _descripciones(bitacora) == ["ayer", "hoy", "sin fecha"]
+    archivo = next(tmp_path.iterdir()).read_text(encoding="utf-8")
+    assert "vieja" in archivo and "sin fecha" not in archivo
+    aplicar_retencion_bitacora(12, purgar_sin_fecha=True)
+    assert _descripciones(bitacora) == ["ayer", "hoy"]
+
+def test_actividad_cierra_el_cursor_si_se_corta(bitacora, monkeypatch):
+    import servicios
+    resultados = []
+    ejecutar = servicios.session.execute
+    def espiar(*args, **kwargs):
+        resultados.append(ejecutar(*args, **kwargs))
+        return resultados[-1]
+    monkeypatch.setattr(servicios.session, "execute", espiar)
+    filas = actividad()
+    next(filas)
+    assert not resultados[0].closed
+    filas.close()
+    assert resultados[0].closed
@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+import servicios
+from modelos import Usuario, Juego, Evento, Comentario, VersionJuego, RolUsuario
+from tipos import EstadoJuego
+
+@pytest.fixture
+def contenido(base_datos):
+    # Los mismos ids en cada tabla, para que el rowid de la fuente sea el que las separa
+    with base_datos.begin() as conexion:
+        conexion.execute(Usuario.__table__.insert(), [
+            {"id_usuario": 1, "nombre": "Ana", "correo": "ana@x", "contraseña": "x", "rol_usuario": RolUsuario.DESARROLLADOR}
+        ])
+        conexion.execute(Juego.__table__.insert(), [
+            {"id_juego": 1, "nombre": "Estrategia espacial", "descripcion": "Conquista la galaxia", "precio": 10,
+             "estado_juego": EstadoJuego.LANZADO, "id_desarrollador": 1},
+            {"id_juego": 2, "nombre": "Carreras", "descripcion": "Acción sobre ruedas", "precio": 10,
+             "estado_juego": EstadoJuego.LANZADO, "id_desarrollador": 1},
+        ])
+        conexion.execute(Evento.__table__.insert(), [{"id_evento": 1, "titulo": "Torneo", "descripcion": "De estrategia"}])
+        conexion.execute(Comentario.__table__.insert(), [
+            {"id_comentario": 1, "id_usuario": 1, "contenido": "Me encantó la estrategia", "fecha": datetime(2024, 1, 1)}
+        ])
+        conexion.execute(VersionJuego.__table__.insert(), [
+            {"id_version": 1, "id_juego": 1, "numero_version": "1.1", "notas_cambios": "Equilibra la estrategia"}
+        ])
+    return base_datos
+
+def _encontrados(texto, tipos=None):
+    return sorted((resultado.tipo, resultado.id) for resultado in servicios.buscar(texto, tipos))
+
+def _indice(engine):
+    with engine.connect() as conexion:
+        return conexion.execute(text("SELECT rowid, titulo, texto FROM busqueda ORDER BY rowid")).all()
+
+def _coincide_con_reconstruccion(engine):
+    incremental = _indice(engine)
+    servicios.reconstruir_busqueda()
+    assert _indice(engine) == incremental
+
+def test_busqueda_por_prefijo_y_sin_tildes(contenido):
+    assert _encontrados("estra") == [("comentario", 1), ("evento", 1), ("juego", 1), ("version", 1)]
+    assert _encontrados("estra", ["juego", "evento"]) == [("evento", 1), ("juego", 1)]
+    assert _encontrados("ACCION") == [("juego", 2)]
+    assert _encontrados("estrategia galaxia") == [("juego", 1)]
+    # El título pesa más que el texto
+    assert servicios.buscar("estrategia", ["juego", "evento"])[0].tipo == "juego"
+    assert servicios.buscar("  ") == []
+    with pytest.raises(servicios.ErrorServicio):
+        servicios.buscar("estrategia", ["tienda"])
+    _coincide_con_reconstruccion(contenido)
+
+def test_triggers_mantienen_el_indice(contenido):
+    with contenido.begin() as conexion:
+        conexion.execute(Juego.__table__.update().where(Juego.id_juego == 1).values(nombre="Táctica espacial"))
+        conexion.execute(Evento.__table__.delete().where(Evento.id_evento == 1))
+        conexion.execute(Comentario.__table__.update().where(Comentario.id_comentario == 1).values(contenido="Muy lento"))
+        conexion.execute(Evento.__table__.insert(), [{"id_evento": 2, "titulo": "Liga de táctica", "descripcion": None}])
+    assert _encontrados("estra") == [("version", 1)]
+    assert _encontrados("tactica") == [("evento", 2), ("juego", 1)]
+    assert _encontrados("lento") == [("comentario", 1)]
+    assert _encontrados("torneo") == []
+    _coincide_con_reconstruccion(contenido)
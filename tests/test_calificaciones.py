@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import select
+
+import servicios
+from modelos import Usuario, Juego, Reseña, CalificacionJuego, RolUsuario
+from tipos import EstadoJuego
+
+@pytest.fixture
+def juegos(base_datos):
+    with base_datos.begin() as conexion:
+        conexion.execute(Usuario.__table__.insert(), [
+            {"id_usuario": 1, "nombre": "Ana", "correo": "ana@x", "contraseña": "x", "rol_usuario": RolUsuario.DESARROLLADOR}
+        ])
+        conexion.execute(Juego.__table__.insert(), [
+            {"id_juego": i, "nombre": f"Juego {i}", "precio": 10, "estado_juego": EstadoJuego.LANZADO, "id_desarrollador": 1}
+            for i in (1, 2)
+        ])
+    return base_datos
+
+def _agregado(engine):
+    # Los juegos que se quedan sin reseñas conservan su fila en cero
+    with engine.connect() as conexion:
+        return {fila.id_juego: tuple(fila)[1:] for fila in conexion.execute(
+            select(CalificacionJuego.__table__).where(CalificacionJuego.cantidad > 0)
+        )}
+
+def _coincide_con_reconstruccion(engine):
+    incremental = _agregado(engine)
+    servicios.reconstruir_calificaciones()
+    assert _agregado(engine) == incremental
+    return incremental
+
+def test_triggers_mantienen_el_agregado(juegos):
+    tabla = Reseña.__table__
+    with juegos.begin() as conexion:
+        conexion.execute(tabla.insert(), [
+            {"id_reseña": i, "id_usuario": 1, "id_juego": juego, "calificacion": calificacion}
+            for i, (juego, calificacion) in enumerate([(1, 5), (1, 3), (1, None), (2, 4), (None, 2), (2, 0)], 1)
+        ])
+    assert _coincide_con_reconstruccion(juegos) == {1: (2, 8, 0, 0, 1, 0, 1), 2: (1, 4, 0, 0, 0, 1, 0)}
+    with juegos.begin() as conexion:
+        # Cambio de estrellas, paso a otro juego, fuera de rango y de vuelta al rango
+        conexion.execute(tabla.update().where(tabla.c.id_reseña == 1).values(calificacion=1))
+        conexion.execute(tabla.update().where(tabla.c.id_reseña == 2).values(id_juego=2))
+        conexion.execute(tabla.update().where(tabla.c.id_reseña == 4).values(calificacion=7))
+        conexion.execute(tabla.update().where(tabla.c.id_reseña == 3).values(calificacion=2))
+        conexion.execute(tabla.update().where(tabla.c.id_reseña == 5).values(id_juego=1))
+    assert _coincide_con_reconstruccion(juegos) == {1: (3, 5, 1, 2, 0, 0, 0), 2: (1, 3, 0, 0, 1, 0, 0)}
+    with juegos.begin() as conexion:
+        conexion.execute(tabla.delete().where(tabla.c.id_reseña.in_([2, 4])))
+        conexion.execute(tabla.update().where(tabla.c.id_reseña == 1).values(id_juego=None))
+    assert _coincide_con_reconstruccion(juegos) == {1: (2, 4, 0, 2, 0, 0, 0)}
+
+def test_calificacion_juego_lee_el_agregado(juegos):
+    with juegos.begin() as conexion:
+        conexion.execute(Reseña.__table__.insert(), [
+            {"id_usuario": 1, "id_juego": 1, "calificacion": calificacion} for calificacion in (5, 4, 4)
+        ])
+    calificacion = servicios.calificacion_juego(1)
+    assert (calificacion.cantidad, calificacion.histograma, calificacion.promedio) == (3, [0, 0, 0, 2, 1], 13 / 3)
+    assert servicios.calificacion_juego(2) is None
+    assert servicios.calificaciones_juegos([1, 2, 3]).keys() == {1}
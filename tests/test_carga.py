@@ -0,0 +1,72 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import DBAPIError
+
+import servicios
+from modelos import Usuario, Juego, Compra, RolUsuario, MetodoPago
+from tipos import EstadoJuego
+
+@pytest.fixture
+def catalogo(base_datos):
+    with base_datos.begin() as conexion:
+        conexion.execute(Usuario.__table__.insert(), [
+            {"id_usuario": 1, "nombre": "Ana", "correo": "ana@x", "contraseña": "x", "rol_usuario": RolUsuario.DESARROLLADOR}
+        ])
+        conexion.execute(Juego.__table__.insert(), [
+            {"id_juego": 1, "nombre": "Juego", "precio": 10, "estado_juego": EstadoJuego.LANZADO, "id_desarrollador": 1}
+        ])
+    return base_datos
+
+def _compras(n, cambios=None):
+    return [dict({"id_usuario": 1, "id_juego": 1, "fecha_compra": datetime(2024, 1, 1, i), "monto_pagado": Decimal("9.99"),
+                  "metodo_pago": "PAYPAL"}, **(cambios or {}).get(i, {}))
+            for i in range(n)]
+
+def _contar(engine, modelo):
+    with engine.connect() as conexion:
+        return conexion.execute(select(func.count()).select_from(modelo)).scalar()
+
+def test_ingerir_compras_sin_copy_respeta_el_tamano_de_lote(catalogo):
+    inserts = []
+
+    @event.listens_for(catalogo, "before_execute")
+    def contar_filas(conexion, sentencia, multiparams, params, opciones):
+        if getattr(sentencia, "table", None) is Compra.__table__:
+            inserts.append(len(multiparams) or 1)
+
+    assert servicios.ingerir_compras(_compras(7), tamano_lote=3) == 7
+    assert inserts == [3, 3, 1]
+    assert _contar(catalogo, Compra) == 7
+
+def test_lote_fallido_solo_deshace_ese_lote(catalogo):
+    # La fila 3 no se puede guardar: cae el segundo lote, el primero ya quedó confirmado
+    with pytest.raises(DBAPIError):
+        servicios.ingerir_compras(_compras(6, {3: {"id_usuario": [1]}}), tamano_lote=2)
+    assert _contar(catalogo, Compra) == 2
+
+class _CursorCopy:
+    def __init__(self):
+        self.copias = []
+
+    def copy_expert(self, sql, flujo):
+        # Lee en trozos chicos, como psycopg2
+        partes = iter(lambda: flujo.read(5), "")
+        self.copias.append((sql, "".join(partes)))
+
+    def close(self):
+        pass
+
+def test_cargar_copy_un_copy_por_lote(base_datos):
+    cursor = _CursorCopy()
+    with base_datos.connect() as conexion:
+        conexion.connection.cursor = lambda: cursor
+        filas = [(1, "a\tb", None, MetodoPago.PAYPAL), (2, "c\nd\\", Decimal("1.5"), None), (3, "e", 0, None)]
+        assert servicios.cargar_copy(conexion, Compra.__table__, ["id_usuario", "x", "y", "metodo_pago"], filas, 2) == 3
+    assert [sql for sql, _ in cursor.copias] == ['COPY compra (id_usuario, x, y, metodo_pago) FROM STDIN'] * 2
+    assert [datos for _, datos in cursor.copias] == [
+        "1\ta\\tb\t\\N\tPAYPAL\n2\tc\\nd\\\\\t1.5\t\\N\n",
+        "3\te\t0\t\\N\n",
+    ]
@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy import select
+
+import servicios
+from clasificacion import ArbolPuntajes
+from modelos import Usuario, Juego, Logro, ProgresoUsuarioLogro, PuntosJugador, RolUsuario
+from tipos import EstadoJuego
+
+def test_posiciones_y_percentil():
+    arbol = ArbolPuntajes({0: 1, 10: 2, 25: 1})
+    assert arbol.posicion(25) == 1
+    assert arbol.posicion(10) == 2
+    assert arbol.posicion(0) == 4
+    assert arbol.puntaje_en_posicion(3) == 10
+    assert arbol.percentil(10) == 75
+
+def test_rechaza_puntaje_negativo():
+    with pytest.raises(ValueError):
+        ArbolPuntajes({-1: 1})
+    arbol = ArbolPuntajes({5: 1})
+    with pytest.raises(ValueError):
+        arbol.agregar(-3)
+    assert arbol.total == 1
+
+@pytest.fixture
+def logros(base_datos):
+    with base_datos.begin() as conexion:
+        conexion.execute(Usuario.__table__.insert(), [
+            {"id_usuario": i, "nombre": f"U{i}", "correo": f"u{i}@x", "contraseña": "x", "rol_usuario": RolUsuario.JUGADOR}
+            for i in (1, 2, 3)
+        ])
+        conexion.execute(Juego.__table__.insert(), [
+            {"id_juego": i, "nombre": f"Juego {i}", "precio": 10, "estado_juego": EstadoJuego.LANZADO, "id_desarrollador": 1}
+            for i in (1, 2)
+        ])
+        conexion.execute(Logro.__table__.insert(), [
+            {"id_logro": 1, "id_juego": 1, "puntos": 10}, {"id_logro": 2, "id_juego": 1, "puntos": 5},
+            {"id_logro": 3, "id_juego": 2, "puntos": None}, {"id_logro": 4, "id_juego": None, "puntos": 7},
+        ])
+    return base_datos
+
+def _puntos(engine):
+    with engine.connect() as conexion:
+        return {(fila.id_juego, fila.id_usuario): (fila.puntos, fila.logros)
+                for fila in conexion.execute(select(PuntosJugador.__table__))}
+
+def _coincide_con_reconstruccion(engine):
+    incremental = _puntos(engine)
+    servicios.reconstruir_clasificaciones()
+    assert _puntos(engine) == incremental
+    return incremental
+
+def test_triggers_mantienen_los_puntos(logros):
+    tabla = ProgresoUsuarioLogro.__table__
+    with logros.begin() as conexion:
+        conexion.execute(tabla.insert(), [
+            {"id_usuario": usuario, "id_logro": logro} for usuario, logro in [(1, 1), (1, 2), (1, 3), (2, 1), (2, 4)]
+        ])
+    assert _coincide_con_reconstruccion(logros) == {
+        (0, 1): (15, 3), (1, 1): (15, 2), (2, 1): (0, 1), (0, 2): (17, 2), (1, 2): (10, 1)
+    }
+    with logros.begin() as conexion:
+        # Otro logro del mismo jugador, a otro jugador y a un logro sin juego; después, borrados
+        conexion.execute(tabla.update().where(tabla.c.id_usuario == 1, tabla.c.id_logro == 2).values(id_logro=4))
+        conexion.execute(tabla.update().where(tabla.c.id_usuario == 1, tabla.c.id_logro == 3).values(id_usuario=3))
+        conexion.execute(tabla.delete().where(tabla.c.id_usuario == 2, tabla.c.id_logro == 1))
+    assert _coincide_con_reconstruccion(logros) == {
+        (0, 1): (17, 2), (1, 1): (10, 1), (0, 2): (7, 1), (0, 3): (0, 1), (2, 3): (0, 1)
+    }
+    with logros.begin() as conexion:
+        conexion.execute(tabla.delete().where(tabla.c.id_usuario.in_([2, 3])))
+    # Sin logros, el jugador sale de la clasificación
+    assert _coincide_con_reconstruccion(logros) == {(0, 1): (17, 2), (1, 1): (10, 1)}
+    assert [fila.id_usuario for fila in servicios.top_clasificacion()] == [1]
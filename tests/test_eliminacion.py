@@ -0,0 +1,52 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+import servicios
+from modelos import Usuario, PerfilUsuario, Juego, Compra, Reseña, RolUsuario
+from tipos import EstadoJuego
+
+@pytest.fixture
+def usuarios(base_datos):
+    # 1 tiene una compra, 2 una reseña, 3 solo su perfil, 4 nada, 5 desarrolla el juego
+    with base_datos.begin() as conexion:
+        conexion.execute(Usuario.__table__.insert(), [
+            {"id_usuario": i, "nombre": f"U{i}", "correo": f"u{i}@x", "contraseña": "x", "rol_usuario": RolUsuario.JUGADOR}
+            for i in range(1, 6)
+        ])
+        conexion.execute(Juego.__table__.insert(), [
+            {"id_juego": 1, "nombre": "Juego", "precio": 10, "estado_juego": EstadoJuego.LANZADO, "id_desarrollador": 5}
+        ])
+        conexion.execute(Compra.__table__.insert(), [
+            {"id_usuario": 1, "id_juego": 1, "fecha_compra": datetime(2024, 1, 1), "monto_pagado": Decimal("10")}
+        ])
+        conexion.execute(Reseña.__table__.insert(), [{"id_usuario": 2, "id_juego": 1, "calificacion": 4}])
+        conexion.execute(PerfilUsuario.__table__.insert(), [{"id_usuario": 3, "pais": "Chile"}])
+    return base_datos
+
+def _ids(engine, columna):
+    with engine.connect() as conexion:
+        return sorted(conexion.execute(select(columna)).scalars())
+
+def test_eliminar_sin_dependientes(usuarios, monkeypatch):
+    # Lotes de 2 para que la revisión y el borrado pasen por varios lotes
+    monkeypatch.setattr(servicios, "TAMANO_LOTE_DEPENDENCIAS", 2)
+    eliminados, bloqueados = servicios.eliminar_sin_dependientes(Usuario, [1, 2, 3, 4, 5, 99, 4])
+    assert sorted(eliminados) == [3, 4]
+    assert bloqueados == {1: ["compras"], 2: ["reseñas"], 5: ["juegos_desarrollados"]}
+    assert _ids(usuarios, Usuario.id_usuario) == [1, 2, 5]
+    assert _ids(usuarios, PerfilUsuario.id_usuario) == []
+
+@pytest.mark.parametrize("usuario_id, relacion", [(1, "compras"), (2, "reseñas")])
+def test_eliminar_usuario_con_dependientes_se_rechaza(usuarios, usuario_id, relacion):
+    with pytest.raises(servicios.ErrorServicio, match=f"registros asociados \\({relacion}\\)"):
+        servicios.eliminar_usuario(usuario_id)
+    assert usuario_id in _ids(usuarios, Usuario.id_usuario)
+
+def test_eliminar_usuario_sin_dependientes(usuarios):
+    servicios.eliminar_usuario(4)
+    assert 4 not in _ids(usuarios, Usuario.id_usuario)
+    with pytest.raises(servicios.ErrorServicio, match="no encontrado"):
+        servicios.eliminar_usuario(4)
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+import csv
+import os
+
+import pytest
+
+from modelos import Usuario, Juego, Compra, BitacoraActividad, RolUsuario, MetodoPago
+from tipos import EstadoJuego
+from servicios import exportar_datos_csv_paralelo, exportar_tabla_csv, exportar_ventas_csv, TABLAS_EXPORTACION
+
+def _sembrar(engine):
+    with engine.begin() as conexion:
+        conexion.execute(Usuario.__table__.insert(), [
+            {"nombre": f"Usuario, {i}", "correo": f"u{i}@x", "contraseña": "x", "rol_usuario": RolUsuario.DESARROLLADOR}
+            for i in range(1, 6)
+        ])
+        conexion.execute(Juego.__table__.insert(), [
+            {"nombre": f'Juego "{i}"\nsegunda línea', "precio": 10, "estado_juego": EstadoJuego.LANZADO, "id_desarrollador": 1}
+            for i in range(1, 4)
+        ])
+        conexion.execute(Compra.__table__.insert(), [
+            {"id_usuario": 1 + i % 5, "id_juego": 1 + i % 3, "fecha_compra": datetime(2024, 1, 1) + timedelta(hours=i),
+             "monto_pagado": Decimal("9.99"), "metodo_pago": None if i % 7 == 0 else MetodoPago.PAYPAL}
+            for i in range(250)
+        ])
+    with engine.begin() as conexion:
+        # Los triggers de compra ya llenaron la bitácora; se agregan filas sin fecha
+        conexion.execute(BitacoraActividad.__table__.insert(), [
+            {"id_usuario": 1, "tipo_actividad": "Compra", "descripcion": "sin fecha", "fecha": None}
+        ])
+
+@pytest.mark.parametrize("cpus", [1, 4])
+def test_exportacion_paralela_igual_a_secuencial(base_datos, tmp_path, monkeypatch, cpus):
+    # Con varias CPUs las tablas y los fragmentos van a procesos; con una, a un solo hilo
+    monkeypatch.setattr(os, "cpu_count", lambda: cpus)
+    _sembrar(base_datos)
+    secuencial = tmp_path / "secuencial"
+    secuencial.mkdir()
+    with base_datos.connect() as conexion:
+        for nombre, modelo in TABLAS_EXPORTACION:
+            exportar_tabla_csv(conexion, modelo.__table__, str(secuencial / f"{nombre}.csv"))
+    paralelo = tmp_path / "paralelo"
+    paralelo.mkdir()
+    monkeypatch.chdir(paralelo)
+    stats = exportar_datos_csv_paralelo(fragmentos={"compras": 4, "bitacora_actividad": 3}, max_trabajadores=3)
+    assert {s["archivo"]: s["filas"] for s in stats}["compras.csv"] == 250
+    assert sorted(p.name for p in paralelo.iterdir()) == sorted(p.name for p in secuencial.iterdir())
+    for archivo in secuencial.iterdir():
+        assert (paralelo / archivo.name).read_bytes() == archivo.read_bytes(), archivo.name
+
+def test_exportar_tabla_csv_por_lotes(base_datos, tmp_path):
+    _sembrar(base_datos)
+    archivo = tmp_path / "compras.csv"
+    with base_datos.connect() as conexion:
+        stats = exportar_tabla_csv(conexion, Compra.__table__, str(archivo), tamano_lote=7)
+        # Un lote grande y después una tabla chica: el pico es el de cada exportación
+        grande = exportar_tabla_csv(conexion, Compra.__table__, str(tmp_path / "todo.csv"), tamano_lote=250)
+        chica = exportar_tabla_csv(conexion, Juego.__table__, str(tmp_path / "juegos.csv"))
+    with open(archivo, newline='', encoding="utf-8") as f:
+        filas = list(csv.reader(f))
+    assert filas[0] == [columna.name for columna in Compra.__table__.columns]
+    assert len(filas) - 1 == stats["filas"] == 250
+    assert [int(fila[0]) for fila in filas[1:]] == list(range(1, 251))
+    assert 0 < chica["memoria_pico_mb"] < grande["memoria_pico_mb"]
+
+def test_exportar_ventas_sin_metodo_de_pago(base_datos, tmp_path):
+    _sembrar(base_datos)
+    stats = exportar_ventas_csv(str(tmp_path / "ventas.csv"))
+    with open(tmp_path / "ventas.csv", newline='', encoding="utf-8") as f:
+        filas = list(csv.DictReader(f))
+    assert stats["filas"] == len(filas) == 250
+    assert sum(1 for fila in filas if fila["Método Pago"] == "") == len(range(0, 250, 7))
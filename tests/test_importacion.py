@@ -0,0 +1,69 @@
+import csv
+import json
+
+import pytest
+from sqlalchemy import select
+
+import servicios
+from modelos import Usuario, PerfilUsuario, RolUsuario
+
+COLUMNAS = ["nombre", "correo", "contraseña", "rol_usuario", "pais", "fecha_nacimiento"]
+
+@pytest.fixture
+def existente(base_datos):
+    with base_datos.begin() as conexion:
+        conexion.execute(Usuario.__table__.insert(), [
+            {"nombre": "Ana", "correo": "ana@x", "contraseña": "x", "rol_usuario": RolUsuario.JUGADOR}
+        ])
+    return base_datos
+
+def _escribir_csv(filename, filas):
+    with open(filename, "w", newline='', encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNAS)
+        writer.writerows(filas)
+
+def test_importar_usuarios_rechaza_repetidos_e_invalidos(existente, tmp_path):
+    archivo = tmp_path / "usuarios.csv"
+    _escribir_csv(archivo, [
+        ["Beto", "beto@x", "x", "jugador", "Chile", ""],
+        ["Otra Ana", "ana@x", "x", "JUGADOR", "", ""],
+        ["Beto 2", "beto@x", "x", "JUGADOR", "", ""],
+        ["Carla", "carla@x", "x", "ADMINX", "", ""],
+        ["Dani", "dani@x", "", "JUGADOR", "", ""],
+        ["Eva", "eva@x", "x", "JUGADOR", "", "31/12/1990"],
+        ["Fede", "fede@x", "x", "DESARROLLADOR", "Perú", "1990-12-31", "columna de más"],
+    ])
+    # Lotes de 3: los repetidos caen en el mismo lote y el resto en los siguientes
+    resultado = servicios.importar_usuarios_archivo(str(archivo), tamano_lote=3)
+    assert resultado == {"leidas": 7, "importadas": 2, "rechazadas": 5, "rechazos": str(tmp_path / "usuarios_rechazos.csv")}
+    with existente.connect() as conexion:
+        usuarios = dict(conexion.execute(select(Usuario.correo, Usuario.nombre)).all())
+        perfiles = conexion.execute(select(Usuario.correo, PerfilUsuario.pais)
+                                    .join(PerfilUsuario, PerfilUsuario.id_usuario == Usuario.id_usuario)
+                                    .order_by(Usuario.correo)).all()
+    assert usuarios == {"ana@x": "Ana", "beto@x": "Beto", "fede@x": "Fede"}
+    assert [tuple(fila) for fila in perfiles] == [("beto@x", "Chile"), ("fede@x", "Perú")]
+    with open(resultado["rechazos"], newline='', encoding="utf-8") as f:
+        rechazos = {fila["correo"]: fila["motivo"] for fila in csv.DictReader(f)}
+    assert rechazos == {
+        "ana@x": "correo ya registrado",
+        "beto@x": "correo repetido en el archivo",
+        "carla@x": "rol_usuario inválido: ADMINX",
+        "dani@x": "faltan columnas obligatorias: contraseña",
+        "eva@x": "fecha_nacimiento no es una fecha AAAA-MM-DD: 31/12/1990",
+    }
+
+def test_importar_usuarios_sin_rechazos_no_crea_archivo(base_datos, tmp_path):
+    archivo = tmp_path / "usuarios.jsonl"
+    archivo.write_text(json.dumps({"nombre": "Ana", "correo": "ana@x", "contraseña": "x", "rol_usuario": "JUGADOR"}) + "\n",
+                       encoding="utf-8")
+    resultado = servicios.importar_usuarios_archivo(str(archivo))
+    assert resultado == {"leidas": 1, "importadas": 1, "rechazadas": 0, "rechazos": None}
+    assert not (tmp_path / "usuarios_rechazos.jsonl").exists()
+
+def test_importar_jsonl_con_linea_mal_formada(base_datos, tmp_path):
+    archivo = tmp_path / "usuarios.jsonl"
+    archivo.write_text('{"nombre": "Ana"}\n{"nombre": \n', encoding="utf-8")
+    with pytest.raises(servicios.ErrorServicio, match="Línea 2"):
+        servicios.importar_usuarios_archivo(str(archivo))
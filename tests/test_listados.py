@@ -0,0 +1,104 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from modelos import Usuario, Juego, Evento, RolUsuario, liberar_sesion
+from tipos import EstadoJuego, TipoEvento
+from servicios import pagina_usuarios, pagina_juegos, pagina_eventos, paginar, ordenar_pagina, session, ORDEN_EVENTOS
+
+# Cada listado debe costar las mismas sentencias por página con pocas o
+# muchas filas: lo que se imprime por fila no puede disparar un SELECT (N+1)
+def _mostrar_usuario(usuario):
+    return (usuario.nombre, usuario.correo, usuario.rol_usuario, usuario.fecha_registro)
+
+def _mostrar_juego(juego):
+    return (juego.nombre, juego.desarrollador.nombre if juego.desarrollador else None, juego.precio, juego.estado_juego)
+
+def _mostrar_evento(evento):
+    return (evento.titulo, evento.fecha_inicio, evento.fecha_fin, evento.tipo_evento)
+
+LISTADOS = [
+    ("usuarios", pagina_usuarios, _mostrar_usuario),
+    ("juegos", pagina_juegos, _mostrar_juego),
+    ("eventos", pagina_eventos, _mostrar_evento),
+]
+
+def _sembrar(engine, desde, hasta):
+    # Cada juego con un desarrollador distinto, para que un lazy load se note
+    with engine.begin() as conexion:
+        conexion.execute(Usuario.__table__.insert(), [
+            {"id_usuario": i, "nombre": f"Usuario {i:05d}", "correo": f"u{i}@x", "contraseña": "x",
+             "rol_usuario": RolUsuario.DESARROLLADOR, "fecha_registro": date(2024, 1, 1)}
+            for i in range(desde, hasta)
+        ])
+        conexion.execute(Juego.__table__.insert(), [
+            {"id_juego": i, "nombre": f"Juego {i:05d}", "precio": 10, "estado_juego": EstadoJuego.LANZADO,
+             "id_desarrollador": i}
+            for i in range(desde, hasta)
+        ])
+        conexion.execute(Evento.__table__.insert(), [
+            {"id_evento": i, "titulo": f"Evento {i}", "fecha_inicio": date(2024, 1, 1) + timedelta(days=i),
+             "fecha_fin": date(2024, 1, 2) + timedelta(days=i), "tipo_evento": TipoEvento.TORNEO}
+            for i in range(desde, hasta)
+        ])
+
+def _sentencias_por_pagina(engine, pagina, mostrar, paginas=3):
+    # Sentencias para leer y mostrar las primeras páginas, con la sesión vacía
+    liberar_sesion()
+    contadas = []
+    contar = lambda *args: contadas.append(1)
+    event.listen(engine, "before_cursor_execute", contar)
+    try:
+        despues_de = None
+        for _ in range(paginas):
+            registros, despues_de = pagina(despues_de)
+            for registro in registros:
+                mostrar(registro)
+            if despues_de is None:
+                break
+    finally:
+        event.remove(engine, "before_cursor_execute", contar)
+    return len(contadas)
+
+@pytest.mark.parametrize("nombre, pagina, mostrar", LISTADOS, ids=[nombre for nombre, _, _ in LISTADOS])
+def test_sentencias_constantes_por_listado(base_datos, nombre, pagina, mostrar):
+    _sembrar(base_datos, 1, 101)
+    pocas = _sentencias_por_pagina(base_datos, pagina, mostrar)
+    _sembrar(base_datos, 101, 2001)
+    muchas = _sentencias_por_pagina(base_datos, pagina, mostrar)
+    assert pocas == muchas == 3  # una consulta por página
+
+@pytest.mark.parametrize("descendente", [True, False], ids=["desc", "asc"])
+@pytest.mark.parametrize("tamano", [1, 3, 7])
+def test_paginas_keyset_con_nulos(base_datos, descendente, tamano):
+    # Recorrer todas las páginas devuelve cada evento una vez y en el orden del
+    # listado, también cuando una página empieza, corta o termina en los NULL
+    with base_datos.begin() as conexion:
+        conexion.execute(Evento.__table__.insert(), [
+            {"id_evento": i, "titulo": f"Evento {i}", "tipo_evento": TipoEvento.TORNEO,
+             "fecha_inicio": None if i % 4 == 0 else date(2024, 1, 1) + timedelta(days=i % 5)}
+            for i in range(1, 24)
+        ])
+    orden = (Evento.fecha_inicio, Evento.id_evento, descendente)
+    vistos = []
+    despues_de = None
+    while True:
+        registros, despues_de = paginar(session.query(Evento), orden, despues_de, tamano)
+        assert len(registros) <= tamano
+        vistos.extend((evento.fecha_inicio, evento.id_evento) for evento in registros)
+        if despues_de is None:
+            break
+    # NULL como el valor más grande, igual que en PostgreSQL
+    clave = lambda fila: (fila[0] is None, fila[0] or date.min, fila[1])
+    esperado = sorted(vistos, key=clave, reverse=descendente)
+    assert len(vistos) == 23 and vistos == esperado
+
+@pytest.mark.parametrize("despues_de", [None, (None, 500), (date(2024, 3, 1), 500)], ids=["inicio", "nulos", "fecha"])
+def test_pagina_de_eventos_usa_rango_del_indice(base_datos, despues_de):
+    # Cada tramo se lee por rango del índice (SEARCH), no recorriéndolo entero (SCAN)
+    consulta = ordenar_pagina(session.query(Evento), ORDEN_EVENTOS, despues_de).statement
+    sql = str(consulta.compile(base_datos, compile_kwargs={"literal_binds": True}))
+    with base_datos.connect() as conexion:
+        plan = [fila[-1] for fila in conexion.exec_driver_sql("EXPLAIN QUERY PLAN " + sql)]
+    assert not [paso for paso in plan if paso.startswith("SCAN evento")], plan
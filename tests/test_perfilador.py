@@ -0,0 +1,22 @@
+import logging
+
+from sqlalchemy import text
+
+import perfilador
+
+def test_sentencias_lentas_no_registran_parametros_de_escritura(base_datos, caplog, monkeypatch):
+    monkeypatch.setattr(perfilador, "_umbral_ms", 0)
+    perfilador.activar()
+    try:
+        with caplog.at_level(logging.WARNING, logger="sql.lento"), base_datos.begin() as conexion:
+            conexion.execute(text("INSERT INTO usuario (nombre, correo, contraseña, rol_usuario) "
+                                  "VALUES (:nombre, :correo, :clave, 'JUGADOR')"),
+                             {"nombre": "ana", "correo": "ana@x.com", "clave": "secreta-123"})
+            conexion.execute(text("SELECT id_usuario FROM usuario WHERE correo = :correo"), {"correo": "ana@x.com"})
+    finally:
+        perfilador.desactivar()
+        perfilador.reiniciar()
+    registros = "\n".join(registro.getMessage() for registro in caplog.records)
+    assert "secreta-123" not in registros
+    assert "(omitidos)" in registros
+    assert "ana@x.com" in registros
@@ -0,0 +1,29 @@
+import servicios
+from tipos import RolUsuario
+
+def _agregar(nombre, correo, rol=RolUsuario.DESARROLLADOR):
+    return servicios.agregar_usuario({"nombre": nombre, "correo": correo, "contraseña": "x", "rol_usuario": rol})
+
+def test_sugerir_desarrolladores_igual_que_la_consulta(base_datos):
+    for nombre, correo in [("Beto", "zeta@x.com"), ("bruno", "b@x.com"), ("Ana", "beta@x.com"), ("Carla", "c@x.com")]:
+        _agregar(nombre, correo)
+    _agregar("Bea", "bea@x.com", RolUsuario.JUGADOR)
+    for prefijo in ("", "b", "BE", "c@", "z", "x"):
+        for limite in (1, 2, 10):
+            esperado = servicios.sugerir_usuarios(prefijo, limite, RolUsuario.DESARROLLADOR)
+            assert servicios.sugerir_desarrolladores(prefijo, limite) == esperado
+
+def test_sugerir_desarrolladores_con_mayusculas_no_ascii(base_datos):
+    # lower() de SQLite deja "É" como está: la lista en caché debe hacer lo mismo
+    for nombre, correo in [("Élan", "elan@x.com"), ("élise", "Élise@x.com"), ("Emilio", "emilio@x.com")]:
+        _agregar(nombre, correo)
+    for prefijo in ("É", "é", "e", "E", "él", "ÉL"):
+        esperado = servicios.sugerir_usuarios(prefijo, 10, RolUsuario.DESARROLLADOR)
+        assert servicios.sugerir_desarrolladores(prefijo) == esperado, prefijo
+    assert [fila.nombre for fila in servicios.sugerir_desarrolladores("É")] == ["Élan", "élise"]
+
+def test_alta_de_desarrollador_invalida_la_lista(base_datos):
+    _agregar("Ana", "ana@x.com")
+    assert [fila.nombre for fila in servicios.sugerir_desarrolladores("")] == ["Ana"]
+    _agregar("Abel", "abel@x.com")
+    assert [fila.nombre for fila in servicios.sugerir_desarrolladores("a")] == ["Abel", "Ana"]
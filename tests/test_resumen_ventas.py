@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+import itertools
+
+import pytest
+
+from modelos import Usuario, Juego, Compra, RolUsuario, MetodoPago
+from tipos import EstadoJuego
+from servicios import FiltrosVentas, resumen_ventas, actualizar_resumenes_ventas, ventas, fin_exclusivo
+
+INICIO = datetime(2024, 3, 1, 9, 30)
+METODOS = list(MetodoPago) + [None]
+
+def _compras(cantidad, desde):
+    # Repartidas en varios días y horas, con NULL en cada dimensión cada tanto
+    for i in range(desde, desde + cantidad):
+        yield {
+            "id_usuario": None if i % 11 == 0 else 1 + i % 3,
+            "id_juego": None if i % 13 == 0 else 1 + i % 2,
+            "fecha_compra": INICIO + timedelta(hours=7 * i),
+            "monto_pagado": Decimal(5 + i % 7) + Decimal("0.25"),
+            "metodo_pago": METODOS[i % len(METODOS)],
+        }
+
+@pytest.fixture
+def compras(base_datos):
+    with base_datos.begin() as conexion:
+        conexion.execute(Usuario.__table__.insert(), [
+            {"nombre": f"U{i}", "correo": f"u{i}@x", "contraseña": "x", "rol_usuario": RolUsuario.DESARROLLADOR}
+            for i in range(1, 4)
+        ])
+        conexion.execute(Juego.__table__.insert(), [
+            {"nombre": f"J{i}", "precio": 1, "estado_juego": EstadoJuego.LANZADO, "id_desarrollador": 1}
+            for i in range(1, 3)
+        ])
+        resumidas = list(_compras(60, 0))
+        conexion.execute(Compra.__table__.insert(), resumidas)
+    actualizar_resumenes_ventas()
+    # Compras posteriores a la marca: todavía no están en el resumen
+    pendientes = list(_compras(10, 60))
+    with base_datos.begin() as conexion:
+        conexion.execute(Compra.__table__.insert(), pendientes)
+    return resumidas + pendientes
+
+def _esperado(compras, filtros, agrupar_por):
+    # GROUP BY calculado en Python sobre las compras insertadas
+    claves = {"dia": lambda c: c["fecha_compra"].date(), "juego": lambda c: c["id_juego"],
+              "usuario": lambda c: c["id_usuario"], "metodo": lambda c: c["metodo_pago"], None: lambda c: None}
+    resultado = {}
+    for c in compras:
+        if filtros.fecha_inicio is not None and c["fecha_compra"] < filtros.fecha_inicio:
+            continue
+        if filtros.fecha_fin is not None and c["fecha_compra"] >= fin_exclusivo(filtros.fecha_fin):
+            continue
+        if any(valor is not None and c[columna] != valor for columna, valor in
+               (("id_juego", filtros.juego_id), ("id_usuario", filtros.usuario_id), ("metodo_pago", filtros.metodo))):
+            continue
+        cantidad, total = resultado.get(claves[agrupar_por](c), (0, Decimal(0)))
+        resultado[claves[agrupar_por](c)] = (cantidad + 1, total + c["monto_pagado"])
+    return resultado
+
+RANGOS = [
+    (None, None),
+    (datetime(2024, 3, 3), datetime(2024, 3, 12)),                 # días completos
+    (datetime(2024, 3, 2, 15, 0), datetime(2024, 3, 14, 8, 45)),   # inicio parcial (la hora del fin no cuenta)
+    (datetime(2024, 3, 5, 1, 0), datetime(2024, 3, 5, 23, 0)),     # dentro de un solo día
+    (datetime(2024, 3, 10), None),
+]
+DIMENSIONES = [{}, {"juego_id": 2}, {"usuario_id": 1}, {"metodo": MetodoPago.PAYPAL}, {"juego_id": 1, "metodo": MetodoPago.TARJETA}]
+
+@pytest.mark.parametrize("agrupar_por", [None, "dia", "juego", "usuario", "metodo"])
+def test_resumen_igual_a_group_by(compras, agrupar_por):
+    for (inicio, fin), dimension in itertools.product(RANGOS, DIMENSIONES):
+        filtros = FiltrosVentas(fecha_inicio=inicio, fecha_fin=fin, **dimension)
+        obtenido = {f.clave: (f.cantidad, f.total) for f in resumen_ventas(filtros, agrupar_por)}
+        assert obtenido == _esperado(compras, filtros, agrupar_por), (filtros, agrupar_por)
+
+def test_detalle_igual_al_resumen(compras):
+    # El detalle (ventas) y el resumen cuentan las mismas compras, también las
+    # que no tienen usuario, juego o método de pago
+    for (inicio, fin), dimension in itertools.product(RANGOS, DIMENSIONES):
+        filtros = FiltrosVentas(fecha_inicio=inicio, fecha_fin=fin, **dimension)
+        detalle = list(ventas(filtros))
+        total = resumen_ventas(filtros)
+        assert len(detalle) == (total[0].cantidad if total else 0), filtros
+        assert sum((v.monto_pagado for v in detalle), Decimal(0)) == (total[0].total if total else 0), filtros
+    sin_metodo = [v for v in ventas() if v.metodo_pago is None]
+    por_metodo = {f.clave: f.cantidad for f in resumen_ventas(agrupar_por="metodo")}
+    assert sin_metodo and por_metodo[None] == len(sin_metodo)
+    assert any(v.usuario is None for v in ventas()) and any(v.juego is None for v in ventas())
+
+def test_fecha_fin_incluye_el_dia_completo(compras):
+    # Compras del 1/3 a las 9:30, 16:30 y 23:30: "hasta el 1/3" las incluye a todas
+    filtros = FiltrosVentas(fecha_inicio=datetime(2024, 3, 1), fecha_fin=datetime(2024, 3, 1))
+    assert resumen_ventas(filtros)[0].cantidad == len(list(ventas(filtros))) == 3
@@ -0,0 +1,29 @@
+from enum import Enum as PyEnum
+
+# Tipos personalizados
+class RolUsuario(PyEnum):
+    JUGADOR = "JUGADOR"
+    DESARROLLADOR = "DESARROLLADOR"
+
+class EstadoJuego(PyEnum):
+    BETA = "BETA"
+    LANZADO = "LANZADO"
+    RETIRADO = "RETIRADO"
+
+class MetodoPago(PyEnum):
+    TARJETA = "TARJETA"
+    PAYPAL = "PAYPAL"
+    CREDITO = "CREDITO"
+    CRIPTO = "CRIPTO"
+
+class TipoEvento(PyEnum):
+    LANZAMIENTO = "LANZAMIENTO"
+    TORNEO = "TORNEO"
+    REBAJA = "REBAJA"
+
+class Plataforma(PyEnum):
+    WINDOWS = "WINDOWS"
+    LINUX = "LINUX"
+    MAC = "MAC"
+    ANDROID = "ANDROID"
+    IOS = "IOS"